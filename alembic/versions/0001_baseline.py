@@ -0,0 +1,159 @@
+"""Baseline schema (tables as first shipped, before migrations existed)
+
+Databases created by the old ``create_all`` startup path already contain these tables,
+so every table is only created when missing; such databases are simply stamped at this
+revision and continue with the later ones.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = set(sa.inspect(bind).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.String(36), primary_key=True),
+            sa.Column("username", sa.String(50), nullable=False),
+            sa.Column("email", sa.String(255), nullable=False),
+            sa.Column("password_hash", sa.String(255), nullable=False),
+            sa.Column("role", sa.String(32), nullable=False),
+            *_timestamps(),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_username", "users", ["username"], unique=True)
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "providers" not in existing:
+        op.create_table(
+            "providers",
+            sa.Column("name", sa.String(50), primary_key=True),
+            sa.Column("display_name", sa.String(100), nullable=False),
+            sa.Column("models", sa.JSON(), nullable=False),
+            sa.Column("capabilities", sa.JSON(), nullable=False),
+            sa.Column("enabled", sa.Boolean(), nullable=False),
+            sa.Column("notes", sa.String(255), nullable=True),
+            sa.Column("base_url", sa.String(255), nullable=True),
+            sa.Column("api_token", sa.String(255), nullable=True),
+            *_timestamps(),
+        )
+        op.create_index("ix_providers_name", "providers", ["name"])
+
+    if "jobs" not in existing:
+        op.create_table(
+            "jobs",
+            sa.Column("id", sa.String(50), primary_key=True),
+            sa.Column("owner_id", sa.String(36), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+            sa.Column("prompt", sa.Text(), nullable=False),
+            sa.Column(
+                "kind",
+                sa.Enum("TEXT_TO_IMAGE", "TEXT_TO_VIDEO", "IMAGE_TO_VIDEO", name="jobkinddb"),
+                nullable=False,
+            ),
+            sa.Column("model", sa.String(100), nullable=True),
+            sa.Column("provider", sa.String(100), nullable=True),
+            sa.Column("is_public", sa.Boolean(), nullable=False),
+            sa.Column("params", sa.JSON(), nullable=False),
+            sa.Column(
+                "status",
+                sa.Enum("QUEUED", "RUNNING", "COMPLETED", "FAILED", "CANCELED", name="jobstatusdb"),
+                nullable=False,
+            ),
+            sa.Column("progress", sa.Integer(), nullable=False),
+            sa.Column("asset_id", sa.String(50), nullable=True),
+            sa.Column("error", sa.Text(), nullable=True),
+            *_timestamps(),
+        )
+        op.create_index("ix_jobs_id", "jobs", ["id"])
+        op.create_index("ix_jobs_owner_id", "jobs", ["owner_id"])
+
+    if "assets" not in existing:
+        op.create_table(
+            "assets",
+            sa.Column("id", sa.String(50), primary_key=True),
+            sa.Column("owner_id", sa.String(36), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+            sa.Column("type", sa.Enum("IMAGE", "VIDEO", "AUDIO", name="assettypedb"), nullable=False),
+            sa.Column("provider", sa.String(100), nullable=True),
+            sa.Column("url", sa.Text(), nullable=False),
+            sa.Column("preview_url", sa.Text(), nullable=True),
+            sa.Column("meta", sa.JSON(), nullable=False),
+            sa.Column("is_public", sa.Boolean(), nullable=False),
+            *_timestamps(),
+        )
+        op.create_index("ix_assets_id", "assets", ["id"])
+        op.create_index("ix_assets_owner_id", "assets", ["owner_id"])
+
+    if "wallets" not in existing:
+        op.create_table(
+            "wallets",
+            sa.Column("id", sa.String(36), primary_key=True),
+            sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("balance", sa.Numeric(12, 2), nullable=False),
+            sa.Column("currency", sa.String(3), nullable=False),
+            sa.Column("frozen", sa.Numeric(12, 2), nullable=False),
+            *_timestamps(),
+        )
+        op.create_index("ix_wallets_id", "wallets", ["id"])
+        op.create_index("ix_wallets_user_id", "wallets", ["user_id"], unique=True)
+
+    if "wallet_transactions" not in existing:
+        op.create_table(
+            "wallet_transactions",
+            sa.Column("id", sa.String(50), primary_key=True),
+            sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("amount", sa.Numeric(12, 2), nullable=False),
+            sa.Column("type", sa.Enum("TOPUP", "DEDUCT", "REFUND", "ADJUST", name="wallettxtypedb"), nullable=False),
+            sa.Column("status", sa.Enum("PENDING", "COMPLETED", "FAILED", name="wallettxstatusdb"), nullable=False),
+            sa.Column("ref_job_id", sa.String(50), nullable=True),
+            sa.Column("description", sa.String(255), nullable=True),
+            sa.Column("meta", sa.JSON(), nullable=False),
+            *_timestamps(),
+        )
+        op.create_index("ix_wallet_transactions_id", "wallet_transactions", ["id"])
+        op.create_index("ix_wallet_transactions_user_id", "wallet_transactions", ["user_id"])
+
+    if "user_preferences" not in existing:
+        op.create_table(
+            "user_preferences",
+            sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("theme", sa.String(16), nullable=False),
+            sa.Column("language", sa.String(8), nullable=False),
+            sa.Column("notifications", sa.Boolean(), nullable=False),
+            sa.Column("meta", sa.JSON(), nullable=False),
+            *_timestamps(),
+        )
+
+    if bind.dialect.name == "postgresql":
+        # Older deployments created these as VARCHAR; widening to TEXT is a no-op when already done.
+        op.execute("ALTER TABLE jobs ALTER COLUMN error TYPE TEXT")
+        op.execute("ALTER TABLE assets ALTER COLUMN url TYPE TEXT")
+        op.execute("ALTER TABLE assets ALTER COLUMN preview_url TYPE TEXT")
+
+
+def downgrade() -> None:
+    for table in ("user_preferences", "wallet_transactions", "wallets", "assets", "jobs", "providers", "users"):
+        op.drop_table(table)
+    if op.get_bind().dialect.name == "postgresql":
+        for enum_name in ("jobkinddb", "jobstatusdb", "assettypedb", "wallettxtypedb", "wallettxstatusdb"):
+            op.execute(f"DROP TYPE IF EXISTS {enum_name}")
@@ -0,0 +1,32 @@
+"""Worker lease columns on jobs for the database-backed task queue
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Startup used to add these with ad-hoc ALTERs, so they may already be present.
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("jobs")}
+    with op.batch_alter_table("jobs") as batch:
+        if "lease_owner" not in columns:
+            batch.add_column(sa.Column("lease_owner", sa.String(64), nullable=True))
+        if "lease_expires_at" not in columns:
+            batch.add_column(sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("jobs") as batch:
+        batch.drop_column("lease_expires_at")
+        batch.drop_column("lease_owner")
@@ -0,0 +1,61 @@
+"""Composite and partial indexes for list, filter and queue queries
+
+- ``(created_at, id)`` on jobs, assets and users backs keyset pagination; the
+  filtered indexes below end in the same two columns so a filtered page is read in
+  index order without a sort.
+- ``jobs(status, ...)`` and ``jobs(owner_id, ...)`` back the admin filters and "my jobs".
+- The partial ``jobs(created_at) WHERE status IN ('QUEUED','RUNNING')`` index stays
+  small however many finished jobs accumulate; it serves the task queue claim and
+  the active jobs view.
+- ``assets(is_public, type, ...)`` backs the public library listing,
+  ``assets(owner_id, ...)`` "my assets" and ``assets(provider, ...)`` the filter.
+- ``wallet_transactions(user_id, ...)`` backs the transaction history.
+
+Indexes that already exist (e.g. created by hand with ``CREATE INDEX CONCURRENTLY`` on a
+large production table ahead of the deploy) are skipped.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# Enum columns store member NAMES.
+_ACTIVE_JOBS = sa.text("status IN ('QUEUED', 'RUNNING')")
+
+_INDEXES = [
+    ("ix_jobs_created_at_id", "jobs", ["created_at", "id"], {}),
+    ("ix_jobs_status_created_at", "jobs", ["status", "created_at", "id"], {}),
+    ("ix_jobs_owner_id_created_at", "jobs", ["owner_id", "created_at", "id"], {}),
+    ("ix_jobs_active_created_at", "jobs", ["created_at"], {"postgresql_where": _ACTIVE_JOBS, "sqlite_where": _ACTIVE_JOBS}),
+    ("ix_assets_created_at_id", "assets", ["created_at", "id"], {}),
+    ("ix_assets_is_public_type_created_at", "assets", ["is_public", "type", "created_at", "id"], {}),
+    ("ix_assets_owner_id_created_at", "assets", ["owner_id", "created_at", "id"], {}),
+    ("ix_assets_provider_created_at", "assets", ["provider", "created_at", "id"], {}),
+    ("ix_users_created_at_id", "users", ["created_at", "id"], {}),
+    ("ix_wallet_transactions_user_id_created_at", "wallet_transactions", ["user_id", "created_at", "id"], {}),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing: dict[str, set[str]] = {}
+    for name, table, columns, kwargs in _INDEXES:
+        if table not in existing:
+            existing[table] = {ix["name"] for ix in inspector.get_indexes(table)}
+        if name not in existing[table]:
+            op.create_index(name, table, columns, **kwargs)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
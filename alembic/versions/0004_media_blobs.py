@@ -0,0 +1,48 @@
+"""Content-addressed media: blobs keyed by SHA-256 (plus extension) and the references holding them
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_blobs",
+        sa.Column("key", sa.String(255), primary_key=True),
+        sa.Column("sha256", sa.String(64), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("content_type", sa.String(100), nullable=True),
+        sa.Column("refcount", sa.Integer(), nullable=False),
+        *_timestamps(),
+    )
+    op.create_table(
+        "media_refs",
+        sa.Column("owner", sa.String(64), primary_key=True),
+        sa.Column("key", sa.String(255), sa.ForeignKey("media_blobs.key"), primary_key=True),
+        *_timestamps(),
+    )
+    op.create_index("ix_media_refs_key", "media_refs", ["key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_media_refs_key", table_name="media_refs")
+    op.drop_table("media_refs")
+    op.drop_table("media_blobs")
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -48,8 +48,9 @@ from app.schemas import JobKind, AssetType
 from app.services.metrics import metrics
 from app.services.store import get_store
 from app.schemas import JobStatus
-from app.services.auth import hash_password
-from app.api.utils import api_error
+from app.services.auth import hash_password_async
+from app.api.utils import api_error, parse_cursor
+from app.services.pagination import next_cursor
 from app.services import audit as audit_service
 
 
@@ -61,32 +62,36 @@ def _ensure_admin(current_user: UserOut) -> None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
 
 
+def _set_next_cursor(response: Response, items: list, limit: int) -> None:
+    cursor = next_cursor(items, limit)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+
+
 # Users
 @router.get("/users", response_model=list[UserOut])
 async def admin_list_users(
+    response: Response,
     current_user: UserOut = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
     role: str | None = Query(None),
     q: str | None = Query(None, description="search by email/username contains"),
 ) -> list[UserOut]:
     _ensure_admin(current_user)
-    offset = (page - 1) * limit
-    # basic filter inline without new persistence
-    users = await _list_users(session, offset=offset, limit=limit)
-    if role:
-        users = [u for u in users if u.role == role]
-    if q:
-        ql = q.lower()
-        users = [u for u in users if (u.email.lower().find(ql) >= 0 or u.username.lower().find(ql) >= 0)]
+    after = parse_cursor(cursor)
+    offset = 0 if after else (page - 1) * limit
+    users = await _list_users(session, role=role, q=q, after=after, offset=offset, limit=limit)
+    _set_next_cursor(response, users, limit)
     return users
 
 
 @router.post("/users", response_model=UserOut, status_code=status.HTTP_201_CREATED)
 async def admin_create_user(payload: AdminCreateUser, current_user: UserOut = Depends(get_current_user), session: AsyncSession = Depends(get_session)) -> UserOut:
     _ensure_admin(current_user)
-    return await create_user_db(session, email=payload.email, username=payload.username, password_hash=hash_password(payload.password), role=payload.role)
+    return await create_user_db(session, email=payload.email, username=payload.username, password_hash=await hash_password_async(payload.password), role=payload.role)
 
 
 @router.get("/users/{user_id}", response_model=UserOut)
@@ -128,7 +133,7 @@ async def admin_delete_user(user_id: str, current_user: UserOut = Depends(get_cu
 @router.post("/users/{user_id}/reset-password", response_model=UserOut)
 async def admin_reset_password(user_id: str, payload: AdminPasswordReset, current_user: UserOut = Depends(get_current_user), session: AsyncSession = Depends(get_session)) -> UserOut:
     _ensure_admin(current_user)
-    user = await update_user_password(session, user_id=user_id, password_hash=hash_password(payload.new_password))
+    user = await update_user_password(session, user_id=user_id, password_hash=await hash_password_async(payload.new_password))
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=api_error("User not found"))
     return user
@@ -167,14 +172,19 @@ async def admin_get_wallet(user_id: str, current_user: UserOut = Depends(get_cur
 @router.get("/wallets/{user_id}/transactions", response_model=list[WalletTxOut])
 async def admin_get_wallet_txs(
     user_id: str,
+    response: Response,
     current_user: UserOut = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
 ) -> list[WalletTxOut]:
     _ensure_admin(current_user)
-    offset = (page - 1) * limit
-    return await list_wallet_txs(session, user_id, offset=offset, limit=limit)
+    after = parse_cursor(cursor)
+    offset = 0 if after else (page - 1) * limit
+    txs = await list_wallet_txs(session, user_id, after=after, offset=offset, limit=limit)
+    _set_next_cursor(response, txs, limit)
+    return txs
 
 
 @router.post("/wallets/{user_id}/adjust", response_model=WalletOut)
@@ -187,10 +197,12 @@ async def admin_wallet_adjust(user_id: str, payload: AdminWalletAdjust, current_
 # Jobs
 @router.get("/jobs", response_model=list[JobOut])
 async def admin_list_jobs(
+    response: Response,
     current_user: UserOut = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
     status: JobStatus | None = Query(None),
     kind: JobKind | None = Query(None),
     owner_id: str | None = Query(None),
@@ -198,7 +210,8 @@ async def admin_list_jobs(
     created_to: str | None = Query(None),
 ) -> list[JobOut]:
     _ensure_admin(current_user)
-    offset = (page - 1) * limit
+    after = parse_cursor(cursor)
+    offset = 0 if after else (page - 1) * limit
     from datetime import datetime
     dt_from = datetime.fromisoformat(created_from) if created_from else None
     dt_to = datetime.fromisoformat(created_to) if created_to else None
@@ -206,7 +219,9 @@ async def admin_list_jobs(
     if kind is not None:
         from app.models.job import JobKindDB as JKDB
         kind_db = JKDB(kind.value)
-    return await list_jobs_filtered(session, status=status, kind=kind_db, owner_id=owner_id, created_from=dt_from, created_to=dt_to, offset=offset, limit=limit)
+    jobs = await list_jobs_filtered(session, status=status, kind=kind_db, owner_id=owner_id, created_from=dt_from, created_to=dt_to, after=after, offset=offset, limit=limit)
+    _set_next_cursor(response, jobs, limit)
+    return jobs
 
 
 @router.post("/jobs/{job_id}/cancel", status_code=status.HTTP_204_NO_CONTENT)
@@ -221,23 +236,34 @@ async def admin_cancel_job(job_id: str, current_user: UserOut = Depends(get_curr
     store = get_store()
     if store.get_job(job_id):
         store.update_job(job_id, status=JobStatus.CANCELED)
+    from app.services.active_jobs import get_active_job_registry
+    from app.services.generation import request_cancel
+    from app.services.status_cache import get_status_cache
+    request_cancel(job_id)
+    get_status_cache().invalidate(job_id)
+    get_active_job_registry().discard(job_id)
 
 
 # Assets
 @router.get("/assets", response_model=list[AssetOut])
 async def admin_list_assets(
+    response: Response,
     current_user: UserOut = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
     type: AssetType | None = Query(None),
     provider: str | None = Query(None),
     public: bool | None = Query(None),
     owner_id: str | None = Query(None),
 ) -> list[AssetOut]:
     _ensure_admin(current_user)
-    offset = (page - 1) * limit
-    return await list_assets_filtered(session, asset_type=type, provider=provider, public_only=public, owner_id=owner_id, offset=offset, limit=limit)
+    after = parse_cursor(cursor)
+    offset = 0 if after else (page - 1) * limit
+    assets = await list_assets_filtered(session, asset_type=type, provider=provider, public_only=public, owner_id=owner_id, after=after, offset=offset, limit=limit)
+    _set_next_cursor(response, assets, limit)
+    return assets
 
 
 @router.patch("/assets/{asset_id}", response_model=AssetOut)
@@ -6,14 +6,16 @@ from fastapi import UploadFile, File, Form
 from app.deps.auth import get_current_user_optional, get_current_user
 from app.db import get_session
 from app.schemas import AssetList, AssetOut, AssetType, UserOut
-from app.services.persistence import delete_asset_db, list_assets_db, list_assets_filtered, update_asset_fields
-from app.services.storage import delete_asset_files
-from app.services.storage import ensure_storage_dir
+from app.services.ids import new_asset_id
+from app.services.pagination import next_cursor
+from app.services.persistence import count_assets_db, delete_asset_db, get_asset_db, list_assets_db, update_asset_fields
+from app.services.blobs import get_blob_store
+from app.services.storage import StorageLimitExceeded, delete_asset_files, media_url, save_upload
 from app.config import get_settings
-from pathlib import Path
 from app.services.store import MemoryStore, get_store
+from app.services.thumbnails import get_thumbnailer
+from app.services.visibility import Visibility
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
 
 router = APIRouter()
 
@@ -28,46 +30,31 @@ async def list_assets(
     owner_only: bool | None = Query(None, description="Only show current user's assets"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
     current_user: UserOut | None = Depends(get_current_user_optional),
     session: AsyncSession = Depends(get_session),
 ) -> AssetList:
     safe_limit = max(1, min(100, limit))
-    offset = (max(1, page) - 1) * safe_limit
+    after = parse_cursor(cursor)
+    offset = 0 if after else (max(1, page) - 1) * safe_limit
 
-    if owner_only:
-        if current_user is None:
-            items = []
-        else:
-            items = await list_assets_filtered(
-                session,
-                asset_type=type,
-                provider=provider,
-                public_only=public,
-                owner_id=current_user.id,
-                offset=offset,
-                limit=safe_limit,
-            )
-    else:
-        items = await list_assets_db(
-            session,
-            asset_type=type,
-            provider=provider,
-            public_only=public,
-            offset=offset,
-            limit=safe_limit,
-        )
-        if current_user is None:
-            items = [a for a in items if a.is_public]
-        elif not _is_admin(current_user):
-            items = [a for a in items if a.is_public or a.owner_id == current_user.id]
-
-    total = len(items)
+    if owner_only and current_user is None:
+        return AssetList(items=[], total=0, total_all=None)
+    filters = dict(
+        asset_type=type,
+        provider=provider,
+        public_only=public,
+        owner_id=current_user.id if owner_only else None,
+        visibility=Visibility.for_user(current_user),
+    )
+    items = await list_assets_db(session, **filters, after=after, offset=offset, limit=safe_limit)
+    cursor_out = next_cursor(items, safe_limit)
+    total = await count_assets_db(session, **filters)
     try:
-        from app.services.persistence import count_assets_db
         total_all = await count_assets_db(session)
     except Exception:
         total_all = None
-    return AssetList(items=items, total=total, total_all=total_all)
+    return AssetList(items=items, total=total, total_all=total_all, next_cursor=cursor_out)
 
 
 @router.delete("/{asset_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -77,13 +64,12 @@ async def delete_asset(
     current_user: UserOut = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> None:
-    assets_db = await list_assets_db(session)
-    asset = next((a for a in assets_db if a.id == asset_id), None)
+    asset = await get_asset_db(session, asset_id)
     if not asset:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=api_error("Asset not found"))
     if not _is_admin(current_user) and (current_user is None or asset.owner_id != current_user.id):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=api_error("Unauthorized"))
-    delete_asset_files(asset)
+    await delete_asset_files(asset)
     store.delete_asset(asset_id)
     await delete_asset_db(session, asset_id)
     try:
@@ -107,11 +93,6 @@ async def upload_asset(
     session: AsyncSession = Depends(get_session),
 ) -> AssetOut:
     settings = get_settings()
-    base = Path(settings.storage_base)
-    ensure_storage_dir(base)
-    data = file.file.read()
-    if not data:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=api_error("Empty file"))
     ct = file.content_type or ""
     if ct.startswith("image/"):
         kind = AssetType.IMAGE
@@ -125,14 +106,15 @@ async def upload_asset(
     else:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=api_error("Unsupported content type"))
     # persist file
-    from app.models.asset import Asset as AssetModel
-    asset_id = f"asset_{int(await session.scalar(select(func.count()).select_from(AssetModel)) or 0) + 1}"
-    rel = f"uploads/{asset_id}{ext}"
-    dest = base / rel
-    ensure_storage_dir(dest.parent)
-    with dest.open("wb") as f:
-        f.write(data)
-    url = f"/media/{rel}"
+    asset_id = new_asset_id()
+    try:
+        key, size = await save_upload(asset_id, file, ext=ext, max_bytes=settings.max_upload_bytes)
+    except StorageLimitExceeded:
+        raise HTTPException(status_code=413, detail=api_error("File too large"))
+    url = media_url(key)
+    if not size:
+        await get_blob_store().release(asset_id)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=api_error("Empty file"))
     # build meta minimally
     meta = {"filename": file.filename, "content_type": ct}
     # add DB record
@@ -149,7 +131,7 @@ async def upload_asset(
     )
     session.add(asset)
     await session.commit()
-    return AssetOut(
+    out = AssetOut(
         id=asset_id,
         type=kind,
         provider=provider,
@@ -160,7 +142,9 @@ async def upload_asset(
         created_at=asset.created_at.replace(tzinfo=None),
         owner_id=current_user.id,
     )
-from app.api.utils import api_error
+    get_thumbnailer().submit(out)
+    return out
+from app.api.utils import api_error, parse_cursor
 @router.patch("/{asset_id}", response_model=AssetOut)
 async def patch_asset(
     asset_id: str,
@@ -168,8 +152,7 @@ async def patch_asset(
     current_user: UserOut = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> AssetOut:
-    assets_db = await list_assets_db(session)
-    asset = next((a for a in assets_db if a.id == asset_id), None)
+    asset = await get_asset_db(session, asset_id)
     if not asset:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=api_error("Asset not found"))
     if not _is_admin(current_user) and (current_user is None or asset.owner_id != current_user.id):
@@ -10,7 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db import get_session
 from app.models.user import User as UserModel
 from app.schemas import AuthRequest, AuthResponse, PasswordChange, UserOut, RegisterRequest
-from app.services.auth import create_tokens, decode_token, hash_password, verify_password
+from app.services.auth import create_tokens, decode_token, hash_password_async, verify_password_async
+from app.services.principal_cache import get_principal_cache
 from app.services.persistence import count_users, create_user_db, get_user_by_email, get_user_by_id
 from app.deps.auth import get_current_user
 
@@ -23,7 +24,7 @@ async def login(payload: AuthRequest, session: AsyncSession = Depends(get_sessio
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=api_error("Invalid credentials"))
     db_user = await session.get(UserModel, user.id)
-    if not db_user or not verify_password(payload.password, db_user.password_hash):
+    if not db_user or not await verify_password_async(payload.password, db_user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=api_error("Invalid credentials"))
     access, refresh = create_tokens(user.id)
     return AuthResponse(
@@ -41,7 +42,7 @@ async def register(payload: RegisterRequest, session: AsyncSession = Depends(get
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=api_error("email already exists"))
     total_users = await count_users(session)
     role = "admin" if total_users == 0 else "user"
-    user = await create_user_db(session, email=payload.email, username=payload.username, password_hash=hash_password(payload.password), role=role)
+    user = await create_user_db(session, email=payload.email, username=payload.username, password_hash=await hash_password_async(payload.password), role=role)
     return user
 
 
@@ -76,7 +77,8 @@ async def change_password(
     current_user: UserOut = Depends(get_current_user),
 ) -> None:
     db_user = await session.get(UserModel, current_user.id)
-    if not db_user or not verify_password(payload.old_password, db_user.password_hash):
+    if not db_user or not await verify_password_async(payload.old_password, db_user.password_hash):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=api_error("Old password incorrect"))
-    db_user.password_hash = hash_password(payload.new_password)
+    db_user.password_hash = await hash_password_async(payload.new_password)
     await session.commit()
+    get_principal_cache().invalidate_user(current_user.id)
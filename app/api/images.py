@@ -9,7 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db import get_session
 from app.schemas import JobCreate, JobKind, JobOut, JobParams, JobStatus
 from app.api.utils import api_error
-from app.services.persistence import get_job_db, list_assets_db, next_job_id, persist_job
+from app.services.ids import new_job_id
+from app.services.persistence import get_job_with_asset_url_db, persist_job
 from app.services.store import MemoryStore, get_store
 from app.services.generation import simulate_generation
 from app.services.taskqueue import get_task_queue
@@ -56,11 +57,8 @@ async def create_image(payload: dict, store: MemoryStore = Depends(get_store), s
     kind = JobKind.TEXT_TO_IMAGE
     params = JobParams(extras={})
 
-    try:
-        new_job_id = await next_job_id(session)
-    except Exception:
-        new_job_id = None
-    job = store.create_job(JobCreate(prompt=prompt, kind=kind, model=internal_model, provider="openai", is_public=True, params=params, source_image_name=None, owner_id=None), job_id=new_job_id)
+    job_id = new_job_id()
+    job = store.create_job(JobCreate(prompt=prompt, kind=kind, model=internal_model, provider="openai", is_public=True, params=params, source_image_name=None, owner_id=None), job_id=job_id)
     await persist_job(session, job)
 
     tq = get_task_queue()
@@ -130,11 +128,8 @@ async def edit_image(payload: dict, store: MemoryStore = Depends(get_store), ses
     else:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=api_error("不支持的图像编辑模型"))
 
-    try:
-        new_job_id = await next_job_id(session)
-    except Exception:
-        new_job_id = None
-    job = store.create_job(JobCreate(prompt=prompt, kind=kind, model=internal_model, provider=provider, is_public=True, params=params, source_image_name=None, owner_id=(current_user.id if current_user else None)), job_id=new_job_id)
+    job_id = new_job_id()
+    job = store.create_job(JobCreate(prompt=prompt, kind=kind, model=internal_model, provider=provider, is_public=True, params=params, source_image_name=None, owner_id=(current_user.id if current_user else None)), job_id=job_id)
     await persist_job(session, job)
 
     tq = get_task_queue()
@@ -231,16 +226,10 @@ async def upload_external_image(
 
 @router.get("/images/{image_id}")
 async def get_image(image_id: str, session: AsyncSession = Depends(get_session)) -> dict:
-    job = await get_job_db(session, image_id)
+    job, asset_url = await get_job_with_asset_url_db(session, image_id)
     if not job:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=api_error("Not found"))
-    result_url = None
-    if job.asset_id:
-        assets = await list_assets_db(session)
-        for a in assets:
-            if a.id == job.asset_id:
-                result_url = a.url
-                break
+    result_url = asset_url if job.asset_id else None
     return {
         "image_id": job.id,
         "task_id": None,
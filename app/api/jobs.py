@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from starlette.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Request, UploadFile, status
+from starlette.responses import JSONResponse, Response, StreamingResponse
 import datetime as dt
-from app.api.utils import api_error
+from app.api.utils import api_error, parse_cursor
 
 from app.deps.auth import get_current_user_optional, get_current_user
-from app.db import get_session
+from app.db import SessionLocal, get_session
 from app.schemas import (
     JobCreate,
     JobKind,
@@ -21,18 +22,27 @@ from app.schemas import (
     Orientation,
     UserOut,
 )
-from app.services.generation import simulate_generation
+from app.services.generation import request_cancel, simulate_generation
 from app.services.persistence import change_balance, get_wallet_by_user_id
 from app.schemas import TransactionType
 from app.services.persistence import (
     get_job_db,
+    count_jobs_db,
+    get_job_with_asset_url_db,
+    list_jobs_by_ids_db,
     list_jobs_db,
-    next_job_id,
     persist_job,
     update_job_fields,
 )
+from app.services.active_jobs import get_active_job_registry
+from app.services.ids import new_job_id
+from app.services.mirror import get_mirror
+from app.services.pagination import next_cursor
+from app.services.events import TERMINAL_STATUSES, Subscription, format_sse, get_event_broker, job_event
+from app.services.status_cache import StatusEntry, get_status_cache
 from app.services.store import MemoryStore, get_store
 from app.services.storage import save_source_image
+from app.services.visibility import Visibility
 from app.services.taskqueue import get_task_queue
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import get_settings
@@ -52,25 +62,21 @@ async def list_jobs(
     session: AsyncSession = Depends(get_session),
     page: int = 1,
     limit: int = 20,
+    cursor: str | None = None,
 ) -> JobList:
     page = max(1, page)
     limit = max(1, min(100, limit))
-    offset = (page - 1) * limit
-    items = await list_jobs_db(session, offset=offset, limit=limit)
-    if current_user is None:
-        items = [j for j in items if j.is_public]
-    elif _is_admin(current_user):
-        # Admin can view all jobs.
-        pass
-    else:
-        items = [j for j in items if j.is_public or j.owner_id == current_user.id]
-    total = len(items)
+    after = parse_cursor(cursor)
+    offset = 0 if after else (page - 1) * limit
+    visibility = Visibility.for_user(current_user)
+    items = await list_jobs_db(session, visibility=visibility, after=after, offset=offset, limit=limit)
+    cursor_out = next_cursor(items, limit)
+    total = await count_jobs_db(session, visibility=visibility)
     try:
-        from app.services.persistence import count_jobs_db
         total_all = await count_jobs_db(session)
     except Exception:
         total_all = None
-    return JobList(items=items, total=total, total_all=total_all)
+    return JobList(items=items, total=total, total_all=total_all, next_cursor=cursor_out)
 
 
 @router.get("/active", response_model=List[JobStatusOut])
@@ -81,10 +87,8 @@ async def get_active_jobs(
     current_user=Depends(get_current_user_optional),
     session: AsyncSession = Depends(get_session),
 ) -> List[JobStatusOut]:
-    items = await list_jobs_db(session)
+    items = await get_active_job_registry().list(session)
     def _visible(j: JobOut) -> bool:
-        if j.status not in {JobStatus.RUNNING, JobStatus.QUEUED}:
-            return False
         if j.is_public:
             return True
         if _is_admin(current_user):
@@ -109,6 +113,152 @@ async def get_active_jobs(
     ]
 
 
+_MAX_STATUS_IDS = 200
+
+
+@router.get("/status", response_model=List[JobStatusOut])
+async def get_jobs_status(
+    ids: str,
+    store: MemoryStore = Depends(get_store),
+    current_user=Depends(get_current_user_optional),
+    session: AsyncSession = Depends(get_session),
+) -> List[JobStatusOut]:
+    id_list = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if len(id_list) > _MAX_STATUS_IDS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=api_error(f"at most {_MAX_STATUS_IDS} ids per request"))
+    jobs = {j.id: j for j in await list_jobs_by_ids_db(session, id_list)}
+    results: List[JobStatusOut] = []
+    for job_id in id_list:
+        job = jobs.get(job_id)
+        if not job:
+            continue
+        if not job.is_public and not _is_admin(current_user) and (
+            current_user is None or job.owner_id != current_user.id
+        ):
+            continue
+        # progress reaches the DB through a write-behind buffer; prefer the newer in-memory copy
+        mem_job = store.get_job(job_id)
+        runtime = mem_job if mem_job and mem_job.updated_at >= job.updated_at else job
+        results.append(
+            JobStatusOut(
+                id=job.id,
+                status=runtime.status,
+                progress=runtime.progress,
+                asset_id=runtime.asset_id,
+                error=getattr(job.params, "extras", {}).get("error_detail") or runtime.error,
+                updated_at=runtime.updated_at,
+            )
+        )
+    return JSONResponse(content=jsonable_encoder(results), headers={"Cache-Control": "no-store, no-cache, must-revalidate"})
+
+
+_MAX_EVENT_JOBS = 100
+
+
+async def _job_event_stream(request: Request, sub: Subscription, jobs: List[JobOut]) -> AsyncIterator[str]:
+    broker = get_event_broker()
+    heartbeat = max(1.0, float(get_settings().sse_heartbeat_seconds))
+    last_sent: dict[str, dt.datetime] = {}
+    remaining: set[str] = set()
+    try:
+        yield "retry: 3000\n\n"
+        for job in jobs:
+            last_sent[job.id] = job.updated_at
+            if job.status not in TERMINAL_STATUSES:
+                remaining.add(job.id)
+            yield format_sse(job_event(job))
+        while remaining:
+            if await request.is_disconnected():
+                break
+            batch = await sub.next_batch(heartbeat)
+            if not batch:
+                # quiet period: keep the connection alive and pick up changes made by
+                # other processes, which never reach this process' broker
+                yield format_sse(comment="ping")
+                try:
+                    async with SessionLocal() as session:
+                        fresh = await list_jobs_by_ids_db(session, sorted(remaining))
+                except Exception:
+                    fresh = []
+                batch = [job_event(j) for j in fresh if j.updated_at > last_sent.get(j.id, j.updated_at)]
+            for event in batch:
+                if event.id not in remaining:
+                    continue
+                last_sent[event.id] = event.updated_at
+                yield format_sse(event)
+                if event.status in TERMINAL_STATUSES:
+                    remaining.discard(event.id)
+    finally:
+        broker.unsubscribe(sub)
+
+
+async def _open_job_events(
+    request: Request, job_ids: list[str], authorization: str | None, token: str | None, session: AsyncSession
+) -> StreamingResponse:
+    # EventSource cannot send headers, so the access token may also come as ?token=
+    if not authorization and token:
+        authorization = f"Bearer {token}"
+    current_user = await get_current_user_optional(authorization, session)
+    # subscribe before reading the initial state so no transition falls in between
+    sub = get_event_broker().subscribe(job_ids)
+    try:
+        db_jobs = {j.id: j for j in await list_jobs_by_ids_db(session, job_ids)}
+    except Exception:
+        get_event_broker().unsubscribe(sub)
+        raise
+    store = get_store()
+    jobs: List[JobOut] = []
+    for job_id in job_ids:
+        job = db_jobs.get(job_id)
+        if not job:
+            continue
+        if not job.is_public and not _is_admin(current_user) and (
+            current_user is None or job.owner_id != current_user.id
+        ):
+            continue
+        mem_job = store.get_job(job_id)
+        jobs.append(mem_job if mem_job and mem_job.updated_at >= job.updated_at else job)
+    if not jobs:
+        get_event_broker().unsubscribe(sub)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=api_error("Job not found"))
+    return StreamingResponse(
+        _job_event_stream(request, sub, jobs),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/events")
+async def stream_jobs_events(
+    ids: str,
+    request: Request,
+    token: str | None = None,
+    authorization: str | None = Header(None),
+    session: AsyncSession = Depends(get_session),
+) -> StreamingResponse:
+    """Server-Sent Events for several jobs; the stream ends once all of them are terminal."""
+
+    id_list = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not id_list:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=api_error("ids is required"))
+    if len(id_list) > _MAX_EVENT_JOBS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=api_error(f"at most {_MAX_EVENT_JOBS} ids per stream"))
+    return await _open_job_events(request, id_list, authorization, token, session)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    request: Request,
+    token: str | None = None,
+    authorization: str | None = Header(None),
+    session: AsyncSession = Depends(get_session),
+) -> StreamingResponse:
+    """Server-Sent Events for one job's status and progress."""
+
+    return await _open_job_events(request, [job_id], authorization, token, session)
+
+
 @router.get("/{job_id}", response_model=JobOut)
 async def get_job(
     job_id: str,
@@ -126,20 +276,55 @@ async def get_job(
     return job
 
 
+def _etag_matches(etag: str, if_none_match: str | None) -> bool:
+    # If-None-Match uses the weak comparison: opaque tags must match, W/ prefixes aside
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def _status_response(request: Request, entry: StatusEntry) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(entry.etag, request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(content=entry.payload, headers=headers)
+
+
 @router.get("/{job_id}/status")
 async def get_job_status(
     job_id: str,
+    request: Request,
     store: MemoryStore = Depends(get_store),
-    current_user=Depends(get_current_user_optional),
+    authorization: str | None = Header(None),
     session: AsyncSession = Depends(get_session),
     debug: bool | None = None,
     ) -> dict:
-    if debug is None:
-        try:
-            debug = bool(getattr(store, "debug_enabled", False)) or bool(getattr(get_settings(), "debug", False))
-        except Exception:
-            debug = False
-    job = await get_job_db(session, job_id)
+    # Only an explicit ?debug=true asks for provider traces; the global DEBUG setting
+    # must not switch the cache off for every poll.
+    debug = bool(debug)
+    # Hot path: answer repeated polls from the status cache (no DB access) while the
+    # job's version is unchanged. Debug responses carry provider traces and bypass it.
+    cache = get_status_cache()
+    current_user = None
+    if not debug:
+        entry = cache.get(job_id)
+        if entry is not None:
+            if not entry.is_public:
+                # served by the principal cache, which drops users as soon as they change
+                current_user = await get_current_user_optional(authorization, session)
+            if entry.is_public or _is_admin(current_user) or (
+                current_user is not None and entry.owner_id == current_user.id
+            ):
+                return _status_response(request, entry)
+    version = cache.version(job_id)
+    if current_user is None:
+        current_user = await get_current_user_optional(authorization, session)
+    job, asset_url = await get_job_with_asset_url_db(session, job_id)
     if not job:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
     if not job.is_public and not _is_admin(current_user) and (
@@ -149,7 +334,9 @@ async def get_job_status(
     mem_job = store.get_job(job_id)
     try:
         runtime_job = mem_job if (mem_job and (mem_job.updated_at >= job.updated_at)) else job
-        if mem_job and (job.updated_at > mem_job.updated_at or job.status != mem_job.status or job.progress != mem_job.progress):
+        # progress reaches the DB through a write-behind buffer, so only a strictly newer
+        # row (e.g. a change made by another process) may overwrite the in-memory copy
+        if mem_job and job.updated_at > mem_job.updated_at:
             try:
                 store.update_job(job.id, status=job.status, progress=job.progress, asset_id=job.asset_id, error=job.error, params=job.params)
             except Exception:
@@ -284,14 +471,7 @@ async def get_job_status(
                 status_ext = "processing"
     except Exception:
         pass
-    result_url = None
-    if job.asset_id:
-        from app.services.persistence import list_assets_db
-        assets = await list_assets_db(session)
-        for a in assets:
-            if a.id == job.asset_id:
-                result_url = a.url
-                break
+    result_url = asset_url if job.asset_id else None
     if provider_result_url:
         result_url = provider_result_url
         try:
@@ -314,6 +494,7 @@ async def get_job_status(
                     },
                 }
                 asset_meta = {
+                    "job_id": job.id,
                     "model": provider_model_name or job.model,
                     "orientation": (job.params.orientation.value if job.params.orientation else None),
                     "size": resolution_meta,
@@ -344,6 +525,7 @@ async def get_job_status(
                 await update_job_fields(session, job.id, asset_id=asset.id)
                 job = await get_job_db(session, job.id) or job
                 result_url = asset.url
+                get_mirror().submit(asset)
         except Exception:
             pass
     provider_resp = extras.get("provider_response") or {}
@@ -376,7 +558,8 @@ async def get_job_status(
                 payload["provider_debug"] = provider_detail.get("debug")
             elif isinstance(raw, dict) and raw.get("debug"):
                 payload["provider_debug"] = raw.get("debug")
-        return JSONResponse(content=payload, headers={"Cache-Control": "no-store, no-cache, must-revalidate"})
+            return JSONResponse(content=payload, headers={"Cache-Control": "no-store, no-cache, must-revalidate"})
+        return _status_response(request, cache.put(job, payload, version=version, terminal=status_ext in {"completed", "failed"}))
     else:
         payload = {
             "image_id": job.id,
@@ -395,39 +578,8 @@ async def get_job_status(
         if debug:
             if isinstance(raw, dict) and raw.get("debug"):
                 payload["provider_debug"] = raw.get("debug")
-        return JSONResponse(content=payload, headers={"Cache-Control": "no-store, no-cache, must-revalidate"})
-
-
-@router.get("/status", response_model=List[JobStatusOut])
-async def get_jobs_status(
-    ids: str,
-    store: MemoryStore = Depends(get_store),
-    current_user=Depends(get_current_user_optional),
-    session: AsyncSession = Depends(get_session),
-) -> List[JobStatusOut]:
-    id_list = [i.strip() for i in ids.split(",") if i.strip()]
-    results: List[JobStatusOut] = []
-    for job_id in id_list:
-        job = await get_job_db(session, job_id)
-        if not job:
-            continue
-        if not job.is_public and not _is_admin(current_user) and (
-            current_user is None or job.owner_id != current_user.id
-        ):
-            continue
-        results.append(
-            JobStatusOut(
-                id=job.id,
-                status=job.status,
-                progress=job.progress,
-                asset_id=job.asset_id,
-                error=getattr(job.params, "extras", {}).get("error_detail") or job.error,
-                updated_at=job.updated_at,
-            )
-        )
-    return JSONResponse(content=[r.dict() for r in results], headers={"Cache-Control": "no-store, no-cache, must-revalidate"})
-
-
+            return JSONResponse(content=payload, headers={"Cache-Control": "no-store, no-cache, must-revalidate"})
+        return _status_response(request, cache.put(job, payload, version=version, terminal=status_ext in {"completed", "failed"}))
 
 
 @router.post("", response_model=JobOut, status_code=status.HTTP_201_CREATED)
@@ -475,10 +627,7 @@ async def create_job(
             wallet = await get_wallet_by_user_id(session, current_user.id)
             if wallet.balance < price:
                 raise HTTPException(status_code=status.HTTP_402_PAYMENT_REQUIRED, detail=api_error("Insufficient balance"))
-    try:
-        new_job_id = await next_job_id(session)
-    except Exception:
-        new_job_id = None
+    job_id = new_job_id()
 
     job = store.create_job(
         JobCreate(
@@ -491,7 +640,7 @@ async def create_job(
             source_image_name=None,
             owner_id=current_user.id if current_user else None,
         ),
-        job_id=new_job_id,
+        job_id=job_id,
     )
     await persist_job(session, job)
     if current_user:
@@ -513,10 +662,12 @@ async def create_job(
 
     source_image_name = None
     if source_image:
-        rel_path, url = save_source_image(job.id, source_image)
+        rel_path, url = await save_source_image(job.id, source_image)
         source_image_name = rel_path
         params.extras["source_image_url"] = url
         job = store.update_job(job.id, params=params)
+        # workers may load the job from the database (other processes, restarts)
+        await update_job_fields(session, job.id, params=params.dict())
 
     # 入队，由后台 worker 执行
     tq = get_task_queue()
@@ -542,6 +693,9 @@ async def cancel_job(
     if store.get_job(job_id):
         job = store.update_job(job_id, status=JobStatus.CANCELED, progress=0)
     await update_job_fields(session, job_id, status=JobStatus.CANCELED, progress=0)
+    get_active_job_registry().discard(job_id)
+    request_cancel(job_id)
+    get_status_cache().invalidate(job_id)
     try:
         from app.services.audit import write as audit_write
         audit_write("job.cancel", {"job_id": job_id, "user_id": current_user.id})
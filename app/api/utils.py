@@ -1,4 +1,18 @@
 from __future__ import annotations
 
+from fastapi import HTTPException, status
+
+from app.services.pagination import Keyset, decode_cursor
+
+
 def api_error(message: str) -> dict:
-    return {"error": {"message": message, "type": "client_error", "param": None, "code": None}}
\ No newline at end of file
+    return {"error": {"message": message, "type": "client_error", "param": None, "code": None}}
+
+
+def parse_cursor(cursor: str | None) -> Keyset | None:
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=api_error("Invalid cursor"))
@@ -9,7 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_session
 from app.schemas import JobCreate, JobKind, JobOut, JobParams, JobStatus, Orientation
-from app.services.persistence import get_job_db, list_assets_db, next_job_id, persist_job
+from app.services.ids import new_job_id
+from app.services.persistence import get_job_with_asset_url_db, persist_job
 from app.services.store import MemoryStore, get_store
 from app.services.generation import simulate_generation
 from app.api.utils import api_error
@@ -75,10 +76,7 @@ async def create_video(
     if image:
         params.extras["source_image_url"] = image
 
-    try:
-        new_job_id = await next_job_id(session)
-    except Exception:
-        new_job_id = None
+    job_id = new_job_id()
     job = store.create_job(
         JobCreate(
             prompt=prompt,
@@ -90,7 +88,7 @@ async def create_video(
             source_image_name=None,
             owner_id=(current_user.id if current_user else None),
         ),
-        job_id=new_job_id,
+        job_id=job_id,
     )
     await persist_job(session, job)
 
@@ -138,16 +136,10 @@ async def create_video(
 
 @router.get("/videos/{video_id}")
 async def get_video(video_id: str, session: AsyncSession = Depends(get_session)) -> dict:
-    job = await get_job_db(session, video_id)
+    job, asset_url = await get_job_with_asset_url_db(session, video_id)
     if not job:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_error("Not found"))
-    result_url = None
-    if job.asset_id:
-        assets = await list_assets_db(session)
-        for a in assets:
-            if a.id == job.asset_id:
-                result_url = a.url
-                break
+    result_url = asset_url if job.asset_id else None
     return {
         "video_id": job.id,
         "task_id": None,
@@ -23,6 +23,43 @@ class Settings(BaseSettings):
     database_url: str | None = Field(None, env="DATABASE_URL")
 
     storage_base: str = Field(..., env="STORAGE_BASE")
+    # Media backend: "local" (files under STORAGE_BASE, served from /media) or "s3"
+    # (S3-compatible bucket; /media/<key> redirects to a presigned or public URL)
+    storage_driver: str = Field("local", env="STORAGE_DRIVER")
+    s3_endpoint_url: str | None = Field(None, env="S3_ENDPOINT_URL")  # e.g. http://minio:9000 (default: AWS)
+    s3_bucket: str | None = Field(None, env="S3_BUCKET")
+    s3_region: str = Field("us-east-1", env="S3_REGION")
+    s3_access_key_id: str | None = Field(None, env="S3_ACCESS_KEY_ID")
+    s3_secret_access_key: str | None = Field(None, env="S3_SECRET_ACCESS_KEY")
+    s3_key_prefix: str = Field("", env="S3_KEY_PREFIX")
+    s3_addressing_style: str = Field("path", env="S3_ADDRESSING_STYLE")  # "path" or "virtual"
+    s3_presign_seconds: int = Field(900, env="S3_PRESIGN_SECONDS")
+    # Public bucket or CDN in front of it: redirect there without signing
+    s3_public_base_url: str | None = Field(None, env="S3_PUBLIC_BASE_URL")
+    s3_part_bytes: int = Field(8 * 1024 * 1024, env="S3_PART_BYTES")
+    # Uploads/data URLs are streamed to storage in chunks of this size; the limits are
+    # enforced while streaming
+    storage_chunk_bytes: int = Field(1024 * 1024, env="STORAGE_CHUNK_BYTES")
+    max_upload_bytes: int = Field(100 * 1024 * 1024, env="MAX_UPLOAD_BYTES")
+    max_source_image_bytes: int = Field(5 * 1024 * 1024, env="MAX_SOURCE_IMAGE_BYTES")
+    max_data_url_bytes: int = Field(32 * 1024 * 1024, env="MAX_DATA_URL_BYTES")
+    # Library previews derived in the background after generation/upload: WebP thumbnails
+    # for images (Pillow), poster frames for videos (ffmpeg, grabbed at VIDEO_POSTER_SECONDS)
+    thumbnail_enabled: bool = Field(True, env="THUMBNAIL_ENABLED")
+    thumbnail_max_px: int = Field(480, env="THUMBNAIL_MAX_PX")
+    thumbnail_quality: int = Field(80, env="THUMBNAIL_QUALITY")
+    thumbnail_workers: int = Field(2, env="THUMBNAIL_WORKERS")
+    thumbnail_queue_size: int = Field(1000, env="THUMBNAIL_QUEUE_SIZE")
+    ffmpeg_path: str = Field("ffmpeg", env="FFMPEG_PATH")
+    video_poster_seconds: float = Field(1.0, env="VIDEO_POSTER_SECONDS")
+    # Remote provider outputs (https URLs) are copied into storage in the background and
+    # the asset URL swapped once done; dropped transfers resume with Range requests
+    mirror_enabled: bool = Field(True, env="MIRROR_ENABLED")
+    mirror_concurrency: int = Field(4, env="MIRROR_CONCURRENCY")
+    mirror_queue_size: int = Field(1000, env="MIRROR_QUEUE_SIZE")
+    mirror_attempts: int = Field(5, env="MIRROR_ATTEMPTS")
+    mirror_backoff_seconds: float = Field(2.0, env="MIRROR_BACKOFF_SECONDS")
+    mirror_max_bytes: int = Field(1024 * 1024 * 1024, env="MIRROR_MAX_BYTES")
     cors_origins: list[str] = Field(..., env="CORS_ORIGINS")
     public_api_key: str | None = Field(None, env="PUBLIC_API_KEY")
     rate_limit_per_minute: int = Field(..., env="RATE_LIMIT_PER_MINUTE")
@@ -35,7 +72,67 @@ class Settings(BaseSettings):
     ext_image_upload_base: str | None = Field("https://img.scdn.io/api/v1.php", env="EXT_IMAGE_UPLOAD_BASE")
     ext_image_upload_auth_key: str | None = Field(None, env="EXT_IMAGE_UPLOAD_AUTH_KEY")
 
-    # Features (WebSocket removed; system uses HTTPS polling only)
+    # Features (WebSocket removed; clients poll over HTTPS or subscribe to SSE at /api/jobs/{id}/events)
+
+    # Task queue: global concurrency plus optional per-kind / per-provider caps,
+    # e.g. TASK_KIND_LIMITS={"text_to_video": 2}, TASK_PROVIDER_LIMITS={"sora2": 4}
+    task_concurrency: int = Field(8, env="TASK_CONCURRENCY")
+    task_kind_limits: dict[str, int] = Field(default_factory=dict, env="TASK_KIND_LIMITS")
+    task_provider_limits: dict[str, int] = Field(default_factory=dict, env="TASK_PROVIDER_LIMITS")
+    # Dequeued jobs (running or waiting for a slot) held by the in-process queue at once;
+    # the rest stay queued. 0 = 4 x TASK_CONCURRENCY
+    task_max_inflight: int = Field(0, env="TASK_MAX_INFLIGHT")
+    # "memory" (in-process asyncio queue), "database" (claim rows from the jobs table with
+    # SELECT ... FOR UPDATE SKIP LOCKED) or "auto" (database on PostgreSQL, memory otherwise)
+    task_queue_backend: str = Field("auto", env="TASK_QUEUE_BACKEND")
+    task_lease_seconds: int = Field(60, env="TASK_LEASE_SECONDS")
+    task_poll_interval: float = Field(2.0, env="TASK_POLL_INTERVAL")
+    # A claimed job whose run ended while its row still reads queued/running (failed load
+    # or final write) is left alone this long before it is claimed again
+    task_retry_seconds: float = Field(10.0, env="TASK_RETRY_SECONDS")
+    # Seconds of provider silence before a synthetic progress tick is emitted
+    progress_tick_seconds: float = Field(1.2, env="PROGRESS_TICK_SECONDS")
+    # Progress ticks are buffered and flushed to the jobs table in one UPDATE this often
+    progress_flush_ms: int = Field(500, env="PROGRESS_FLUSH_MS")
+
+    # Outbound provider HTTP: one keep-alive pool per provider (HTTP/2 needs the h2 package)
+    http_max_connections: int = Field(100, env="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive: int = Field(20, env="HTTP_MAX_KEEPALIVE")
+    http_keepalive_expiry: float = Field(30.0, env="HTTP_KEEPALIVE_EXPIRY")
+    http_http2: bool = Field(True, env="HTTP_HTTP2")
+
+    # MajicFlus (ModelScope) task polling: first check after the base interval, then
+    # back off up to the max interval; tasks still pending after the timeout fail
+    majicflus_poll_interval: float = Field(2.0, env="MAJICFLUS_POLL_INTERVAL")
+    majicflus_poll_max_interval: float = Field(15.0, env="MAJICFLUS_POLL_MAX_INTERVAL")
+    majicflus_task_timeout: float = Field(600.0, env="MAJICFLUS_TASK_TIMEOUT")
+
+    # Cached /api/jobs/{id}/status payloads: LRU size and lifetime of non-terminal entries
+    status_cache_max_entries: int = Field(10000, env="STATUS_CACHE_MAX_ENTRIES")
+    status_cache_ttl: float = Field(5.0, env="STATUS_CACHE_TTL")
+    # Server-Sent Events: keep-alive comment interval (also how often the DB is re-read
+    # for jobs that may be running in another process)
+    sse_heartbeat_seconds: float = Field(15.0, env="SSE_HEARTBEAT_SECONDS")
+    # Totals returned by /api/jobs and /api/assets are cached per filter set for this long
+    list_count_ttl: float = Field(30.0, env="LIST_COUNT_TTL")
+    list_count_max_entries: int = Field(2048, env="LIST_COUNT_MAX_ENTRIES")
+    # /api/jobs/active is served from memory and re-synced from the database this often
+    active_jobs_refresh_seconds: float = Field(5.0, env="ACTIVE_JOBS_REFRESH_SECONDS")
+    # In-memory hot state: finished jobs/assets are evicted LRU-first past these bounds
+    # (queued/running jobs are never evicted)
+    store_max_finished_jobs: int = Field(2000, env="STORE_MAX_FINISHED_JOBS")
+    store_max_finished_bytes: int = Field(64 * 1024 * 1024, env="STORE_MAX_FINISHED_BYTES")
+    store_finished_job_ttl: float = Field(900.0, env="STORE_FINISHED_JOB_TTL")
+    store_max_assets: int = Field(2000, env="STORE_MAX_ASSETS")
+    store_asset_ttl: float = Field(900.0, env="STORE_ASSET_TTL")
+    # PBKDF2 runs on a dedicated thread pool (0 = min(4, CPU count)); calls beyond
+    # workers + max_pending are rejected with 503 instead of queueing without bound
+    password_hash_workers: int = Field(0, env="PASSWORD_HASH_WORKERS")
+    password_hash_max_pending: int = Field(32, env="PASSWORD_HASH_MAX_PENDING")
+    # Verified access token -> user cache for auth dependencies (0 disables); admin/auth
+    # user changes invalidate it immediately, other processes within the TTL
+    auth_principal_ttl: float = Field(15.0, env="AUTH_PRINCIPAL_TTL")
+    auth_principal_max_entries: int = Field(10000, env="AUTH_PRINCIPAL_MAX_ENTRIES")
 
     # Auth
     jwt_secret: str = Field(..., env="JWT_SECRET")
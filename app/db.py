@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy import text
+from sqlalchemy.engine import Connection
 from sqlalchemy.engine.url import make_url
-from app.models.base import Base
 from app.services.persistence import ensure_default_providers
 import asyncio
 import asyncpg
@@ -15,6 +16,7 @@ import asyncpg
 from app.config import get_settings
 
 settings = get_settings()
+_ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
 
 engine = create_async_engine(
     settings.db_dsn.replace("postgresql+psycopg2", "postgresql+asyncpg"),
@@ -29,6 +31,17 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+def upgrade_schema(connection: Connection, revision: str = "head") -> None:
+    """Apply the Alembic migrations in ``alembic/versions`` on an open (sync) connection."""
+
+    from alembic import command
+    from alembic.config import Config
+
+    cfg = Config(str(_ALEMBIC_INI))
+    cfg.attributes["connection"] = connection
+    command.upgrade(cfg, revision)
+
+
 async def ensure_database_and_schema() -> None:
     url = make_url(settings.db_dsn)
     target_db = url.database
@@ -51,25 +64,7 @@ async def ensure_database_and_schema() -> None:
         except Exception:
             pass
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-        try:
-            await conn.execute(text("ALTER TABLE jobs ALTER COLUMN error TYPE TEXT"))
-        except Exception:
-            try:
-                await conn.execute(text("ALTER TABLE public.jobs ALTER COLUMN error TYPE TEXT"))
-            except Exception:
-                pass
-        for stmt in (
-            "ALTER TABLE assets ALTER COLUMN url TYPE TEXT",
-            "ALTER TABLE assets ALTER COLUMN preview_url TYPE TEXT",
-        ):
-            try:
-                await conn.execute(text(stmt))
-            except Exception:
-                try:
-                    await conn.execute(text(stmt.replace("assets", "public.assets")))
-                except Exception:
-                    pass
+        await conn.run_sync(upgrade_schema)
     try:
         async with SessionLocal() as s:
             await ensure_default_providers(s)
@@ -7,9 +7,30 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db import get_session
 from app.services.auth import decode_token
 from app.services.persistence import get_user_by_id
+from app.services.principal_cache import get_principal_cache
 from app.schemas import UserOut
 
 
+async def _resolve_user(token: str, session: AsyncSession) -> UserOut | None:
+    """User behind an access token; raises ``ValueError`` for a bad token.
+
+    Polled endpoints resolve the same token over and over, so a verified token is served
+    from the principal cache without decoding it or querying the user again.
+    """
+
+    cache = get_principal_cache()
+    user = cache.get(token)
+    if user is not None:
+        return user
+    payload = decode_token(token, token_type="access")
+    user_id = payload.get("sub")
+    generation = cache.generation(user_id) if user_id else None
+    user = await get_user_by_id(session, user_id)
+    if user is not None:
+        cache.put(token, user, payload.get("exp"), generation=generation)
+    return user
+
+
 async def get_current_user(
     authorization: str | None = Header(None),
     session: AsyncSession = Depends(get_session),
@@ -18,11 +39,9 @@ async def get_current_user(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=api_error("Missing token"))
     token = authorization.split(" ", 1)[1]
     try:
-        payload = decode_token(token, token_type="access")
+        user = await _resolve_user(token, session)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=api_error("Invalid token"))
-    user_id = payload.get("sub")
-    user = await get_user_by_id(session, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=api_error("Invalid token"))
     return user
@@ -36,8 +55,6 @@ async def get_current_user_optional(
         return None
     token = authorization.split(" ", 1)[1]
     try:
-        payload = decode_token(token, token_type="access")
+        return await _resolve_user(token, session)
     except ValueError:
         return None
-    user_id = payload.get("sub")
-    return await get_user_by_id(session, user_id)
@@ -0,0 +1,62 @@
+"""Shared async HTTP clients for provider adapters.
+
+One ``httpx.AsyncClient`` is kept per provider so calls to the same upstream reuse
+keep-alive (and, when the optional ``h2`` package is installed, HTTP/2) connections
+instead of opening a new TLS session per request.
+"""
+
+from __future__ import annotations
+
+from typing import Dict
+
+import httpx
+
+from app.config import get_settings
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def _build_client() -> httpx.AsyncClient:
+    settings = get_settings()
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        http2=bool(settings.http_http2) and _http2_available(),
+        timeout=httpx.Timeout(120.0, connect=15.0),
+        follow_redirects=True,
+    )
+
+
+def get_async_client(provider: str) -> httpx.AsyncClient:
+    """Return the pooled client for ``provider``, creating it on first use."""
+
+    client = _clients.get(provider)
+    if client is None or client.is_closed:
+        client = _clients[provider] = _build_client()
+    return client
+
+
+async def close_async_clients() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+
+
+def pool_snapshot() -> dict:
+    return {name: {"closed": client.is_closed} for name, client in _clients.items()}
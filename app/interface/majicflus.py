@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import time
-from typing import Any, Dict, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
 
 import requests
 
+from app.config import get_settings
+from app.interface.http import get_async_client
+
 
 DEFAULT_BASE_URL = "https://api-inference.modelscope.cn/"
 MODEL_ID = "MAILAND/majicflus_v1"
@@ -17,6 +22,7 @@ def _headers(api_key: str) -> dict[str, str]:
 
 def _wait(task_id: str, api_key: str, base_url: str, task_type: str = "image_generation", poll_interval: int = 5) -> Dict[str, Any]:
     h = {**_headers(api_key), "X-ModelScope-Task-Type": task_type}
+    deadline = time.monotonic() + get_settings().majicflus_task_timeout
     while True:
         r = requests.get(f"{base_url}v1/tasks/{task_id}", headers=h, timeout=30)
         r.raise_for_status()
@@ -26,21 +32,177 @@ def _wait(task_id: str, api_key: str, base_url: str, task_type: str = "image_gen
             return data
         if s == "FAILED":
             raise RuntimeError(str(data))
+        if time.monotonic() + poll_interval > deadline:
+            raise TimeoutError(f"ModelScope task {task_id} did not finish in time")
         time.sleep(poll_interval)
 
 
-def generate_image(prompt: str, *, api_key: str, base_url: str = DEFAULT_BASE_URL, size: str | None = None) -> Tuple[str, Dict[str, Any]]:
+@dataclass
+class _PendingTask:
+    task_id: str
+    api_key: str
+    base_url: str
+    task_type: str
+    future: asyncio.Future
+    deadline: float
+    interval: float
+    next_check: float
+
+
+class _TaskPoller:
+    """Polls every in-flight ModelScope task from one coroutine.
+
+    ``wait`` registers a task and awaits its future. The poll loop sleeps until the
+    earliest task is due, checks all due tasks together (bounded by ``concurrency``),
+    then backs each still-pending task off by ``backoff`` up to ``max_interval``. Tasks
+    past their deadline fail with ``TimeoutError``. ModelScope has no bulk status
+    endpoint, so a "batch" is the set of GETs issued in the same round.
+    """
+
+    def __init__(self, *, interval: float, max_interval: float, timeout: float, concurrency: int = 16, backoff: float = 1.5) -> None:
+        self.interval = max(0.1, float(interval))
+        self.max_interval = max(self.interval, float(max_interval))
+        self.timeout = float(timeout)
+        self.backoff = max(1.0, float(backoff))
+        self.concurrency = max(1, int(concurrency))
+        self.pending: Dict[str, _PendingTask] = {}
+        self.poll_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def wait(self, task_id: str, api_key: str, base_url: str, task_type: str = "image_generation") -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        entry = self.pending.get(task_id)
+        if entry is None:
+            entry = self.pending[task_id] = _PendingTask(
+                task_id=task_id,
+                api_key=api_key,
+                base_url=base_url,
+                task_type=task_type,
+                future=loop.create_future(),
+                deadline=now + self.timeout,
+                interval=self.interval,
+                next_check=now + self.interval,
+            )
+        self._ensure_running()
+        self._wakeup.set()
+        return await entry.future
+
+    def snapshot(self) -> dict:
+        return {"pending": len(self.pending), "running": bool(self.poll_task and not self.poll_task.done())}
+
+    def _ensure_running(self) -> None:
+        if self.poll_task is None or self.poll_task.done():
+            self._wakeup = asyncio.Event()
+            self.poll_task = asyncio.create_task(self._loop())
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self.pending:
+            self._wakeup.clear()
+            now = loop.time()
+            due = [e for e in self.pending.values() if e.next_check <= now]
+            if due:
+                sem = asyncio.Semaphore(self.concurrency)
+                await asyncio.gather(*(self._check(e, sem) for e in due))
+                continue
+            next_due = min(e.next_check for e in self.pending.values())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, next_due - now))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _check(self, entry: _PendingTask, sem: asyncio.Semaphore) -> None:
+        loop = asyncio.get_running_loop()
+        if entry.future.done():
+            # every waiter went away (e.g. the job was canceled)
+            self.pending.pop(entry.task_id, None)
+            return
+        h = {**_headers(entry.api_key), "X-ModelScope-Task-Type": entry.task_type}
+        try:
+            async with sem:
+                r = await get_async_client("majicflus").get(f"{entry.base_url}v1/tasks/{entry.task_id}", headers=h, timeout=30)
+            r.raise_for_status()
+            data = r.json()
+            s = data.get("task_status")
+            if s == "SUCCEED":
+                self._resolve(entry, result=data)
+                return
+            if s == "FAILED":
+                self._resolve(entry, error=RuntimeError(str(data)))
+                return
+        except Exception as exc:
+            self._resolve(entry, error=exc)
+            return
+        now = loop.time()
+        entry.interval = min(self.max_interval, entry.interval * self.backoff)
+        if now + entry.interval > entry.deadline:
+            self._resolve(entry, error=TimeoutError(f"ModelScope task {entry.task_id} did not finish in time"))
+            return
+        entry.next_check = now + entry.interval
+
+    def _resolve(self, entry: _PendingTask, *, result: Dict[str, Any] | None = None, error: BaseException | None = None) -> None:
+        self.pending.pop(entry.task_id, None)
+        if entry.future.done():
+            return
+        if error is not None:
+            entry.future.set_exception(error)
+        else:
+            entry.future.set_result(result)
+
+
+_poller: Optional[_TaskPoller] = None
+
+
+def get_task_poller() -> _TaskPoller:
+    global _poller
+    if _poller is None:
+        settings = get_settings()
+        _poller = _TaskPoller(
+            interval=settings.majicflus_poll_interval,
+            max_interval=settings.majicflus_poll_max_interval,
+            timeout=settings.majicflus_task_timeout,
+        )
+    return _poller
+
+
+async def _wait_async(task_id: str, api_key: str, base_url: str, task_type: str = "image_generation") -> Dict[str, Any]:
+    return await get_task_poller().wait(task_id, api_key, base_url, task_type)
+
+
+def _prepare(prompt: str, base_url: str | None, size: str | None) -> Tuple[str, Dict[str, Any]]:
     url = base_url or DEFAULT_BASE_URL
     if not url.endswith("/"):
         url = url + "/"
-    headers = {**_headers(api_key), "X-ModelScope-Async-Mode": "true"}
     payload: Dict[str, Any] = {"model": MODEL_ID, "prompt": prompt}
     if size:
         payload["size"] = size
+    return url, payload
+
+
+def generate_image(prompt: str, *, api_key: str, base_url: str = DEFAULT_BASE_URL, size: str | None = None) -> Tuple[str, Dict[str, Any]]:
+    url, payload = _prepare(prompt, base_url, size)
+    headers = {**_headers(api_key), "X-ModelScope-Async-Mode": "true"}
     resp = requests.post(f"{url}v1/images/generations", headers=headers, data=json.dumps(payload, ensure_ascii=False).encode("utf-8"), timeout=60)
     resp.raise_for_status()
     task_id = resp.json()["task_id"]
     data = _wait(task_id, api_key, url)
+    return _result(task_id, payload, data)
+
+
+async def generate_image_async(prompt: str, *, api_key: str, base_url: str = DEFAULT_BASE_URL, size: str | None = None) -> Tuple[str, Dict[str, Any]]:
+    url, payload = _prepare(prompt, base_url, size)
+    headers = {**_headers(api_key), "X-ModelScope-Async-Mode": "true"}
+    resp = await get_async_client("majicflus").post(
+        f"{url}v1/images/generations", headers=headers, content=json.dumps(payload, ensure_ascii=False).encode("utf-8"), timeout=60
+    )
+    resp.raise_for_status()
+    task_id = resp.json()["task_id"]
+    data = await _wait_async(task_id, api_key, url)
+    return _result(task_id, payload, data)
+
+
+def _result(task_id: str, payload: Dict[str, Any], data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
     outs = data.get("output_images") or []
     if not outs:
         raise RuntimeError("no output_images")
@@ -4,9 +4,11 @@ import json
 import re
 from typing import Any, Dict, Iterable, List, Tuple
 
+import httpx
 import requests
 import time
 from app.config import get_settings
+from app.interface.http import get_async_client
 
 DEFAULT_BASE_URL = "https://api.airgzn.top/"
 DEFAULT_MODEL = "gemini-2.5-flash-image"
@@ -217,56 +219,85 @@ def _extract_image_url(message: dict[str, Any]) -> str:
     raise RuntimeError("provider returned no image URL in message content")
 
 
-def _extract_from_stream(resp: requests.Response) -> Tuple[str | None, list[dict[str, Any]]]:
-    try:
-        _dbg("stream_enter", {"status": resp.status_code, "headers": dict(resp.headers)})
-    except Exception:
-        pass
-    chunks: list[dict[str, Any]] = []
-    last_url: str | None = None
-    for raw in resp.iter_lines(decode_unicode=True):
+class _StreamState:
+    """Incremental SSE parser shared by the sync and async clients.
+
+    ``feed`` takes one raw line and returns True once a media URL has been found or the
+    stream signalled ``[DONE]``; callers stop reading at that point.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: list[dict[str, Any]] = []
+        self.last_url: str | None = None
+
+    def feed(self, raw: str | None) -> bool:
         if not raw:
-            continue
+            return False
         line = raw.strip()
         if not line or not line.startswith("data:"):
-            continue
+            return False
         payload = line[5:].strip()
         if payload == "[DONE]":
-            break
+            return True
         try:
             obj = json.loads(payload)
         except Exception:
             url_val = _find_media_url(payload)
             if url_val:
-                last_url = _clean_url(url_val)
-                _dbg("stream_text_url", last_url)
-            continue
+                self.last_url = _clean_url(url_val)
+                _dbg("stream_text_url", self.last_url)
+            return False
         if isinstance(obj, dict):
-            chunks.append(obj)
+            self.chunks.append(obj)
             choices = obj.get("choices") or []
             if not choices:
-                continue
+                return False
             delta = choices[0].get("delta") or {}
             content = delta.get("content")
             if isinstance(content, list):
                 url_val = _extract_url_from_parts(content)
                 if url_val:
-                    last_url = url_val
-                    _dbg("stream_parts_url", last_url)
-                    break
+                    self.last_url = url_val
+                    _dbg("stream_parts_url", self.last_url)
+                    return True
             if isinstance(content, str):
                 url_val = _find_media_url(content)
                 if url_val:
-                    last_url = url_val
-                    _dbg("stream_string_url", last_url)
-                    break
+                    self.last_url = url_val
+                    _dbg("stream_string_url", self.last_url)
+                    return True
             url_val = _search_media_in_obj(content)
             if url_val:
-                last_url = url_val
-                _dbg("stream_nested_url", last_url)
-                break
-    _dbg("stream_done", {"last_url": last_url, "chunks": len(chunks)})
-    return last_url, chunks
+                self.last_url = url_val
+                _dbg("stream_nested_url", self.last_url)
+                return True
+        return False
+
+
+def _extract_from_stream(resp: requests.Response) -> Tuple[str | None, list[dict[str, Any]]]:
+    try:
+        _dbg("stream_enter", {"status": resp.status_code, "headers": dict(resp.headers)})
+    except Exception:
+        pass
+    state = _StreamState()
+    for raw in resp.iter_lines(decode_unicode=True):
+        if state.feed(raw):
+            break
+    _dbg("stream_done", {"last_url": state.last_url, "chunks": len(state.chunks)})
+    return state.last_url, state.chunks
+
+
+async def _extract_from_stream_async(resp: httpx.Response) -> Tuple[str | None, list[dict[str, Any]]]:
+    try:
+        _dbg("stream_enter", {"status": resp.status_code, "headers": dict(resp.headers)})
+    except Exception:
+        pass
+    state = _StreamState()
+    async for raw in resp.aiter_lines():
+        if state.feed(raw):
+            break
+    _dbg("stream_done", {"last_url": state.last_url, "chunks": len(state.chunks)})
+    return state.last_url, state.chunks
 
 
 def _build_content(prompt: str, image_url: str | None) -> List[Dict[str, Any]] | str:
@@ -357,22 +388,16 @@ def _generate_via_images_api(
     return image_out, provider_response
 
 
-def generate_image(
+def _build_chat_payload(
     prompt: str,
     *,
     model: str | None,
-    api_key: str | None,
-    base_url: str | None = None,
-    size: str | None = None,
-    image_url: str | None = None,
-    provider_name: str = "openai-compatible",
-    temperature: float | None = 1,
-    top_p: float | None = 1,
-    stream_options: dict[str, Any] | None = None,
-    stream: bool | None = None,
-    api_style: str | None = None,
-) -> Tuple[str, Dict[str, Any]]:
-    endpoint = _resolve_chat_endpoint(base_url)
+    image_url: str | None,
+    temperature: float | None,
+    top_p: float | None,
+    stream_options: dict[str, Any] | None,
+    stream: bool | None,
+) -> Dict[str, Any]:
     content = _build_content(prompt, image_url)
     payload: Dict[str, Any] = {
         "model": model or DEFAULT_MODEL,
@@ -390,6 +415,77 @@ def generate_image(
     payload["stream"] = bool(stream) if stream is not None else False
     if stream_options:
         payload["stream_options"] = stream_options
+    return payload
+
+
+def _image_from_chat_data(data: Dict[str, Any], response_text: str) -> str | None:
+    try:
+        _dbg("chat_api_response_text", response_text[:1000])
+    except Exception:
+        pass
+    choices = data.get("choices") or []
+    if not choices:
+        raise RuntimeError("provider returned no choices")
+    message = choices[0].get("message") or {}
+    try:
+        _dbg("chat_response_shape", {"choices": len(choices), "message_keys": list(message.keys())})
+    except Exception:
+        pass
+    try:
+        return _extract_image_url(message)
+    except Exception:
+        alt = _search_media_in_obj(data)
+        return _clean_url(alt) if isinstance(alt, str) else None
+
+
+def _attach_debug(
+    provider_response: Dict[str, Any],
+    *,
+    endpoint: str,
+    api_key: str | None,
+    payload: Dict[str, Any],
+    response: Any,
+    t0: float | None,
+    include_text: bool,
+) -> None:
+    # ``response`` is a requests.Response or an httpx.Response; both expose the same fields used here.
+    try:
+        if _debug_enabled():
+            h = _headers(api_key)
+            sh = {k: ("Bearer ***" if k.lower() == "authorization" else v) for k, v in h.items()}
+            dbg: Dict[str, Any] = {
+                "request": {"method": "POST", "url": endpoint, "headers": sh, "body": payload},
+                "response": {"status_code": response.status_code, "headers": dict(response.headers)},
+            }
+            if t0 is not None:
+                dbg["duration_ms"] = int((time.perf_counter() - t0) * 1000)
+            if include_text:
+                dbg["response"]["text"] = response.text[:2000]
+            if isinstance(provider_response["raw"], dict):
+                provider_response["raw"]["debug"] = dbg
+    except Exception:
+        pass
+
+
+def generate_image(
+    prompt: str,
+    *,
+    model: str | None,
+    api_key: str | None,
+    base_url: str | None = None,
+    size: str | None = None,
+    image_url: str | None = None,
+    provider_name: str = "openai-compatible",
+    temperature: float | None = 1,
+    top_p: float | None = 1,
+    stream_options: dict[str, Any] | None = None,
+    stream: bool | None = None,
+    api_style: str | None = None,
+) -> Tuple[str, Dict[str, Any]]:
+    endpoint = _resolve_chat_endpoint(base_url)
+    payload = _build_chat_payload(
+        prompt, model=model, image_url=image_url, temperature=temperature, top_p=top_p, stream_options=stream_options, stream=stream
+    )
     _dbg(
         "chat_api_request",
         {
@@ -427,52 +523,23 @@ def generate_image(
             raise RuntimeError("provider returned no image URL in stream")
     else:
         data = response.json()
-        try:
-            _dbg("chat_api_response_text", response.text[:1000])
-        except Exception:
-            pass
-        choices = data.get("choices") or []
-        if not choices:
-            raise RuntimeError("provider returned no choices")
-        message = choices[0].get("message") or {}
-        try:
-            _dbg("chat_response_shape", {"choices": len(choices), "message_keys": list(message.keys())})
-        except Exception:
-            pass
-        try:
-            image_out = _extract_image_url(message)
-        except Exception:
-            alt = _search_media_in_obj(data)
-            image_out = _clean_url(alt) if isinstance(alt, str) else None
-
+        image_out = _image_from_chat_data(data, response.text)
         provider_response["raw"] = data
-    try:
-        if _debug_enabled():
-            h = _headers(api_key)
-            sh = {k: ("Bearer ***" if k.lower() == "authorization" else v) for k, v in h.items()}
-            dbg: Dict[str, Any] = {
-                "request": {"method": "POST", "url": endpoint, "headers": sh, "body": payload},
-                "response": {"status_code": response.status_code, "headers": dict(response.headers)},
-                "duration_ms": int((time.perf_counter() - t0) * 1000),
-            }
-            if not payload["stream"]:
-                dbg["response"]["text"] = response.text[:2000]
-            if isinstance(provider_response["raw"], dict):
-                provider_response["raw"]["debug"] = dbg
-    except Exception:
-        pass
+    _attach_debug(
+        provider_response, endpoint=endpoint, api_key=api_key, payload=payload, response=response, t0=t0, include_text=not payload["stream"]
+    )
     _dbg("chat_final_url", image_out)
     return image_out, provider_response
 
 
-def edit_image(
-    image_url: list[str] | str,
+async def generate_image_async(
     prompt: str,
     *,
     model: str | None,
     api_key: str | None,
     base_url: str | None = None,
     size: str | None = None,
+    image_url: str | None = None,
     provider_name: str = "openai-compatible",
     temperature: float | None = 1,
     top_p: float | None = 1,
@@ -480,6 +547,70 @@ def edit_image(
     stream: bool | None = None,
     api_style: str | None = None,
 ) -> Tuple[str, Dict[str, Any]]:
+    endpoint = _resolve_chat_endpoint(base_url)
+    payload = _build_chat_payload(
+        prompt, model=model, image_url=image_url, temperature=temperature, top_p=top_p, stream_options=stream_options, stream=stream
+    )
+    _dbg(
+        "chat_api_request",
+        {
+            "url": endpoint,
+            "model": payload["model"],
+            "stream": payload["stream"],
+            "prompt": prompt,
+            "has_image": bool(image_url),
+        },
+    )
+    provider_response: Dict[str, Any] = {
+        "provider": provider_name,
+        "model": payload["model"],
+        "request": payload,
+    }
+    client = get_async_client(provider_name)
+    t0 = time.perf_counter()
+    request = client.build_request(
+        "POST",
+        endpoint,
+        headers=_headers(api_key),
+        content=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        timeout=120,
+    )
+    response = await client.send(request, stream=True)
+    try:
+        response.raise_for_status()
+        try:
+            _dbg("chat_api_response", {"status": response.status_code})
+        except Exception:
+            pass
+        if payload["stream"]:
+            image_out, chunks = await _extract_from_stream_async(response)
+            provider_response["raw"] = {"chunks": chunks}
+            if not image_out:
+                raise RuntimeError("provider returned no image URL in stream")
+        else:
+            await response.aread()
+            data = response.json()
+            image_out = _image_from_chat_data(data, response.text)
+            provider_response["raw"] = data
+    finally:
+        await response.aclose()
+    _attach_debug(
+        provider_response, endpoint=endpoint, api_key=api_key, payload=payload, response=response, t0=t0, include_text=not payload["stream"]
+    )
+    _dbg("chat_final_url", image_out)
+    return image_out, provider_response
+
+
+def _build_edit_payload(
+    image_url: list[str] | str,
+    prompt: str,
+    *,
+    model: str | None,
+    size: str | None,
+    temperature: float | None,
+    top_p: float | None,
+    api_style: str | None,
+) -> Tuple[Dict[str, Any], list[str]]:
     style = (api_style or "chat-completions").lower()
     if style == "images-generations":
         raise ValueError("image edits are not supported via /v1/images/generations")
@@ -492,7 +623,6 @@ def edit_image(
     if not urls:
         raise ValueError("image_url is required for edit_image")
 
-    endpoint = _resolve_chat_endpoint(base_url)
     payload: Dict[str, Any] = {
         "model": model or DEFAULT_MODEL,
         "messages": [
@@ -506,10 +636,47 @@ def edit_image(
         payload["temperature"] = temperature
     if top_p is not None:
         payload["top_p"] = top_p
-    stream = False
     payload["stream"] = False
     if size:
         payload["size"] = size
+    return payload, urls
+
+
+def _image_from_edit_data(data: Dict[str, Any], response_text: str) -> str | None:
+    try:
+        _dbg("chat_edit_response_text", response_text[:1000])
+    except Exception:
+        pass
+    choices = data.get("choices") or []
+    if not choices:
+        raise RuntimeError("provider returned no choices")
+    message = choices[0].get("message") or {}
+    try:
+        return _extract_image_url(message)
+    except Exception:
+        alt = _search_media_in_obj(data)
+        return _clean_url(alt) if isinstance(alt, str) else None
+
+
+def edit_image(
+    image_url: list[str] | str,
+    prompt: str,
+    *,
+    model: str | None,
+    api_key: str | None,
+    base_url: str | None = None,
+    size: str | None = None,
+    provider_name: str = "openai-compatible",
+    temperature: float | None = 1,
+    top_p: float | None = 1,
+    stream_options: dict[str, Any] | None = None,
+    stream: bool | None = None,
+    api_style: str | None = None,
+) -> Tuple[str, Dict[str, Any]]:
+    payload, urls = _build_edit_payload(
+        image_url, prompt, model=model, size=size, temperature=temperature, top_p=top_p, api_style=api_style
+    )
+    endpoint = _resolve_chat_endpoint(base_url)
     _dbg("chat_edit_request", {"url": endpoint, "model": payload["model"], "images": len(urls), "size": size, "stream": False})
 
     t0 = time.perf_counter()
@@ -532,35 +699,60 @@ def edit_image(
     }
 
     data = response.json()
+    image_out = _image_from_edit_data(data, response.text)
+    provider_response["raw"] = data
+    _attach_debug(provider_response, endpoint=endpoint, api_key=api_key, payload=payload, response=response, t0=None, include_text=True)
+    _dbg("chat_edit_final_url", image_out)
+    return image_out, provider_response
+
+
+async def edit_image_async(
+    image_url: list[str] | str,
+    prompt: str,
+    *,
+    model: str | None,
+    api_key: str | None,
+    base_url: str | None = None,
+    size: str | None = None,
+    provider_name: str = "openai-compatible",
+    temperature: float | None = 1,
+    top_p: float | None = 1,
+    stream_options: dict[str, Any] | None = None,
+    stream: bool | None = None,
+    api_style: str | None = None,
+) -> Tuple[str, Dict[str, Any]]:
+    payload, urls = _build_edit_payload(
+        image_url, prompt, model=model, size=size, temperature=temperature, top_p=top_p, api_style=api_style
+    )
+    endpoint = _resolve_chat_endpoint(base_url)
+    _dbg("chat_edit_request", {"url": endpoint, "model": payload["model"], "images": len(urls), "size": size, "stream": False})
+
+    t0 = time.perf_counter()
+    response = await get_async_client(provider_name).post(
+        endpoint,
+        headers=_headers(api_key),
+        content=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        timeout=120,
+    )
+    response.raise_for_status()
     try:
-        _dbg("chat_edit_response_text", response.text[:1000])
+        _dbg("chat_edit_response", {"status": response.status_code, "duration_ms": int((time.perf_counter() - t0) * 1000)})
     except Exception:
         pass
-    choices = data.get("choices") or []
-    if not choices:
-        raise RuntimeError("provider returned no choices")
-    message = choices[0].get("message") or {}
-    try:
-        image_out = _extract_image_url(message)
-    except Exception:
-        alt = _search_media_in_obj(data)
-        image_out = _clean_url(alt) if isinstance(alt, str) else None
+    provider_response: Dict[str, Any] = {
+        "provider": provider_name,
+        "model": payload["model"],
+        "request": payload,
+    }
 
+    data = response.json()
+    image_out = _image_from_edit_data(data, response.text)
     provider_response["raw"] = data
-    try:
-        if _debug_enabled():
-            h = _headers(api_key)
-            sh = {k: ("Bearer ***" if k.lower() == "authorization" else v) for k, v in h.items()}
-            dbg = {
-                "request": {"method": "POST", "url": endpoint, "headers": sh, "body": payload},
-                "response": {"status_code": response.status_code, "headers": dict(response.headers), "text": response.text[:2000]},
-            }
-            if isinstance(provider_response["raw"], dict):
-                provider_response["raw"]["debug"] = dbg
-    except Exception:
-        pass
+    _attach_debug(provider_response, endpoint=endpoint, api_key=api_key, payload=payload, response=response, t0=None, include_text=True)
     _dbg("chat_edit_final_url", image_out)
     return image_out, provider_response
+
+
 def _debug_enabled() -> bool:
     try:
         s = get_settings()
@@ -9,9 +9,15 @@ from app.interface import sora_image as sora_image_client
 
 
 class MajicFlusAdapter:
-    def generate_image(self, prompt: str, *, model: str, api_key: str, base_url: str, size: str | None = None) -> Tuple[str, dict]:
+    def generate_image(
+        self, prompt: str, *, model: str, api_key: str, base_url: str, size: str | None = None, api_style: str | None = None
+    ) -> Tuple[str, dict]:
         return majicflus_client.generate_image(prompt, api_key=api_key, base_url=base_url, size=size)
 
+    async def generate_image_async(
+        self, prompt: str, *, model: str, api_key: str, base_url: str, size: str | None = None, api_style: str | None = None
+    ) -> Tuple[str, dict]:
+        return await majicflus_client.generate_image_async(prompt, api_key=api_key, base_url=base_url, size=size)
 
 
 
@@ -63,6 +69,50 @@ class OpenAIImageAdapter:
             api_style=api_style,
         )
 
+    async def generate_image_async(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        api_key: str | None,
+        base_url: str,
+        size: str | None = None,
+        image_url: str | None = None,
+        api_style: str | None = None,
+    ) -> Tuple[str, dict]:
+        return await openai_image_client.generate_image_async(
+            prompt,
+            model=model,
+            api_key=api_key,
+            base_url=base_url,
+            size=size,
+            image_url=image_url,
+            provider_name=self.provider_name,
+            api_style=api_style,
+        )
+
+    async def edit_image_async(
+        self,
+        image_url: list[str] | str,
+        prompt: str,
+        *,
+        model: str,
+        api_key: str | None,
+        base_url: str,
+        size: str | None = None,
+        api_style: str | None = None,
+    ) -> Tuple[str, dict]:
+        return await openai_image_client.edit_image_async(
+            image_url,
+            prompt,
+            model=model,
+            api_key=api_key,
+            base_url=base_url,
+            size=size,
+            provider_name=self.provider_name,
+            api_style=api_style,
+        )
+
 
 class SoraImageAdapter:
     def generate_image(
@@ -74,6 +124,7 @@ class SoraImageAdapter:
         base_url: str,
         size: str | None = None,
         image_url: str | None = None,
+        api_style: str | None = None,
     ) -> Tuple[str, dict]:
         return sora_image_client.generate_image(
             prompt,
@@ -84,6 +135,26 @@ class SoraImageAdapter:
             image_url=image_url,
         )
 
+    async def generate_image_async(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        api_key: str | None,
+        base_url: str,
+        size: str | None = None,
+        image_url: str | None = None,
+        api_style: str | None = None,
+    ) -> Tuple[str, dict]:
+        return await sora_image_client.generate_image_async(
+            prompt,
+            model=model,
+            api_key=api_key,
+            base_url=base_url,
+            size=size,
+            image_url=image_url,
+        )
+
 
 class Sora2Adapter:
     def create_video(
@@ -111,6 +182,31 @@ class Sora2Adapter:
             on_progress=on_progress,
         )
 
+    async def create_video_async(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        image: str | None,
+        api_key: str | None,
+        base_url: str | None,
+        debug: bool | None = None,
+        duration_seconds: int | None = None,
+        resolution: str | None = None,
+        on_progress: Any | None = None,
+    ) -> dict:
+        return await sora2_client.create_video_async(
+            prompt,
+            model=model,
+            image=image,
+            api_key=api_key,
+            base_url=base_url,
+            debug=bool(debug),
+            duration_seconds=duration_seconds,
+            resolution=resolution,
+            on_progress=on_progress,
+        )
+
     def get_video(
         self,
         video_id: str,
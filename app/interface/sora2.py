@@ -11,6 +11,7 @@ import mimetypes
 import re
 from pathlib import Path
 from app.config import get_settings
+from app.interface.http import get_async_client
 
 
 DEFAULT_BASE_URL = "https://sora2api.airgzn.top/"
@@ -33,6 +34,8 @@ def _error(message: str) -> Dict[str, Any]:
 
 
 def _to_data_uri(src: str) -> str:
+    # Async callers pass sources already resolved by app.services.storage.media_source;
+    # this fallback only covers local files for the blocking helpers.
     if src.startswith("data:"):
         return src
     if src.startswith("/media/"):
@@ -54,21 +57,9 @@ def _parse_model_settings(model: str | None) -> Tuple[str | None, int | None]:
     return orientation, duration
 
 
-def create_video(
-    prompt: str,
-    *,
-    model: str,
-    image: str | None,
-    api_key: str | None,
-    base_url: str | None,
-    debug: bool = False,
-    video: str | None = None,
-    role: str | None = None,
-    duration_seconds: int | None = None,
-    resolution: str | None = None,
-    on_progress: Callable[[float], None] | None = None,
+def _build_create_payload(
+    prompt: str, *, model: str, image: str | None, video: str | None
 ) -> Dict[str, Any]:
-    url = _normalize_base_url(base_url) + "v1/chat/completions"
     image_send = _to_data_uri(image) if isinstance(image, str) else None
     video_send = _to_data_uri(video) if isinstance(video, str) else None
     content: List[Dict[str, Any]] | str
@@ -83,68 +74,83 @@ def create_video(
         content = items
     else:
         content = prompt
-    payload: Dict[str, Any] = {"model": model, "messages": [{"role": "user", "content": content}], "stream": True}
-    h = _headers(api_key)
-    sh = {k: ("Bearer ***" if k.lower() == "authorization" else v) for k, v in h.items()}
-    t0 = time.perf_counter()
-    resp = requests.post(url, headers=h, data=json.dumps(payload), timeout=120, stream=True)
-    if resp.status_code not in (200, 201, 202):
-        text = None
-        try:
-            text = resp.text
-            data = json.loads(text)
-        except Exception:
-            data = _error("Invalid JSON response")
-        if debug and isinstance(data, dict):
-            dbg = {"request": {"method": "POST", "url": url, "headers": sh, "body": payload}, "response": {"status_code": resp.status_code, "headers": dict(resp.headers), "text": (text or "")[:2000]}, "duration_ms": int((time.perf_counter() - t0) * 1000)}
-            try:
-                logging.getLogger("app.interface.sora2").info(json.dumps({"chat_completions": dbg}))
-            except Exception:
-                pass
-            data["debug"] = dbg
-        return data if "error" in data else _error(f"HTTP {resp.status_code}")
-    result_url: str | None = None
-    for raw in resp.iter_lines(decode_unicode=True):
+    return {"model": model, "messages": [{"role": "user", "content": content}], "stream": True}
+
+
+class _VideoStreamState:
+    """Incremental parser for the streamed chat completion, shared by the sync and async clients.
+
+    ``feed`` takes one raw SSE line, reports ``reasoning_content`` percentages through
+    ``on_progress`` and returns True once the result URL is known or the stream is done.
+    """
+
+    def __init__(self, on_progress: Callable[[float], None] | None = None) -> None:
+        self.on_progress = on_progress
+        self.result_url: str | None = None
+
+    def feed(self, raw: str | None) -> bool:
         if not raw:
-            continue
+            return False
         line = raw.strip()
-        if not line:
-            continue
-        if line.startswith("data:"):
-            content_str = line[5:].strip()
-            if content_str == "[DONE]":
-                break
-            try:
-                obj = json.loads(content_str)
-            except Exception:
-                m = re.search(r"(https?://\S+|data:video/\w+;base64,[A-Za-z0-9+/=]+)", content_str)
-                if m:
-                    result_url = m.group(1)
-                continue
-            try:
-                choices = obj.get("choices") or []
-                if choices:
-                    c0 = choices[0]
-                    delta = c0.get("delta") or {}
-                    rc = delta.get("reasoning_content")
-                    if isinstance(rc, str) and on_progress is not None:
-                        try:
-                            mm = re.search(r"(\d+(?:\.\d+)?)%", rc)
-                            if mm:
-                                val = float(mm.group(1))
-                                on_progress(val)
-                        except Exception:
-                            pass
-                    msg_content = delta.get("content")
-                    if isinstance(msg_content, str):
-                        m = re.search(r"src=['\"]\s*(https?://[^'\"\s]+)", msg_content)
-                        if not m:
-                            m = re.search(r"(https?://\S+|data:video/\w+;base64,[A-Za-z0-9+/=]+)", msg_content)
-                        if m:
-                            result_url = m.group(1)
-                            break
-            except Exception:
-                pass
+        if not line or not line.startswith("data:"):
+            return False
+        content_str = line[5:].strip()
+        if content_str == "[DONE]":
+            return True
+        try:
+            obj = json.loads(content_str)
+        except Exception:
+            m = re.search(r"(https?://\S+|data:video/\w+;base64,[A-Za-z0-9+/=]+)", content_str)
+            if m:
+                self.result_url = m.group(1)
+            return False
+        try:
+            choices = obj.get("choices") or []
+            if choices:
+                c0 = choices[0]
+                delta = c0.get("delta") or {}
+                rc = delta.get("reasoning_content")
+                if isinstance(rc, str) and self.on_progress is not None:
+                    try:
+                        mm = re.search(r"(\d+(?:\.\d+)?)%", rc)
+                        if mm:
+                            val = float(mm.group(1))
+                            self.on_progress(val)
+                    except Exception:
+                        pass
+                msg_content = delta.get("content")
+                if isinstance(msg_content, str):
+                    m = re.search(r"src=['\"]\s*(https?://[^'\"\s]+)", msg_content)
+                    if not m:
+                        m = re.search(r"(https?://\S+|data:video/\w+;base64,[A-Za-z0-9+/=]+)", msg_content)
+                    if m:
+                        self.result_url = m.group(1)
+                        return True
+        except Exception:
+            pass
+        return False
+
+
+def _create_error(
+    status_code: int, text: str | None, headers: Any, *, url: str, sh: dict, payload: Dict[str, Any], t0: float, debug: bool
+) -> Dict[str, Any]:
+    try:
+        data = json.loads(text or "")
+    except Exception:
+        data = _error("Invalid JSON response")
+    if debug and isinstance(data, dict):
+        dbg = {"request": {"method": "POST", "url": url, "headers": sh, "body": payload}, "response": {"status_code": status_code, "headers": dict(headers), "text": (text or "")[:2000]}, "duration_ms": int((time.perf_counter() - t0) * 1000)}
+        try:
+            logging.getLogger("app.interface.sora2").info(json.dumps({"chat_completions": dbg}))
+        except Exception:
+            pass
+        data["debug"] = dbg
+    return data if "error" in data else _error(f"HTTP {status_code}")
+
+
+def _create_result(
+    result_url: str | None, headers: Any, *, model: str, url: str, sh: dict, payload: Dict[str, Any], t0: float, debug: bool
+) -> Dict[str, Any]:
     if isinstance(result_url, str) and result_url:
         try:
             b64 = base64.b64encode(result_url.encode("utf-8")).decode("ascii")
@@ -155,7 +161,7 @@ def create_video(
         video_id = str(int(time.perf_counter() * 1000))
     out = {"status": ("succeeded" if result_url else "processing"), "result_url": result_url, "video_url": result_url, "video_id": video_id, "model": model}
     if debug and isinstance(out, dict):
-        dbg = {"request": {"method": "POST", "url": url, "headers": sh, "body": payload}, "response": {"status_code": 200, "headers": dict(resp.headers), "text": "[streamed]", "duration_ms": int((time.perf_counter() - t0) * 1000)}}
+        dbg = {"request": {"method": "POST", "url": url, "headers": sh, "body": payload}, "response": {"status_code": 200, "headers": dict(headers), "text": "[streamed]", "duration_ms": int((time.perf_counter() - t0) * 1000)}}
         try:
             logging.getLogger("app.interface.sora2").info(json.dumps({"chat_completions": dbg}))
         except Exception:
@@ -164,6 +170,79 @@ def create_video(
     return out
 
 
+def create_video(
+    prompt: str,
+    *,
+    model: str,
+    image: str | None,
+    api_key: str | None,
+    base_url: str | None,
+    debug: bool = False,
+    video: str | None = None,
+    role: str | None = None,
+    duration_seconds: int | None = None,
+    resolution: str | None = None,
+    on_progress: Callable[[float], None] | None = None,
+) -> Dict[str, Any]:
+    url = _normalize_base_url(base_url) + "v1/chat/completions"
+    payload = _build_create_payload(prompt, model=model, image=image, video=video)
+    h = _headers(api_key)
+    sh = {k: ("Bearer ***" if k.lower() == "authorization" else v) for k, v in h.items()}
+    t0 = time.perf_counter()
+    resp = requests.post(url, headers=h, data=json.dumps(payload), timeout=120, stream=True)
+    if resp.status_code not in (200, 201, 202):
+        text = None
+        try:
+            text = resp.text
+        except Exception:
+            pass
+        return _create_error(resp.status_code, text, resp.headers, url=url, sh=sh, payload=payload, t0=t0, debug=debug)
+    state = _VideoStreamState(on_progress)
+    for raw in resp.iter_lines(decode_unicode=True):
+        if state.feed(raw):
+            break
+    return _create_result(state.result_url, resp.headers, model=model, url=url, sh=sh, payload=payload, t0=t0, debug=debug)
+
+
+async def create_video_async(
+    prompt: str,
+    *,
+    model: str,
+    image: str | None,
+    api_key: str | None,
+    base_url: str | None,
+    debug: bool = False,
+    video: str | None = None,
+    role: str | None = None,
+    duration_seconds: int | None = None,
+    resolution: str | None = None,
+    on_progress: Callable[[float], None] | None = None,
+) -> Dict[str, Any]:
+    url = _normalize_base_url(base_url) + "v1/chat/completions"
+    payload = _build_create_payload(prompt, model=model, image=image, video=video)
+    h = _headers(api_key)
+    sh = {k: ("Bearer ***" if k.lower() == "authorization" else v) for k, v in h.items()}
+    client = get_async_client("sora2")
+    t0 = time.perf_counter()
+    request = client.build_request("POST", url, headers=h, content=json.dumps(payload), timeout=120)
+    resp = await client.send(request, stream=True)
+    try:
+        if resp.status_code not in (200, 201, 202):
+            text = None
+            try:
+                text = (await resp.aread()).decode("utf-8", errors="replace")
+            except Exception:
+                pass
+            return _create_error(resp.status_code, text, resp.headers, url=url, sh=sh, payload=payload, t0=t0, debug=debug)
+        state = _VideoStreamState(on_progress)
+        async for raw in resp.aiter_lines():
+            if state.feed(raw):
+                break
+    finally:
+        await resp.aclose()
+    return _create_result(state.result_url, resp.headers, model=model, url=url, sh=sh, payload=payload, t0=t0, debug=debug)
+
+
 def get_video(
     video_id: str,
     *,
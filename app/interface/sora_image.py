@@ -6,6 +6,8 @@ from typing import Any, Dict, Iterable, List, Tuple
 
 import requests
 
+from app.interface.http import get_async_client
+
 DEFAULT_BASE_URL = "http://localhost:8000/"
 DEFAULT_MODEL = "sora-image"
 
@@ -72,58 +74,56 @@ def _extract_image_url(message: dict[str, Any]) -> str:
     raise RuntimeError("provider returned no image URL in message content")
 
 
-def _extract_from_stream(resp: requests.Response) -> Tuple[str | None, list[dict[str, Any]]]:
-    chunks: list[dict[str, Any]] = []
-    last_url: str | None = None
-    for raw in resp.iter_lines(decode_unicode=True):
+class _StreamState:
+    """Incremental SSE parser shared by the sync and async clients.
+
+    ``feed`` takes one raw line and returns True once the image URL has been found or the
+    stream signalled ``[DONE]``; callers stop reading at that point.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: list[dict[str, Any]] = []
+        self.last_url: str | None = None
+
+    def feed(self, raw: str | None) -> bool:
         if not raw:
-            continue
+            return False
         line = raw.strip()
         if not line:
-            continue
+            return False
         if not line.startswith("data:"):
-            continue
+            return False
         data_str = line[5:].strip()
         if data_str == "[DONE]":
-            break
+            return True
         try:
             obj = json.loads(data_str)
         except Exception:
             match = re.search(r"https?://\S+", data_str)
             if match:
-                last_url = _clean_url(match.group(0))
-            continue
+                self.last_url = _clean_url(match.group(0))
+            return False
         if isinstance(obj, dict):
-            chunks.append(obj)
+            self.chunks.append(obj)
             choices = obj.get("choices") or []
             if not choices:
-                continue
+                return False
             delta = choices[0].get("delta") or {}
             content = delta.get("content")
             if isinstance(content, list):
                 url_val = _extract_url_from_parts(content)
                 if url_val:
-                    last_url = url_val
-                    break
+                    self.last_url = url_val
+                    return True
             if isinstance(content, str):
                 match = re.search(r"https?://\S+", content)
                 if match:
-                    last_url = _clean_url(match.group(0))
-                    break
-    return last_url, chunks
+                    self.last_url = _clean_url(match.group(0))
+                    return True
+        return False
 
 
-def generate_image(
-    prompt: str,
-    *,
-    model: str = DEFAULT_MODEL,
-    api_key: str | None,
-    base_url: str | None = None,
-    size: str | None = None,
-    image_url: str | None = None,
-) -> Tuple[str, Dict[str, Any]]:
-    url = _normalize_base_url(base_url)
-    stream = bool(image_url)
+def _build_payload(prompt: str, model: str, size: str | None, image_url: str | None) -> Dict[str, Any]:
     payload: Dict[str, Any] = {
         "model": model or DEFAULT_MODEL,
         "messages": [
@@ -132,10 +132,42 @@ def generate_image(
                 "content": _build_content(prompt, image_url),
             }
         ],
-        "stream": stream,
+        "stream": bool(image_url),
     }
     if size:
         payload["size"] = size
+    return payload
+
+
+def _from_message_response(data: Dict[str, Any], provider_response: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    choices = data.get("choices") or []
+    if not choices:
+        raise RuntimeError("provider returned no choices")
+    message = choices[0].get("message") or {}
+    image_url_val = _extract_image_url(message)
+    provider_response["raw"] = data
+    return image_url_val, provider_response
+
+
+def _from_stream_state(state: _StreamState, provider_response: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    provider_response["raw"] = {"stream": True, "chunks": state.chunks}
+    if not state.last_url:
+        raise RuntimeError("provider returned no image URL in stream")
+    return state.last_url, provider_response
+
+
+def generate_image(
+    prompt: str,
+    *,
+    model: str = DEFAULT_MODEL,
+    api_key: str | None,
+    base_url: str | None = None,
+    size: str | None = None,
+    image_url: str | None = None,
+) -> Tuple[str, Dict[str, Any]]:
+    url = _normalize_base_url(base_url)
+    payload = _build_payload(prompt, model, size, image_url)
+    stream = payload["stream"]
     response = requests.post(
         f"{url}v1/chat/completions",
         headers=_headers(api_key),
@@ -152,18 +184,49 @@ def generate_image(
     }
 
     if stream:
-        image_url_val, chunks = _extract_from_stream(response)
-        provider_response["raw"] = {"stream": True, "chunks": chunks}
-        if not image_url_val:
-            raise RuntimeError("provider returned no image URL in stream")
-        return image_url_val, provider_response
+        state = _StreamState()
+        for raw in response.iter_lines(decode_unicode=True):
+            if state.feed(raw):
+                break
+        return _from_stream_state(state, provider_response)
+
+    return _from_message_response(response.json(), provider_response)
 
-    data = response.json()
-    choices = data.get("choices") or []
-    if not choices:
-        raise RuntimeError("provider returned no choices")
-    message = choices[0].get("message") or {}
-    image_url_val = _extract_image_url(message)
-    provider_response["raw"] = data
-    return image_url_val, provider_response
 
+async def generate_image_async(
+    prompt: str,
+    *,
+    model: str = DEFAULT_MODEL,
+    api_key: str | None,
+    base_url: str | None = None,
+    size: str | None = None,
+    image_url: str | None = None,
+) -> Tuple[str, Dict[str, Any]]:
+    url = _normalize_base_url(base_url)
+    payload = _build_payload(prompt, model, size, image_url)
+    provider_response: Dict[str, Any] = {
+        "provider": "sora",
+        "model": payload["model"],
+        "request": payload,
+    }
+    client = get_async_client("sora")
+    request = client.build_request(
+        "POST",
+        f"{url}v1/chat/completions",
+        headers=_headers(api_key),
+        content=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        timeout=120,
+    )
+    response = await client.send(request, stream=True)
+    try:
+        response.raise_for_status()
+        if payload["stream"]:
+            state = _StreamState()
+            async for raw in response.aiter_lines():
+                if state.feed(raw):
+                    break
+            return _from_stream_state(state, provider_response)
+        await response.aread()
+    finally:
+        await response.aclose()
+    return _from_message_response(response.json(), provider_response)
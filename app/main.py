@@ -19,12 +19,25 @@ from app.api import assets, auth, jobs, providers
 from app.api import images, videos
 from app.api import billing, preferences as preferences_api
 from app.api import admin
+from app.api.utils import api_error
 from app.db import engine, ensure_database_and_schema
-from app.models import asset, job, provider, user, wallet, preferences as preferences_model  # noqa: F401
+from app.models import asset, job, media, provider, user, wallet, preferences as preferences_model  # noqa: F401
 from app.models.base import Base
 from app.services.metrics import metrics
+from app.interface.http import close_async_clients
+from app.services.events import get_event_broker
+from app.services.progress import get_progress_writer
+from app.services.status_cache import get_status_cache
+from app.services.count_cache import get_count_cache
+from app.services.active_jobs import get_active_job_registry
+from app.services.blobs import get_blob_store
+from app.services.password_pool import PasswordPoolBusy, get_password_pool
+from app.services.principal_cache import get_principal_cache
+from app.services.mirror import get_mirror
 from app.services.taskqueue import get_task_queue
+from app.services.thumbnails import get_thumbnailer
 from app.services.store import get_store
+from app.services.storage_driver import close_storage_driver, get_storage_driver
 
 
 def create_app() -> FastAPI:
@@ -37,6 +50,7 @@ def create_app() -> FastAPI:
         allow_credentials=False,
         allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
         allow_headers=["Authorization", "Content-Type"],
+        expose_headers=["X-Next-Cursor"],
     )
 
     # 简易限流：滑动窗口 + 突发控制（内存）
@@ -66,6 +80,14 @@ def create_app() -> FastAPI:
         metrics.requests_total += 1
         return await call_next(request)
 
+    @app.exception_handler(PasswordPoolBusy)
+    async def password_pool_busy_handler(request: Request, exc: PasswordPoolBusy):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": api_error("server busy, please retry")},
+            headers={"Retry-After": "1"},
+        )
+
     app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
     app.include_router(providers.router, prefix="/api/providers", tags=["providers"])
     app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
@@ -76,7 +98,20 @@ def create_app() -> FastAPI:
     app.include_router(preferences_api.router, prefix="/api/preferences", tags=["preferences"]) 
     app.include_router(admin.router, prefix="/api/admin", tags=["admin"]) 
 
-    app.mount("/media", StaticFiles(directory=settings.storage_base, check_dir=False), name="media")
+    storage = get_storage_driver()
+    if storage.local_root is not None:
+        app.mount("/media", StaticFiles(directory=storage.local_root, check_dir=False), name="media")
+    else:
+        media_max_age = max(0, min(300, settings.s3_presign_seconds // 2))
+
+        @app.get("/media/{key:path}", include_in_schema=False)
+        async def media_redirect(key: str):
+            # bytes are fetched from object storage directly, never proxied
+            try:
+                url = storage.presign_get(key)
+            except ValueError:
+                return JSONResponse({"error": "not found"}, status_code=404)
+            return RedirectResponse(url, status_code=307, headers={"Cache-Control": f"private, max-age={media_max_age}"})
 
     frontend_root = settings.frontend_dist or "lightsource-vue/dist"
     app.mount("/assets", StaticFiles(directory=Path(frontend_root) / "assets", check_dir=False), name="assets")
@@ -98,28 +133,45 @@ def create_app() -> FastAPI:
 
     @app.get("/api/metrics", tags=["metrics"])
     async def get_metrics() -> dict:
-        return metrics.snapshot()
+        return {
+            **metrics.snapshot(),
+            "queue": get_task_queue().snapshot(),
+            "progress_writes": get_progress_writer().snapshot(),
+            "status_cache": get_status_cache().snapshot(),
+            "list_counts": get_count_cache().snapshot(),
+            "active_jobs": get_active_job_registry().snapshot(),
+            "store": get_store().snapshot(),
+            "events": get_event_broker().snapshot(),
+            "password_pool": get_password_pool().snapshot(),
+            "principals": get_principal_cache().snapshot(),
+            "blobs": get_blob_store().snapshot(),
+            "thumbnails": get_thumbnailer().snapshot(),
+            "mirror": get_mirror().snapshot(),
+        }
 
     @app.on_event("shutdown")
     async def shutdown_event() -> None:
-        await asyncio.sleep(0)
+        await get_progress_writer().stop()
+        await get_mirror().stop()
+        await get_thumbnailer().stop()
+        await close_async_clients()
+        get_password_pool().shutdown()
+        await close_storage_driver()
 
     @app.on_event("startup")
     async def startup_event() -> None:
         await ensure_database_and_schema()
         store = get_store()
+        store.add_job_listener(get_status_cache().bump)
+        store.add_job_listener(get_event_broker().publish)
+        store.add_job_listener(get_active_job_registry().track)
         tq = get_task_queue()
+        await get_progress_writer().start()
+        await get_thumbnailer().start()
+        await get_mirror().start()
         await tq.start(store)
         try:
-            from app.services.persistence import list_jobs_db, update_job_fields
-            from app.schemas import JobStatus
-            from app.db import SessionLocal
-            async with SessionLocal() as session:
-                jobs = await list_jobs_db(session)
-                for j in jobs:
-                    if j.status in {JobStatus.RUNNING, JobStatus.QUEUED}:
-                        await update_job_fields(session, j.id, status=JobStatus.QUEUED)
-                        await tq.enqueue(j.id)
+            await tq.recover(store)
         except Exception:
             pass
 
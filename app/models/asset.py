@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import enum
 
-from sqlalchemy import Boolean, Enum, ForeignKey, JSON, String, Text
+from sqlalchemy import Boolean, Enum, ForeignKey, Index, JSON, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -16,6 +16,13 @@ class AssetTypeDB(str, enum.Enum):
 
 class Asset(Base):
     __tablename__ = "assets"
+    # Keep in sync with alembic/versions/0003_list_indexes.py
+    __table_args__ = (
+        Index("ix_assets_created_at_id", "created_at", "id"),
+        Index("ix_assets_is_public_type_created_at", "is_public", "type", "created_at", "id"),
+        Index("ix_assets_owner_id_created_at", "owner_id", "created_at", "id"),
+        Index("ix_assets_provider_created_at", "provider", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True, index=True)
     owner_id: Mapped[str | None] = mapped_column(
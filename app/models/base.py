@@ -7,11 +7,17 @@ from sqlalchemy import DateTime, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
+def _utcnow() -> dt.datetime:
+    return dt.datetime.now(dt.timezone.utc)
+
+
 class Base(DeclarativeBase):
     """Declarative base with UTC timestamps."""
 
+    # Set client-side (microsecond precision, same format as bound parameters) so keyset
+    # cursors on (created_at, id) compare exactly; the server default covers raw inserts.
     created_at: Mapped[dt.datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), default=_utcnow, server_default=func.now(), nullable=False
     )
     updated_at: Mapped[Optional[dt.datetime]] = mapped_column(
         DateTime(timezone=True), onupdate=func.now(), nullable=True
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import datetime as dt
 import enum
 
-from sqlalchemy import Boolean, Enum, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, JSON, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -22,8 +23,22 @@ class JobStatusDB(str, enum.Enum):
     CANCELED = "canceled"
 
 
+# Predicate of the partial index on runnable jobs. Queries that should use the index
+# must repeat it verbatim (a bound-parameter IN list does not match the index predicate).
+# Enum columns store member NAMES, hence the upper-case literals.
+ACTIVE_JOBS_WHERE = text("status IN ('QUEUED', 'RUNNING')")
+
+
 class Job(Base):
     __tablename__ = "jobs"
+    # Keep in sync with alembic/versions/0003_list_indexes.py
+    __table_args__ = (
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        Index("ix_jobs_status_created_at", "status", "created_at", "id"),
+        Index("ix_jobs_owner_id_created_at", "owner_id", "created_at", "id"),
+        # Runnable jobs for the task queue and /api/jobs/active
+        Index("ix_jobs_active_created_at", "created_at", postgresql_where=ACTIVE_JOBS_WHERE, sqlite_where=ACTIVE_JOBS_WHERE),
+    )
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True, index=True)
     owner_id: Mapped[str | None] = mapped_column(
@@ -38,6 +53,9 @@ class Job(Base):
     status: Mapped[JobStatusDB] = mapped_column(Enum(JobStatusDB), default=JobStatusDB.QUEUED, nullable=False)
     progress: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     asset_id: Mapped[str | None] = mapped_column(String(50), nullable=True)
-    error: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Worker lease used by the database-backed task queue (see app/services/taskqueue.py)
+    lease_owner: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    lease_expires_at: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     owner = relationship("User", lazy="joined")
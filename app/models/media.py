@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class MediaBlob(Base):
+    """One stored object per distinct content, shared by every user of it.
+
+    The key is ``blobs/<aa>/<sha256><ext>``: the extension is part of the identity so
+    the same bytes are never served under a mismatched type.
+    """
+
+    __tablename__ = "media_blobs"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    content_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # number of MediaRef rows pointing here. 0: released, awaiting the sweep (``adopt``
+    # may still revive it); -1: claimed by the sweep, object being deleted
+    refcount: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class MediaRef(Base):
+    """A holder of a blob: a job (its source image and outputs) or an uploaded asset."""
+
+    __tablename__ = "media_refs"
+
+    owner: Mapped[str] = mapped_column(String(64), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), ForeignKey("media_blobs.key"), primary_key=True, index=True)
@@ -3,7 +3,7 @@ from __future__ import annotations
 import enum
 import uuid
 
-from sqlalchemy import Enum, ForeignKey, JSON, Numeric, String, Boolean
+from sqlalchemy import Enum, ForeignKey, Index, JSON, Numeric, String, Boolean
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -34,6 +34,8 @@ class Wallet(Base):
 
 class WalletTransaction(Base):
     __tablename__ = "wallet_transactions"
+    # Keep in sync with alembic/versions/0003_list_indexes.py
+    __table_args__ = (Index("ix_wallet_transactions_user_id_created_at", "user_id", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True, index=True)
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), index=True)
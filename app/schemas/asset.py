@@ -29,3 +29,4 @@ class AssetList(BaseModel):
     items: list[AssetOut]
     total: int
     total_all: int | None = None
+    next_cursor: str | None = None
@@ -67,6 +67,7 @@ class JobList(BaseModel):
     items: list[JobOut]
     total: int
     total_all: int | None = None
+    next_cursor: str | None = None
 
 
 class JobStatusOut(BaseModel):
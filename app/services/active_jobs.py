@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Dict, List, Set, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.services.job_state import JobState
+from app.schemas import JobOut, JobStatus
+from app.services.persistence import list_active_jobs_db
+
+_ACTIVE = {JobStatus.QUEUED, JobStatus.RUNNING}
+
+
+class ActiveJobs:
+    """Registry of queued/running jobs behind ``/api/jobs/active``.
+
+    Registered as a MemoryStore job listener, so jobs handled by this process enter on
+    creation, follow every progress tick and leave on their terminal transition. The
+    set is re-read from the database (a partial-index range scan of active rows) every
+    ``refresh_seconds``; that picks up jobs run by other processes and drops entries
+    finished behind the store's back. Reads therefore cost O(active jobs).
+
+    Entries are the store's live ``JobState`` for local jobs and ``JobOut`` rows for the
+    rest. Jobs tracked or discarded while a sync awaits the database keep that newer
+    state instead of the snapshot's.
+    """
+
+    def __init__(self, refresh_seconds: float | None = None) -> None:
+        self.refresh_seconds = float(
+            refresh_seconds if refresh_seconds is not None else get_settings().active_jobs_refresh_seconds
+        )
+        self._jobs: Dict[str, Union[JobState, JobOut]] = {}
+        self._changed: Set[str] = set()
+        self._synced_at = 0.0
+        self._lock = asyncio.Lock()
+        self.syncs = 0
+
+    def track(self, job: JobState) -> None:
+        if job.status in _ACTIVE:
+            self._jobs[job.id] = job
+        else:
+            self._jobs.pop(job.id, None)
+        self._note(job.id)
+
+    def discard(self, job_id: str) -> None:
+        self._jobs.pop(job_id, None)
+        self._note(job_id)
+
+    def _note(self, job_id: str) -> None:
+        if self._lock.locked():
+            self._changed.add(job_id)
+
+    async def sync(self, session: AsyncSession) -> None:
+        async with self._lock:
+            if time.monotonic() - self._synced_at < self.refresh_seconds:
+                return
+            self._changed.clear()
+            try:
+                rows = await list_active_jobs_db(session)
+                merged: Dict[str, Union[JobState, JobOut]] = {}
+                for job in rows:
+                    # the in-memory copy may be ahead of the database (batched progress writes)
+                    mine = self._jobs.get(job.id)
+                    merged[job.id] = mine if mine is not None and mine.updated_at >= job.updated_at else job
+                # jobs tracked or dropped during the query are newer than its snapshot
+                for job_id in self._changed:
+                    mine = self._jobs.get(job_id)
+                    if mine is not None:
+                        merged[job_id] = mine
+                    else:
+                        merged.pop(job_id, None)
+                self._jobs = merged
+            finally:
+                self._changed.clear()
+            self._synced_at = time.monotonic()
+            self.syncs += 1
+
+    async def list(self, session: AsyncSession) -> List[Union[JobState, JobOut]]:
+        """Active jobs, newest first."""
+
+        if time.monotonic() - self._synced_at >= self.refresh_seconds:
+            await self.sync(session)
+        return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def snapshot(self) -> dict:
+        return {"active": len(self._jobs), "syncs": self.syncs}
+
+
+active_jobs = ActiveJobs()
+
+
+def get_active_job_registry() -> ActiveJobs:
+    return active_jobs
@@ -6,9 +6,11 @@ import hashlib
 import hmac
 import json
 import secrets
+from functools import lru_cache
 from typing import Any, Dict, Optional, Tuple
 
 from app.config import get_settings
+from app.services.password_pool import get_password_pool
 
 
 def _b64encode(data: bytes) -> str:
@@ -37,8 +39,31 @@ def verify_password(password: str, hashed: str) -> bool:
         return False
 
 
+async def hash_password_async(password: str) -> str:
+    """``hash_password`` on the password pool; raises ``PasswordPoolBusy`` when saturated."""
+
+    return await get_password_pool().run(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """``verify_password`` on the password pool; raises ``PasswordPoolBusy`` when saturated."""
+
+    return await get_password_pool().run(verify_password, password, hashed)
+
+
+@lru_cache(maxsize=4)
+def _hmac_key(secret: str) -> "hmac.HMAC":
+    # Keyed HMAC state (ipad/opad already derived); copied per token instead of re-keyed.
+    return hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+
+def _signature(signing_input: bytes) -> bytes:
+    mac = _hmac_key(get_settings().jwt_secret).copy()
+    mac.update(signing_input)
+    return mac.digest()
+
+
 def _sign(payload: Dict[str, Any], exp_minutes: int) -> str:
-    settings = get_settings()
     header = {"alg": "HS256", "typ": "JWT"}
     now = dt.datetime.utcnow()
     payload = payload.copy()
@@ -48,18 +73,17 @@ def _sign(payload: Dict[str, Any], exp_minutes: int) -> str:
         _b64encode(json.dumps(payload, separators=(",", ":")).encode()),
     ]
     signing_input = ".".join(segments).encode()
-    signature = hmac.new(settings.jwt_secret.encode(), signing_input, hashlib.sha256).digest()
+    signature = _signature(signing_input)
     segments.append(_b64encode(signature))
     return ".".join(segments)
 
 
 def _decode(token: str) -> Dict[str, Any]:
-    settings = get_settings()
     try:
         header_b64, payload_b64, sig_b64 = token.split(".")
         signing_input = f"{header_b64}.{payload_b64}".encode()
         signature = _b64decode(sig_b64)
-        expected = hmac.new(settings.jwt_secret.encode(), signing_input, hashlib.sha256).digest()
+        expected = _signature(signing_input)
         if not hmac.compare_digest(signature, expected):
             raise ValueError("invalid signature")
         payload = json.loads(_b64decode(payload_b64))
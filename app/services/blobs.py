@@ -0,0 +1,247 @@
+"""Content-addressed media: identical bytes are stored once and reference counted.
+
+Every write is spooled (memory, then a temp file) while its SHA-256 is computed and
+lands at ``blobs/<aa>/<sha256><ext>``. If that blob already exists the caller just
+takes a reference and nothing is written to storage. References are held per
+*owner*: a job (its source image and outputs, mirroring the old per-job directory) or
+an uploaded asset. Releasing an owner drops its references and deletes blobs nobody
+else holds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import hashlib
+import tempfile
+from typing import IO, AsyncIterable, AsyncIterator, List, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.db import SessionLocal
+from app.models.media import MediaBlob, MediaRef
+from app.services.storage_driver import StorageLimitExceeded, get_storage_driver
+
+_SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+_READ_CHUNK = 1024 * 1024
+_ADOPT_ROUNDS = 20
+# a blob claimed for deletion longer ago than this belongs to a sweeper that died
+_SWEEP_GRACE = dt.timedelta(seconds=60)
+_SWEEP_WAIT_SECONDS = 0.1
+
+
+def _utcnow() -> dt.datetime:
+    return dt.datetime.now(dt.timezone.utc)
+
+
+def blob_key(sha256: str, ext: str = "") -> str:
+    return f"blobs/{sha256[:2]}/{sha256}{ext}"
+
+
+def _absorb(spool: IO[bytes], digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    spool.write(chunk)
+
+
+def _rewind(spool: IO[bytes]) -> None:
+    spool.seek(0)
+    spool.truncate()
+
+
+class BlobSpool:
+    """Bytes on their way into the store: buffered (memory, then a temp file) and hashed
+    as they arrive, with file I/O and hashing on worker threads."""
+
+    def __init__(self) -> None:
+        self.file: IO[bytes] = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MEMORY_BYTES)
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    async def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        await asyncio.to_thread(_absorb, self.file, self.digest, chunk)
+
+    async def reset(self) -> None:
+        """Discard everything written so far (e.g. a download restarting from byte 0)."""
+
+        await asyncio.to_thread(_rewind, self.file)
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    async def replay(self) -> AsyncIterator[bytes]:
+        await asyncio.to_thread(self.file.seek, 0)
+        while True:
+            chunk = await asyncio.to_thread(self.file.read, _READ_CHUNK)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self) -> None:
+        self.file.close()
+
+
+async def _spool(chunks: AsyncIterable[bytes], max_bytes: int | None) -> BlobSpool:
+    spool = BlobSpool()
+    try:
+        async for chunk in chunks:
+            if max_bytes is not None and spool.size + len(chunk) > max_bytes:
+                raise StorageLimitExceeded(f"more than {max_bytes} bytes")
+            await spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+class BlobStore:
+    def __init__(self) -> None:
+        self.stored = 0
+        self.deduplicated = 0
+        self.deleted = 0
+        self.bytes_saved = 0
+
+    async def put(
+        self,
+        owner: str,
+        chunks: AsyncIterable[bytes],
+        *,
+        ext: str = "",
+        content_type: str | None = None,
+        max_bytes: int | None = None,
+    ) -> Tuple[str, int]:
+        """Store ``chunks`` (once per distinct content) on behalf of ``owner``; returns (key, size)."""
+
+        spool = await _spool(chunks, max_bytes)
+        return await self.adopt(owner, spool, ext=ext, content_type=content_type)
+
+    async def adopt(
+        self, owner: str, spool: BlobSpool, *, ext: str = "", content_type: str | None = None
+    ) -> Tuple[str, int]:
+        """Like ``put`` for bytes already spooled by the caller; closes ``spool``.
+
+        Storage I/O never happens inside a transaction: an existing blob is bumped in one
+        short transaction, a new one is uploaded first and its rows inserted in another
+        (losing that race to a concurrent writer turns into a bump on the next round).
+        """
+
+        sha, size = spool.digest.hexdigest(), spool.size
+        key = blob_key(sha, ext)
+        try:
+            for _ in range(_ADOPT_ROUNDS):
+                async with SessionLocal() as session:
+                    if await session.get(MediaRef, (owner, key)) is not None:
+                        return key, size
+                    # a released blob (refcount 0) not yet claimed by the sweeper is revived
+                    bumped = await session.execute(
+                        update(MediaBlob)
+                        .where(MediaBlob.key == key, MediaBlob.refcount >= 0)
+                        .values(refcount=MediaBlob.refcount + 1)
+                    )
+                    if bumped.rowcount == 1:
+                        session.add(MediaRef(owner=owner, key=key))
+                        try:
+                            await session.commit()
+                        except IntegrityError:
+                            await session.rollback()  # the owner's ref raced in; found next round
+                            continue
+                        self.deduplicated += 1
+                        self.bytes_saved += size
+                        return key, size
+                    deleting_since = await session.scalar(select(MediaBlob.updated_at).where(MediaBlob.key == key))
+                    if deleting_since is not None:
+                        # the sweeper is deleting this object; take over the row if it died
+                        if deleting_since.tzinfo is None:
+                            deleting_since = deleting_since.replace(tzinfo=dt.timezone.utc)
+                        if deleting_since > _utcnow() - _SWEEP_GRACE:
+                            await session.rollback()
+                            await asyncio.sleep(_SWEEP_WAIT_SECONDS)
+                            continue
+                        await session.execute(delete(MediaBlob).where(MediaBlob.key == key, MediaBlob.refcount < 0))
+                    await session.commit()
+
+                driver = get_storage_driver()
+                await driver.write(key, spool.replay(), content_type=content_type)
+                async with SessionLocal() as session:
+                    session.add(MediaBlob(key=key, sha256=sha, size=size, content_type=content_type, refcount=1))
+                    session.add(MediaRef(owner=owner, key=key))
+                    try:
+                        await session.commit()
+                    except IntegrityError:
+                        await session.rollback()
+                        continue
+                # A blob with this key may have been created, released and swept while we
+                # uploaded, taking our object with it. Our reference now keeps the row
+                # alive, so rewriting is safe.
+                if not await driver.exists(key):
+                    await driver.write(key, spool.replay(), content_type=content_type)
+                self.stored += 1
+                return key, size
+            raise RuntimeError(f"could not store blob {key}")
+        finally:
+            spool.close()
+
+    async def holds(self, owner: str, key: str) -> bool:
+        async with SessionLocal() as session:
+            return await session.get(MediaRef, (owner, key)) is not None
+
+    async def release(self, owner: str, keys: List[str] | None = None) -> int:
+        """Drop the references held by ``owner`` (all of them, or just ``keys``); returns
+        how many blobs were deleted."""
+
+        async with SessionLocal() as session:
+            held = select(MediaRef.key).where(MediaRef.owner == owner)
+            if keys is not None:
+                held = held.where(MediaRef.key.in_(keys))
+            keys = list(await session.scalars(held))
+            if not keys:
+                return 0
+            await session.execute(delete(MediaRef).where(MediaRef.owner == owner, MediaRef.key.in_(keys)))
+            await session.execute(
+                update(MediaBlob).where(MediaBlob.key.in_(keys)).values(refcount=MediaBlob.refcount - 1)
+            )
+            await session.commit()
+        return await self.sweep(keys)
+
+    async def sweep(self, keys: List[str]) -> int:
+        """Delete the objects of released blobs (refcount 0) among ``keys``.
+
+        Each blob is first claimed (refcount -1) in its own short transaction, so ``adopt``
+        can no longer revive it; the object is deleted with no transaction open and the
+        row removed afterwards. Returns how many blobs were deleted.
+        """
+
+        driver = get_storage_driver()
+        deleted = 0
+        for key in keys:
+            async with SessionLocal() as session:
+                claimed = await session.execute(
+                    update(MediaBlob)
+                    .where(MediaBlob.key == key, MediaBlob.refcount == 0)
+                    .values(refcount=-1, updated_at=_utcnow())
+                )
+                await session.commit()
+            if claimed.rowcount != 1:
+                continue
+            await driver.delete(key)
+            async with SessionLocal() as session:
+                await session.execute(delete(MediaBlob).where(MediaBlob.key == key, MediaBlob.refcount < 0))
+                await session.commit()
+            deleted += 1
+        self.deleted += deleted
+        return deleted
+
+    def snapshot(self) -> dict:
+        return {
+            "stored": self.stored,
+            "deduplicated": self.deduplicated,
+            "deleted": self.deleted,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+blob_store = BlobStore()
+
+
+def get_blob_store() -> BlobStore:
+    return blob_store
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Tuple
+
+from app.config import get_settings
+
+
+class CountCache:
+    """Short-lived cache of list totals keyed by table and filter set.
+
+    ``count(*)`` over a filtered listing costs a scan of the matching index range, so
+    paging through a library would repeat it for every page. Totals are reused for
+    ``ttl`` seconds and dropped early through ``invalidate`` when rows are added or
+    removed, or change a column the totals filter on (visibility, owner); in between
+    they are an estimate, which is all a pager needs.
+    """
+
+    def __init__(self, ttl: float | None = None, max_entries: int | None = None) -> None:
+        settings = get_settings()
+        self.ttl = float(ttl if ttl is not None else settings.list_count_ttl)
+        self.max_entries = max(1, int(max_entries or settings.list_count_max_entries))
+        self._entries: "OrderedDict[Tuple, Tuple[int, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(self, key: Tuple, loader: Callable[[], Awaitable[int]]) -> int:
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        value = int(await loader())
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, table: str) -> None:
+        """Forget every cached total of ``table`` (first element of the key)."""
+
+        for key in [k for k in self._entries if k[0] == table]:
+            self._entries.pop(key, None)
+
+    def snapshot(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+count_cache = CountCache()
+
+
+def get_count_cache() -> CountCache:
+    return count_cache
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, Iterable, Optional, Set
+
+from app.schemas import JobOut, JobStatus, JobStatusOut
+from app.services.job_state import JobState
+
+TERMINAL_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELED}
+
+
+def job_event(job: JobOut | JobState) -> JobStatusOut:
+    return JobStatusOut(
+        id=job.id,
+        status=job.status,
+        progress=int(job.progress or 0),
+        asset_id=job.asset_id,
+        error=job.error,
+        updated_at=job.updated_at,
+    )
+
+
+class Subscription:
+    """One SSE client's view of a set of jobs.
+
+    Events are coalesced per job: a slow client only ever sees the latest state of each
+    job, so a burst of progress ticks cannot grow an unbounded backlog.
+    """
+
+    def __init__(self, job_ids: Iterable[str]) -> None:
+        self.job_ids: Set[str] = set(job_ids)
+        self.pending: Dict[str, JobStatusOut] = {}
+        self._wakeup = asyncio.Event()
+
+    def push(self, event: JobStatusOut) -> None:
+        self.pending[event.id] = event
+        self._wakeup.set()
+
+    async def next_batch(self, timeout: float) -> list[JobStatusOut]:
+        """Wait up to ``timeout`` seconds for events and return them (empty on timeout)."""
+
+        if not self.pending:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._wakeup.clear()
+        batch, self.pending = list(self.pending.values()), {}
+        return batch
+
+
+class EventBroker:
+    """Fans job state changes out to every subscription watching that job.
+
+    Registered as a MemoryStore job listener at startup, so every transition and progress
+    update made by the generation pipeline is published as it happens.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, job_ids: Iterable[str]) -> Subscription:
+        sub = Subscription(job_ids)
+        for job_id in sub.job_ids:
+            self._subscribers.setdefault(job_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        for job_id in sub.job_ids:
+            subs = self._subscribers.get(job_id)
+            if subs is None:
+                continue
+            subs.discard(sub)
+            if not subs:
+                self._subscribers.pop(job_id, None)
+
+    def publish(self, job: JobState) -> None:
+        subs = self._subscribers.get(job.id)
+        if not subs:
+            return
+        event = job_event(job)
+        for sub in list(subs):
+            sub.push(event)
+
+    def snapshot(self) -> dict:
+        return {
+            "jobs": len(self._subscribers),
+            "subscriptions": len({s for subs in self._subscribers.values() for s in subs}),
+        }
+
+
+broker = EventBroker()
+
+
+def get_event_broker() -> EventBroker:
+    return broker
+
+
+def format_sse(event: Optional[JobStatusOut] = None, *, comment: str | None = None) -> str:
+    if event is None:
+        return f": {comment or 'ping'}\n\n"
+    return f"event: status\nid: {event.id}\ndata: {event.json()}\n\n"
@@ -7,6 +7,7 @@ from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.db import SessionLocal
 from app.schemas import JobKind, JobOut, JobStatus
  
@@ -15,10 +16,28 @@ from app.services.persistence import (
     update_job_fields,
     get_provider_by_name,
 )
-from app.services.storage import placeholder_output, save_data_url_image
+from app.services.mirror import get_mirror
+from app.services.storage import media_source, placeholder_output, save_data_url_image
+from app.services.thumbnails import get_thumbnailer
 from app.services.store import MemoryStore
 from app.interface.registry import OpenAIImageAdapter, resolve_adapter
 from app.services.metrics import metrics
+from app.services.progress import progress_writer
+
+
+# Synthetic progress schedule. Only used as a fallback: while a provider is silent, and
+# as the whole "work" of the provider-less demo path.
+_SYNTHETIC_STEPS = (5, 15, 30, 50, 70, 85, 95)
+
+_cancel_events: dict[str, asyncio.Event] = {}
+
+
+def request_cancel(job_id: str) -> None:
+    """Wake a running simulate_generation so it stops right away instead of at its next tick."""
+
+    event = _cancel_events.get(job_id)
+    if event is not None:
+        event.set()
 
 
 async def simulate_generation(
@@ -26,7 +45,9 @@ async def simulate_generation(
 ) -> None:
     """Generation orchestrator for demo environment.
 
-    - Maintains the queued -> running -> completed lifecycle with progress ticks.
+    - Maintains the queued -> running -> completed lifecycle. Progress follows provider
+      events (on_progress callbacks, task completion, cancellation); synthetic ticks
+      are only emitted while the provider is silent.
     - When provider capabilities include image generation/editing, delegate to
       the configured adapter (OpenAI-style or other ModelScope providers) while
       streaming local progress updates.
@@ -42,22 +63,22 @@ async def simulate_generation(
     metrics.record_transition(JobStatus.QUEUED, JobStatus.RUNNING)
     metrics.mark_started(job.id)
 
-    # If this is a real provider-backed job, kick off the provider call in a
-    # background thread while we stream progress.
+    # If this is a real provider-backed job, kick off the provider call as a task on the
+    # shared async HTTP client while we stream progress.
     provider_task: asyncio.Task | None = None
     sora_task: asyncio.Task | None = None
     provider_progress_val: float = 1.0
     loop = asyncio.get_running_loop()
+    last_provider_event = loop.time()
     async def _apply_progress(val: float):
         v = float(max(1.0, min(95.0, val)))
-        nonlocal job
-        job = store.update_job(job.id, progress=v)
-        async with SessionLocal() as session:
-            await update_job_fields(session, job.id, progress=v)
+        store.set_progress(job.id, v)
+        progress_writer.record(job.id, v)
     def _on_provider_progress(val: float):
-        nonlocal provider_progress_val
+        nonlocal provider_progress_val, last_provider_event
         try:
             provider_progress_val = float(val)
+            last_provider_event = loop.time()
             asyncio.run_coroutine_threadsafe(_apply_progress(val), loop)
         except Exception:
             pass
@@ -89,8 +110,7 @@ async def simulate_generation(
 
         if use_edit and hasattr(adapter, "edit_image"):
             provider_task = asyncio.create_task(
-                asyncio.to_thread(
-                    adapter.edit_image,
+                adapter.edit_image_async(
                     src_urls if isinstance(src_urls, list) and src_urls else (src_url or ""),
                     job.prompt,
                     model=model_to_use,
@@ -102,8 +122,7 @@ async def simulate_generation(
             )
         elif supports_image_url:
             provider_task = asyncio.create_task(
-                asyncio.to_thread(
-                    adapter.generate_image,
+                adapter.generate_image_async(
                     job.prompt,
                     model=model_to_use,
                     api_key=provider.api_token,
@@ -115,8 +134,7 @@ async def simulate_generation(
             )
         else:
             provider_task = asyncio.create_task(
-                asyncio.to_thread(
-                    adapter.generate_image,
+                adapter.generate_image_async(
                     job.prompt,
                     model=model_to_use,
                     api_key=provider.api_token,
@@ -154,12 +172,14 @@ async def simulate_generation(
             base_eff = provider.base_url
             if not base_eff or ("sora2.example" in str(base_eff).lower() or str(base_eff).lower().endswith(".example")):
                 base_eff = None
-            sora_task = asyncio.create_task(
-                asyncio.to_thread(
-                    adapter.create_video,
+
+            async def _create_video() -> dict:
+                # the adapter only sees URLs it can send upstream; /media sources are resolved here
+                image = await media_source(src_url_boot) if src_url_boot else None
+                return await adapter.create_video_async(
                     job.prompt,
                     model=model_to_send,
-                    image=(src_url_boot or None),
+                    image=image,
                     api_key=provider.api_token,
                     base_url=base_eff,
                     debug=getattr(store, "debug_enabled", False),
@@ -167,7 +187,8 @@ async def simulate_generation(
                     resolution=resolution_boot,
                     on_progress=_on_provider_progress,
                 )
-            )
+
+            sora_task = asyncio.create_task(_create_video())
             provider_response_boot = {
                 "provider": "sora2",
                 "model": model_to_send,
@@ -187,25 +208,55 @@ async def simulate_generation(
         except Exception:
             pass
 
-    # Progress should feel realistic: rise gradually to 95%, then finish at 100% only when
-    # the provider task (if any) has completed and the asset has been written.
-    steps = [5, 15, 30, 50, 70, 85, 95]
+    # Progress is event-driven: wake on provider completion, provider progress or cancel,
+    # and only fall back to a synthetic tick when the provider has been silent for a
+    # whole tick. Completion at 100% still waits for the provider task and the asset.
+    tick = _progress_tick_seconds()
+    synthetic = iter(_SYNTHETIC_STEPS)
+    cancel_event = _cancel_events.setdefault(job.id, asyncio.Event())
+    cancel_waiter = asyncio.create_task(cancel_event.wait())
+    pending = {t for t in (provider_task, sora_task) if t is not None}
     try:
-        for progress in steps:
-            await asyncio.sleep(1.2)
-            # respect external cancel
-            current = store.get_job(job.id)
-            if current and current.status == JobStatus.CANCELED:
+        while True:
+            canceled = cancel_event.is_set()
+            current = store.get_state(job.id)
+            if not canceled:
+                canceled = bool(current and current.status == JobStatus.CANCELED)
+            if canceled:
+                for t in pending:
+                    t.cancel()
+                progress_writer.discard(job.id)
                 metrics.record_transition(JobStatus.RUNNING, JobStatus.CANCELED)
                 metrics.mark_finished(job.id)
                 return
-            tgt = float(max(progress, provider_progress_val, float(job.progress or 0)))
-            job = store.update_job(job.id, progress=tgt)
-            async with SessionLocal() as session:
-                await update_job_fields(session, job.id, progress=tgt)
-        
-
-        # If we dispatched a provider task, wait for completion and capture provider response.
+            if pending:
+                done, _ = await asyncio.wait(pending | {cancel_waiter}, timeout=tick, return_when=asyncio.FIRST_COMPLETED)
+                pending -= done
+                if cancel_waiter in done:
+                    continue
+                if not pending:
+                    break
+                if done or loop.time() - last_provider_event < tick:
+                    continue
+                progress = next(synthetic, None)
+                if progress is None:
+                    continue
+            else:
+                # provider-less demo job: the synthetic schedule is the work itself
+                progress = next(synthetic, None)
+                if progress is None:
+                    break
+                done, _ = await asyncio.wait({cancel_waiter}, timeout=tick)
+                if done:
+                    continue
+            tgt = float(max(progress, provider_progress_val, float((current or job).progress or 0)))
+            store.set_progress(job.id, tgt)
+            progress_writer.record(job.id, tgt)
+
+        # Ticks are over; drop any buffered value so it cannot race the terminal write.
+        progress_writer.discard(job.id)
+
+        # If we dispatched a provider task, it has finished; capture its response.
         image_url: str | None = None
         provider_response: dict | None = None
         if provider_task is not None:
@@ -293,7 +344,7 @@ async def simulate_generation(
         normalized_url = _normalize_output_url(image_url)
         if normalized_url and normalized_url.startswith("data:image/"):
             try:
-                normalized_url = save_data_url_image(job.id, normalized_url)
+                normalized_url = await save_data_url_image(job.id, normalized_url)
             except Exception:
                 pass
 
@@ -312,9 +363,10 @@ async def simulate_generation(
             metrics.mark_finished(job.id)
             store.update_job(job.id, status=JobStatus.FAILED, error=str(err_payload))
             return
-        output_url = normalized_url or placeholder_output(job.kind.value, job.id)[1]
+        output_url = normalized_url or (await placeholder_output(job.kind.value, job.id))[1]
 
         asset_meta = {
+            "job_id": job.id,
             "model": job.model,
             "orientation": job.params.orientation.value if job.params.orientation else None,
             "size": resolution,
@@ -362,13 +414,26 @@ async def simulate_generation(
             progress=100,
             asset_id=asset.id,
         )
+        get_thumbnailer().submit(asset)
+        get_mirror().submit(asset)
         
     except Exception as exc:  # pragma: no cover - guard rail for demo
+        progress_writer.discard(job.id)
         job = store.update_job(job.id, status=JobStatus.FAILED, error=str(exc))
         async with SessionLocal() as session:
             await update_job_fields(session, job.id, status=JobStatus.FAILED, error=str(exc))
         metrics.record_transition(JobStatus.RUNNING, JobStatus.FAILED)
         metrics.mark_finished(job.id)
+    finally:
+        cancel_waiter.cancel()
+        _cancel_events.pop(job.id, None)
+
+
+def _progress_tick_seconds() -> float:
+    try:
+        return max(0.05, float(get_settings().progress_tick_seconds))
+    except Exception:
+        return 1.2
 
 
 _DATA_URL_RE = re.compile(r"^data:image/[a-zA-Z0-9.+-]+;base64,[A-Za-z0-9+/=\r\n]+$")
@@ -0,0 +1,63 @@
+"""Time-ordered identifiers for jobs, assets and wallet transactions.
+
+IDs are a type prefix plus a 26-character ULID (48-bit millisecond timestamp followed
+by 80 random bits, Crockford base32 in lowercase), e.g. ``job_01hx3k6w0d8v5qz7m2c4t9r1ye``.
+They sort by creation time, need no database round-trip, and are safe to generate
+concurrently across processes. Within one process, IDs created in the same
+millisecond increment the random part so they still sort in creation order.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+_ALPHABET = "0123456789abcdefghjkmnpqrstvwxyz"
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+
+_lock = threading.Lock()
+_last_ms = -1
+_last_rand = 0
+
+
+def _encode(value: int, length: int) -> str:
+    out = []
+    for _ in range(length):
+        out.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(out))
+
+
+def ulid() -> str:
+    global _last_ms, _last_rand
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms <= _last_ms:
+            # same (or backwards) clock tick: stay monotonic by incrementing the random part
+            now_ms = _last_ms
+            rand = _last_rand + 1
+            if rand > _RANDOM_MAX:
+                now_ms += 1
+                rand = int.from_bytes(os.urandom(10), "big")
+        else:
+            rand = int.from_bytes(os.urandom(10), "big")
+        _last_ms, _last_rand = now_ms, rand
+    return _encode(now_ms, 10) + _encode(rand, 16)
+
+
+def new_id(prefix: str) -> str:
+    return f"{prefix}_{ulid()}"
+
+
+def new_job_id() -> str:
+    return new_id("job")
+
+
+def new_asset_id() -> str:
+    return new_id("asset")
+
+
+def new_transaction_id() -> str:
+    return new_id("tx")
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import datetime as dt
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.schemas import JobKind, JobOut, JobParams, JobStatus
+
+# Fields that change while a job runs; everything else lives on the (immutable) base JobOut.
+HOT_FIELDS = frozenset({"status", "progress", "asset_id", "error", "updated_at"})
+
+
+@dataclass(slots=True, eq=False)
+class JobState:
+    """Mutable runtime record of a job held by MemoryStore.
+
+    Progress ticks and status transitions assign the hot fields in place instead of
+    copying the whole ``JobOut`` (params, extras and provider payloads included). The
+    cold fields are read through from ``base``, which is only replaced when one of them
+    changes. ``to_out`` materializes a ``JobOut`` for the API and caches it until the
+    next change, so a job that is polled but not changing is built once.
+    """
+
+    base: JobOut
+    status: JobStatus
+    progress: float
+    asset_id: Optional[str]
+    error: Optional[str]
+    updated_at: dt.datetime
+    _out: Optional[JobOut] = None
+
+    @classmethod
+    def from_out(cls, job: JobOut) -> "JobState":
+        return cls(
+            base=job,
+            status=job.status,
+            progress=job.progress,
+            asset_id=job.asset_id,
+            error=job.error,
+            updated_at=job.updated_at,
+            _out=job,
+        )
+
+    @property
+    def id(self) -> str:
+        return self.base.id
+
+    @property
+    def kind(self) -> JobKind:
+        return self.base.kind
+
+    @property
+    def provider(self) -> Optional[str]:
+        return self.base.provider
+
+    @property
+    def model(self) -> Optional[str]:
+        return self.base.model
+
+    @property
+    def params(self) -> JobParams:
+        return self.base.params
+
+    @property
+    def is_public(self) -> bool:
+        return self.base.is_public
+
+    @property
+    def owner_id(self) -> Optional[str]:
+        return self.base.owner_id
+
+    @property
+    def created_at(self) -> dt.datetime:
+        return self.base.created_at
+
+    def set_progress(self, progress: float, now: dt.datetime) -> None:
+        self.progress = progress
+        self.updated_at = now
+        self._out = None
+
+    def apply(self, fields: dict[str, Any], now: dt.datetime) -> None:
+        cold = {}
+        for key, value in fields.items():
+            if key in HOT_FIELDS:
+                setattr(self, key, value)
+            else:
+                cold[key] = value
+        if cold:
+            self.base = self.base.copy(update=cold)
+        self.updated_at = now
+        self._out = None
+
+    def to_out(self) -> JobOut:
+        if self._out is None:
+            self._out = self.base.copy(
+                update={
+                    "status": self.status,
+                    "progress": self.progress,
+                    "asset_id": self.asset_id,
+                    "error": self.error,
+                    "updated_at": self.updated_at,
+                }
+            )
+        return self._out
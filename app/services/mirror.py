@@ -0,0 +1,265 @@
+"""Copy remote provider outputs into our storage in the background.
+
+Provider CDN links expire and are slow to hot-link, but a job must not wait for a
+copy: it completes with the remote URL and its asset is queued here. A bounded pool of
+workers streams each file into content-addressed storage, swaps the asset's ``url``
+(and a ``preview_url`` still pointing at the remote file) to ``/media/...`` and hands
+the asset to the thumbnailer. A transfer that drops part-way resumes from the bytes
+already received with a ``Range`` request guarded by ``If-Range``; transient failures
+are retried with exponential backoff. Permanent errors (an expired link, 404) give up
+and leave the remote URL in place.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import mimetypes
+import re
+from pathlib import PurePosixPath
+from typing import List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import get_settings
+from app.interface.http import get_async_client
+from app.schemas import AssetOut, AssetType
+from app.services.blobs import BlobSpool, blob_key, get_blob_store
+from app.services.storage import media_owner, media_url
+
+_RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+_GENERIC_TYPES = {"", "application/octet-stream", "binary/octet-stream"}
+_CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-\d+/(\d+|\*)$")
+_MAX_BACKOFF = 60.0
+
+
+class MirrorError(RuntimeError):
+    """The remote file cannot be copied (not retried)."""
+
+
+class _Retry(Exception):
+    pass
+
+
+def _is_remote(url: str | None) -> bool:
+    return bool(url) and (url.startswith("https://") or url.startswith("http://"))
+
+
+def _content_range(value: str | None) -> Tuple[Optional[int], Optional[int]]:
+    match = _CONTENT_RANGE_RE.match((value or "").strip())
+    if not match:
+        return None, None
+    total = match.group(2)
+    return int(match.group(1)), (int(total) if total != "*" else None)
+
+
+def _extension(content_type: str | None, url: str, asset_type: AssetType) -> str:
+    ctype = (content_type or "").split(";", 1)[0].strip().lower()
+    if ctype not in _GENERIC_TYPES:
+        ext = mimetypes.guess_extension(ctype)
+        if ext:
+            return ext
+    suffix = PurePosixPath(urlsplit(url).path).suffix.lower()
+    if suffix and mimetypes.guess_type("file" + suffix)[0]:
+        return suffix
+    return ".png" if asset_type == AssetType.IMAGE else ".mp4"
+
+
+class Mirror:
+    def __init__(self, concurrency: int | None = None, queue_size: int | None = None) -> None:
+        settings = get_settings()
+        self.enabled = bool(settings.mirror_enabled)
+        self.concurrency = max(1, int(concurrency or settings.mirror_concurrency or 1))
+        self.attempts = max(1, int(settings.mirror_attempts))
+        self.backoff = max(0.0, float(settings.mirror_backoff_seconds))
+        self.max_bytes = int(settings.mirror_max_bytes)
+        self.chunk_bytes = int(settings.storage_chunk_bytes)
+        self.queue: asyncio.Queue[Tuple[str, AssetType, str, str]] = asyncio.Queue(
+            maxsize=max(1, int(queue_size or settings.mirror_queue_size))
+        )
+        self._tasks: List[asyncio.Task] = []
+        self._pending: Set[str] = set()
+        self.mirrored = 0
+        self.failed = 0
+        self.retries = 0
+        self.resumed = 0
+        self.dropped = 0
+        self.bytes_total = 0
+
+    async def start(self) -> None:
+        self._tasks = [t for t in self._tasks if not t.done()]
+        while len(self._tasks) < self.concurrency:
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._tasks = []
+
+    def submit(self, asset: AssetOut) -> bool:
+        """Queue a copy of ``asset``'s remote file. Never blocks: when the queue is full
+        the asset keeps its remote URL."""
+
+        if not self.enabled or not _is_remote(asset.url) or asset.id in self._pending:
+            return False
+        try:
+            self.queue.put_nowait((asset.id, asset.type, asset.url, media_owner(asset)))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self._pending.add(asset.id)
+        if not any(not t.done() for t in self._tasks):
+            # Ensure workers run even if startup event was skipped
+            try:
+                asyncio.get_running_loop().create_task(self.start())
+            except Exception:
+                pass
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "concurrency": self.concurrency,
+            "queued": self.queue.qsize(),
+            "pending": len(self._pending),
+            "mirrored": self.mirrored,
+            "failed": self.failed,
+            "retries": self.retries,
+            "resumed": self.resumed,
+            "dropped": self.dropped,
+            "bytes_total": self.bytes_total,
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            asset_id, asset_type, url, owner = await self.queue.get()
+            try:
+                await self.mirror(asset_id, asset_type, url, owner)
+            except Exception:
+                self.failed += 1
+            finally:
+                self._pending.discard(asset_id)
+                self.queue.task_done()
+
+    async def mirror(self, asset_id: str, asset_type: AssetType, url: str, owner: str) -> Optional[str]:
+        """Copy one remote file and swap it in; returns the local URL (None when the asset
+        was deleted or already swapped meanwhile)."""
+
+        from app.db import SessionLocal
+        from app.services.persistence import get_asset_db, update_asset_fields
+        from app.services.status_cache import get_status_cache
+        from app.services.store import get_store
+        from app.services.thumbnails import get_thumbnailer
+
+        spool = BlobSpool()
+        try:
+            content_type = await self._download(url, spool)
+        except BaseException:
+            spool.close()
+            raise
+        blobs = get_blob_store()
+        async with SessionLocal() as session:
+            current = await get_asset_db(session, asset_id)
+        if current is None or current.url != url:
+            spool.close()
+            return None
+        ext = _extension(content_type, url, asset_type)
+        held = await blobs.holds(owner, blob_key(spool.digest.hexdigest(), ext))
+        key, size = await blobs.adopt(owner, spool, ext=ext, content_type=content_type)
+        local_url = media_url(key)
+        async with SessionLocal() as session:
+            current = await get_asset_db(session, asset_id)
+            if current is None:
+                # deleted while copying: its owner's media was already released, drop the copy too
+                await blobs.release(owner)
+                return None
+            if current.url != url:
+                # swapped by another path meanwhile: give back the reference we just took
+                if not held:
+                    await blobs.release(owner, [key])
+                return None
+            fields = {"url": local_url, "meta": {**(current.meta or {}), "remote_url": url}}
+            if current.preview_url in (url, f"{url}#preview"):
+                fields["preview_url"] = local_url
+            updated = await update_asset_fields(session, asset_id, **fields)
+        get_store().update_asset(asset_id, **fields)
+        job_id = (updated.meta or {}).get("job_id") if updated else None
+        if job_id:
+            get_status_cache().invalidate(job_id)
+        self.mirrored += 1
+        self.bytes_total += size
+        if updated is not None:
+            get_thumbnailer().submit(updated)
+        return local_url
+
+    async def _download(self, url: str, spool: BlobSpool) -> Optional[str]:
+        """Stream ``url`` into ``spool``, resuming after dropped transfers; returns the
+        response content type."""
+
+        client = get_async_client("mirror")
+        content_type: Optional[str] = None
+        validator: Optional[str] = None
+        failures = 0
+        while True:
+            # identity encoding keeps Range offsets aligned with the bytes we store
+            headers = {"Accept-Encoding": "identity"}
+            if spool.size:
+                headers["Range"] = f"bytes={spool.size}-"
+                if validator:
+                    headers["If-Range"] = validator
+            try:
+                async with client.stream("GET", url, headers=headers) as resp:
+                    start, total = _content_range(resp.headers.get("Content-Range"))
+                    if resp.status_code == 206 and spool.size and start == spool.size:
+                        self.resumed += 1
+                    elif resp.status_code == 200:
+                        # fresh transfer, or the server ignored Range / the file changed
+                        await spool.reset()
+                        content_type = resp.headers.get("Content-Type")
+                        etag = resp.headers.get("ETag")
+                        validator = etag if etag and not etag.startswith("W/") else resp.headers.get("Last-Modified")
+                        length = resp.headers.get("Content-Length")
+                        total = int(length) if length and length.isdigit() else None
+                    elif resp.status_code in (206, 416):
+                        await spool.reset()
+                        raise _Retry(f"unexpected range response {resp.status_code}")
+                    elif resp.status_code in _RETRY_STATUS:
+                        raise _Retry(f"HTTP {resp.status_code}")
+                    else:
+                        raise MirrorError(f"GET {url} failed: HTTP {resp.status_code}")
+                    if total is not None and total > self.max_bytes:
+                        raise MirrorError(f"{url} is larger than {self.max_bytes} bytes")
+                    buf = bytearray()
+                    try:
+                        async for chunk in resp.aiter_bytes():
+                            if spool.size + len(buf) + len(chunk) > self.max_bytes:
+                                raise MirrorError(f"{url} is larger than {self.max_bytes} bytes")
+                            buf += chunk
+                            if len(buf) >= self.chunk_bytes:
+                                await spool.write(bytes(buf))
+                                buf.clear()
+                    finally:
+                        # keep everything that arrived so a retry resumes right after it
+                        if buf:
+                            await spool.write(bytes(buf))
+                    if total is not None and spool.size != total:
+                        raise _Retry(f"short transfer: {spool.size} of {total} bytes")
+                    return content_type
+            except (httpx.TransportError, _Retry) as exc:
+                failures += 1
+                if failures >= self.attempts:
+                    raise MirrorError(f"GET {url} failed after {failures} attempts: {exc}") from exc
+                self.retries += 1
+                await asyncio.sleep(min(_MAX_BACKOFF, self.backoff * 2 ** (failures - 1)))
+
+
+mirror = Mirror()
+
+
+def get_mirror() -> Mirror:
+    return mirror
@@ -0,0 +1,73 @@
+"""Keyset (cursor) pagination over ``(created_at, id)``.
+
+List endpoints return newest rows first. Instead of ``OFFSET`` (whose cost grows with
+page depth) the client passes back the opaque ``next_cursor`` of the previous page and
+the query continues strictly after that row, so every page costs one index range scan.
+Ties on ``created_at`` are broken by ``id``.
+"""
+
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import json
+from typing import Any, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, and_, or_
+
+Keyset = Tuple[dt.datetime, str]
+
+
+def encode_cursor(created_at: dt.datetime, row_id: str) -> str:
+    if created_at.tzinfo is None:
+        # *Out models carry naive UTC timestamps
+        created_at = created_at.replace(tzinfo=dt.timezone.utc)
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    """Parse a cursor produced by ``encode_cursor``; raises ``ValueError`` when malformed."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        ts = dt.datetime.fromisoformat(created_at)
+    except Exception as exc:
+        raise ValueError("invalid cursor") from exc
+    if not isinstance(row_id, str):
+        raise ValueError("invalid cursor")
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=dt.timezone.utc)
+    return ts, row_id
+
+
+def paginate(stmt: Select, model: Any, *, after: Optional[Keyset] = None, offset: int = 0, limit: int | None = None) -> Select:
+    """Order ``stmt`` newest first and restrict it to the page after ``after``.
+
+    ``offset`` is still honoured for callers that have not moved to cursors yet.
+    """
+
+    if after is not None:
+        created_at, row_id = after
+        stmt = stmt.where(
+            or_(
+                model.created_at < created_at,
+                and_(model.created_at == created_at, model.id < row_id),
+            )
+        )
+    stmt = stmt.order_by(model.created_at.desc(), model.id.desc())
+    if offset:
+        stmt = stmt.offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def next_cursor(items: Sequence[Any], limit: int | None) -> Optional[str]:
+    """Cursor for the page after ``items`` (as fetched, before any filtering); None on the last page."""
+
+    if not limit or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.config import get_settings
+
+T = TypeVar("T")
+
+
+class PasswordPoolBusy(RuntimeError):
+    """Raised when the password pool already has its maximum amount of work queued."""
+
+
+class PasswordPool:
+    """Bounded worker pool for password hashing/verification.
+
+    PBKDF2 with 100k iterations takes tens of milliseconds of CPU; run inline it stalls
+    the event loop (and every in-flight status poll) for that long. ``hashlib`` releases
+    the GIL while hashing, so a small dedicated thread pool runs it in parallel without
+    the start-up and pickling cost of processes, and keeps it off the loop's default
+    executor used by other blocking calls.
+
+    At most ``workers + max_pending`` calls are admitted at once; beyond that ``run``
+    raises ``PasswordPoolBusy`` straight away (served as 503) instead of letting a login
+    burst build an unbounded queue. A call counts against the limit until its worker
+    finishes, even if the awaiting request was cancelled meanwhile.
+    """
+
+    def __init__(self, workers: int | None = None, max_pending: int | None = None) -> None:
+        settings = get_settings()
+        workers = workers if workers is not None else settings.password_hash_workers
+        self.workers = max(1, int(workers or min(4, os.cpu_count() or 1)))
+        self.max_pending = max(0, int(max_pending if max_pending is not None else settings.password_hash_max_pending))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password")
+        return self._executor
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._inflight -= 1
+            self.completed += 1
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._inflight >= self.workers + self.max_pending:
+                self.rejected += 1
+                raise PasswordPoolBusy("password hashing capacity exhausted")
+            self._inflight += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._inflight -= 1
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "inflight": self._inflight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_pool = PasswordPool()
+
+
+def get_password_pool() -> PasswordPool:
+    return password_pool
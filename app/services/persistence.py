@@ -3,16 +3,22 @@ from __future__ import annotations
 import datetime as dt
 from typing import List, Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import case, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
 
 from app.models.asset import Asset, AssetTypeDB
-from app.models.job import Job, JobKindDB, JobStatusDB
+from app.models.job import ACTIVE_JOBS_WHERE, Job, JobKindDB, JobStatusDB
 from app.models.provider import Provider
 from app.models.user import User
 from app.schemas import AssetOut, AssetType, JobOut, JobStatus, ProviderInfo, UserOut, Capability
 from app.models.wallet import Wallet, WalletTransaction, WalletTxStatusDB, WalletTxTypeDB
 from app.models.preferences import UserPreferences
+from app.services.ids import new_transaction_id
+from app.services.count_cache import get_count_cache
+from app.services.principal_cache import get_principal_cache
+from app.services.pagination import Keyset, paginate
+from app.services.visibility import Visibility
 from app.schemas import WalletOut, WalletTxOut, TransactionType, TransactionStatus, PreferencesOut
 
 
@@ -59,17 +65,6 @@ def user_model_to_out(model: User) -> UserOut:
     )
 
 
-async def next_job_id(session: AsyncSession) -> str:
-    count = await session.scalar(select(func.count()).select_from(Job))
-    base = 231
-    return f"job_{base + int(count or 0) + 1}"
-
-
-async def next_asset_id(session: AsyncSession) -> str:
-    count = await session.scalar(select(func.count()).select_from(Asset))
-    return f"asset_{int(count or 0) + 1}"
-
-
 async def persist_job(session: AsyncSession, job: JobOut) -> None:
     existing = await session.get(Job, job.id)
     if existing:
@@ -90,6 +85,12 @@ async def persist_job(session: AsyncSession, job: JobOut) -> None:
     )
     session.add(db_obj)
     await session.commit()
+    get_count_cache().invalidate("jobs")
+
+
+# Columns the cached list totals filter on; changing one moves a row between totals.
+_JOB_COUNT_FIELDS = frozenset({"is_public", "owner_id"})
+_ASSET_COUNT_FIELDS = frozenset({"is_public", "owner_id", "type", "provider"})
 
 
 async def update_job_fields(session: AsyncSession, job_id: str, **fields) -> None:
@@ -117,14 +118,128 @@ async def update_job_fields(session: AsyncSession, job_id: str, **fields) -> Non
         setattr(job, key, value)
     job.updated_at = dt.datetime.utcnow()
     await session.commit()
+    if _JOB_COUNT_FIELDS.intersection(fields):
+        get_count_cache().invalidate("jobs")
 
 
-async def list_jobs_db(session: AsyncSession, *, offset: int = 0, limit: int | None = None) -> List[JobOut]:
-    stmt = select(Job).order_by(Job.created_at.desc())
-    if offset:
-        stmt = stmt.offset(offset)
-    if limit is not None:
-        stmt = stmt.limit(limit)
+async def bulk_update_job_progress_db(session: AsyncSession, progress: dict[str, float]) -> int:
+    """Write the latest progress of many jobs in a single ``UPDATE ... CASE``.
+
+    Only queued/running rows are touched, so a buffered value can never overwrite the
+    progress of a job that has already reached a terminal state.
+    """
+
+    if not progress:
+        return 0
+    result = await session.execute(
+        update(Job)
+        .where(Job.id.in_(list(progress)), Job.status.in_([JobStatusDB.QUEUED, JobStatusDB.RUNNING]))
+        .values(progress=case(progress, value=Job.id, else_=Job.progress), updated_at=dt.datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return int(result.rowcount or 0)
+
+
+# Task queue leases
+async def claim_jobs_db(session: AsyncSession, *, owner: str, limit: int, lease_seconds: float) -> list[str]:
+    """Claim up to ``limit`` runnable jobs for ``owner`` and return their ids.
+
+    Runnable means queued/running with no live lease, so jobs whose worker died are
+    picked up again once the lease expires. ``FOR UPDATE SKIP LOCKED`` lets several
+    processes claim concurrently without blocking on, or double-claiming, the same rows
+    (SQLite ignores the clause; it only ever serves a single node).
+    """
+
+    if limit <= 0:
+        return []
+    now = dt.datetime.now(dt.timezone.utc)
+    stmt = (
+        select(Job.id)
+        .where(ACTIVE_JOBS_WHERE)
+        .where(or_(Job.lease_expires_at.is_(None), Job.lease_expires_at < now))
+        .order_by(Job.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    ids = list(await session.scalars(stmt))
+    if ids:
+        await session.execute(
+            update(Job)
+            .where(Job.id.in_(ids))
+            # keep updated_at untouched: leases are bookkeeping, not job changes
+            .values(lease_owner=owner, lease_expires_at=now + dt.timedelta(seconds=lease_seconds), updated_at=Job.updated_at)
+        )
+    await session.commit()
+    return ids
+
+
+async def renew_job_leases_db(
+    session: AsyncSession, *, owner: str, job_ids: list[str], lease_seconds: float
+) -> dict[str, JobStatus]:
+    """Extend ``owner``'s leases and return the current status of every job it still holds."""
+
+    if not job_ids:
+        return {}
+    expires = dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=lease_seconds)
+    await session.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.lease_owner == owner)
+        .values(lease_expires_at=expires, updated_at=Job.updated_at)
+    )
+    rows = await session.execute(select(Job.id, Job.status).where(Job.id.in_(job_ids), Job.lease_owner == owner))
+    await session.commit()
+    return {job_id: JobStatus(status.value) for job_id, status in rows}
+
+
+async def release_job_lease_db(
+    session: AsyncSession,
+    job_id: str,
+    *,
+    owner: str,
+    retry_after: float = 0.0,
+    status: JobStatus | None = None,
+) -> None:
+    """Drop ``owner``'s lease on a job whose run ended.
+
+    ``status`` is a terminal status the run already reached in memory; it is written to a
+    row that still reads queued/running (its final write failed), so the job is not run
+    again. A row that is still active after that is not claimable for ``retry_after``
+    seconds, instead of being reclaimed immediately (e.g. after a failed load).
+    """
+
+    if status is not None:
+        await session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.lease_owner == owner, ACTIVE_JOBS_WHERE)
+            .values(status=JobStatusDB(status.value), updated_at=dt.datetime.utcnow())
+        )
+    retry_at = dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=retry_after)
+    await session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.lease_owner == owner)
+        .values(
+            lease_owner=None,
+            lease_expires_at=case((ACTIVE_JOBS_WHERE, retry_at), else_=None) if retry_after > 0 else None,
+            updated_at=Job.updated_at,
+        )
+    )
+    await session.commit()
+
+
+async def list_jobs_db(
+    session: AsyncSession,
+    *,
+    visibility: Visibility | None = None,
+    after: Keyset | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+) -> List[JobOut]:
+    stmt = select(Job)
+    clause = visibility.clause(Job) if visibility else None
+    if clause is not None:
+        stmt = stmt.where(clause)
+    stmt = paginate(stmt, Job, after=after, offset=offset, limit=limit)
     result = await session.scalars(stmt)
     return [job_model_to_out(j) for j in result]
 
@@ -137,6 +252,7 @@ async def list_jobs_filtered(
     owner_id: str | None = None,
     created_from: dt.datetime | None = None,
     created_to: dt.datetime | None = None,
+    after: Keyset | None = None,
     offset: int = 0,
     limit: int | None = None,
 ) -> List[JobOut]:
@@ -151,11 +267,15 @@ async def list_jobs_filtered(
         stmt = stmt.where(Job.created_at >= created_from)
     if created_to is not None:
         stmt = stmt.where(Job.created_at <= created_to)
-    stmt = stmt.order_by(Job.created_at.desc())
-    if offset:
-        stmt = stmt.offset(offset)
-    if limit is not None:
-        stmt = stmt.limit(limit)
+    stmt = paginate(stmt, Job, after=after, offset=offset, limit=limit)
+    result = await session.scalars(stmt)
+    return [job_model_to_out(j) for j in result]
+
+
+async def list_active_jobs_db(session: AsyncSession) -> List[JobOut]:
+    """Queued/running jobs, newest first; reads only the partial ``ix_jobs_active_created_at`` index range."""
+
+    stmt = select(Job).where(ACTIVE_JOBS_WHERE).order_by(Job.created_at.desc()).options(noload(Job.owner))
     result = await session.scalars(stmt)
     return [job_model_to_out(j) for j in result]
 
@@ -165,6 +285,34 @@ async def get_job_db(session: AsyncSession, job_id: str) -> Optional[JobOut]:
     return job_model_to_out(job) if job else None
 
 
+async def list_jobs_by_ids_db(session: AsyncSession, job_ids: list[str]) -> List[JobOut]:
+    if not job_ids:
+        return []
+    result = await session.scalars(select(Job).where(Job.id.in_(job_ids)).options(noload(Job.owner)))
+    return [job_model_to_out(j) for j in result]
+
+
+async def get_job_with_asset_url_db(session: AsyncSession, job_id: str) -> tuple[Optional[JobOut], Optional[str]]:
+    """Return a job and the URL of its result asset with one primary-key lookup joined to ``assets``."""
+
+    stmt = (
+        select(Job, Asset.url)
+        .outerjoin(Asset, Asset.id == Job.asset_id)
+        .where(Job.id == job_id)
+        .options(noload(Job.owner))
+    )
+    row = (await session.execute(stmt)).first()
+    if row is None:
+        return None, None
+    job, asset_url = row
+    return job_model_to_out(job), asset_url
+
+
+async def get_asset_db(session: AsyncSession, asset_id: str) -> Optional[AssetOut]:
+    asset = await session.scalar(select(Asset).where(Asset.id == asset_id).options(noload(Asset.owner)))
+    return asset_model_to_out(asset) if asset else None
+
+
 async def persist_asset(
     session: AsyncSession,
     *,
@@ -192,29 +340,48 @@ async def persist_asset(
     )
     session.add(asset)
     await session.commit()
+    get_count_cache().invalidate("assets")
 
 
-async def list_assets_db(
-    session: AsyncSession,
+def _filter_assets(
+    stmt,
     *,
     asset_type: AssetType | None = None,
     provider: str | None = None,
     public_only: bool | None = None,
-    offset: int = 0,
-    limit: int | None = None,
-) -> List[AssetOut]:
-    stmt = select(Asset)
+    owner_id: str | None = None,
+    visibility: Visibility | None = None,
+):
     if asset_type:
         stmt = stmt.where(Asset.type == AssetTypeDB(asset_type.value))
     if provider:
         stmt = stmt.where(Asset.provider == provider)
     if public_only is not None:
         stmt = stmt.where(Asset.is_public == public_only)
-    stmt = stmt.order_by(Asset.created_at.desc())
-    if offset:
-        stmt = stmt.offset(offset)
-    if limit is not None:
-        stmt = stmt.limit(limit)
+    if owner_id:
+        stmt = stmt.where(Asset.owner_id == owner_id)
+    clause = visibility.clause(Asset) if visibility else None
+    if clause is not None:
+        stmt = stmt.where(clause)
+    return stmt
+
+
+async def list_assets_db(
+    session: AsyncSession,
+    *,
+    asset_type: AssetType | None = None,
+    provider: str | None = None,
+    public_only: bool | None = None,
+    owner_id: str | None = None,
+    visibility: Visibility | None = None,
+    after: Keyset | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+) -> List[AssetOut]:
+    stmt = _filter_assets(
+        select(Asset), asset_type=asset_type, provider=provider, public_only=public_only, owner_id=owner_id, visibility=visibility
+    )
+    stmt = paginate(stmt, Asset, after=after, offset=offset, limit=limit)
     result = await session.scalars(stmt)
     return [asset_model_to_out(a) for a in result]
 
@@ -226,23 +393,12 @@ async def list_assets_filtered(
     provider: str | None = None,
     public_only: bool | None = None,
     owner_id: str | None = None,
+    after: Keyset | None = None,
     offset: int = 0,
     limit: int | None = None,
 ) -> List[AssetOut]:
-    stmt = select(Asset)
-    if asset_type:
-        stmt = stmt.where(Asset.type == AssetTypeDB(asset_type.value))
-    if provider:
-        stmt = stmt.where(Asset.provider == provider)
-    if public_only is not None:
-        stmt = stmt.where(Asset.is_public == public_only)
-    if owner_id:
-        stmt = stmt.where(Asset.owner_id == owner_id)
-    stmt = stmt.order_by(Asset.created_at.desc())
-    if offset:
-        stmt = stmt.offset(offset)
-    if limit is not None:
-        stmt = stmt.limit(limit)
+    stmt = _filter_assets(select(Asset), asset_type=asset_type, provider=provider, public_only=public_only, owner_id=owner_id)
+    stmt = paginate(stmt, Asset, after=after, offset=offset, limit=limit)
     result = await session.scalars(stmt)
     return [asset_model_to_out(a) for a in result]
 
@@ -253,6 +409,7 @@ async def delete_asset_db(session: AsyncSession, asset_id: str) -> bool:
         return False
     await session.delete(asset)
     await session.commit()
+    get_count_cache().invalidate("assets")
     return True
 
 
@@ -390,10 +547,52 @@ async def update_provider_secret_db(
     provider.api_token = api_token
     await session.commit()
     return True
-async def count_jobs_db(session: AsyncSession) -> int:
-    return int(await session.scalar(select(func.count()).select_from(Job)) or 0)
-async def count_assets_db(session: AsyncSession) -> int:
-    return int(await session.scalar(select(func.count()).select_from(Asset)) or 0)
+
+
+async def count_jobs_db(session: AsyncSession, *, visibility: Visibility | None = None) -> int:
+    """Number of jobs ``visibility`` may list (all jobs when None), cached briefly."""
+
+    async def load() -> int:
+        stmt = select(func.count()).select_from(Job)
+        clause = visibility.clause(Job) if visibility else None
+        if clause is not None:
+            stmt = stmt.where(clause)
+        return int(await session.scalar(stmt) or 0)
+
+    return await get_count_cache().get_or_load(("jobs", visibility.key if visibility else "all"), load)
+
+
+async def count_assets_db(
+    session: AsyncSession,
+    *,
+    asset_type: AssetType | None = None,
+    provider: str | None = None,
+    public_only: bool | None = None,
+    owner_id: str | None = None,
+    visibility: Visibility | None = None,
+) -> int:
+    """Number of assets matching the listing filters (all assets when none), cached briefly."""
+
+    async def load() -> int:
+        stmt = _filter_assets(
+            select(func.count()).select_from(Asset),
+            asset_type=asset_type,
+            provider=provider,
+            public_only=public_only,
+            owner_id=owner_id,
+            visibility=visibility,
+        )
+        return int(await session.scalar(stmt) or 0)
+
+    key = (
+        "assets",
+        visibility.key if visibility else "all",
+        asset_type.value if asset_type else None,
+        provider,
+        public_only,
+        owner_id,
+    )
+    return await get_count_cache().get_or_load(key, load)
 
 
 # Wallet helpers
@@ -459,7 +658,7 @@ async def change_balance(
         new_balance = 0.0
     w.balance = new_balance
     t = WalletTransaction(
-        id=f"tx_{int(await session.scalar(select(func.count()).select_from(WalletTransaction)) or 0) + 1}",
+        id=new_transaction_id(),
         user_id=user_id,
         amount=abs(float(delta)),
         type=WalletTxTypeDB(tx_type.value if isinstance(tx_type, WalletTxTypeDB) else tx_type.value),
@@ -475,12 +674,11 @@ async def change_balance(
     return _wallet_model_to_out(w), _tx_model_to_out(t)
 
 
-async def list_wallet_txs(session: AsyncSession, user_id: str, *, offset: int = 0, limit: int | None = None) -> list[WalletTxOut]:
-    stmt = select(WalletTransaction).where(WalletTransaction.user_id == user_id).order_by(WalletTransaction.created_at.desc())
-    if offset:
-        stmt = stmt.offset(offset)
-    if limit is not None:
-        stmt = stmt.limit(limit)
+async def list_wallet_txs(
+    session: AsyncSession, user_id: str, *, after: Keyset | None = None, offset: int = 0, limit: int | None = None
+) -> list[WalletTxOut]:
+    stmt = select(WalletTransaction).where(WalletTransaction.user_id == user_id)
+    stmt = paginate(stmt, WalletTransaction, after=after, offset=offset, limit=limit)
     result = await session.scalars(stmt)
     return [_tx_model_to_out(x) for x in result]
 
@@ -533,12 +731,24 @@ async def update_preferences(
 
 
 # Admin: users
-async def list_users_db(session: AsyncSession, *, offset: int = 0, limit: int | None = None) -> list[UserOut]:
-    stmt = select(User).order_by(User.created_at.desc())
-    if offset:
-        stmt = stmt.offset(offset)
-    if limit is not None:
-        stmt = stmt.limit(limit)
+async def list_users_db(
+    session: AsyncSession,
+    *,
+    role: str | None = None,
+    q: str | None = None,
+    after: Keyset | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+) -> list[UserOut]:
+    stmt = select(User)
+    if role:
+        stmt = stmt.where(User.role == role)
+    if q:
+        ql = q.lower()
+        stmt = stmt.where(
+            or_(func.lower(User.email).contains(ql, autoescape=True), func.lower(User.username).contains(ql, autoescape=True))
+        )
+    stmt = paginate(stmt, User, after=after, offset=offset, limit=limit)
     result = await session.scalars(stmt)
     return [user_model_to_out(u) for u in result]
 
@@ -549,6 +759,7 @@ async def update_user_role(session: AsyncSession, *, user_id: str, role: str) ->
         return None
     user.role = role
     await session.commit()
+    get_principal_cache().invalidate_user(user_id)
     await session.refresh(user)
     return user_model_to_out(user)
 
@@ -559,6 +770,7 @@ async def delete_user_db(session: AsyncSession, *, user_id: str) -> bool:
         return False
     await session.delete(user)
     await session.commit()
+    get_principal_cache().invalidate_user(user_id)
     return True
 
 
@@ -571,6 +783,7 @@ async def update_user_fields(session: AsyncSession, *, user_id: str, email: str
     if username is not None:
         user.username = username
     await session.commit()
+    get_principal_cache().invalidate_user(user_id)
     await session.refresh(user)
     return user_model_to_out(user)
 
@@ -581,6 +794,7 @@ async def update_user_password(session: AsyncSession, *, user_id: str, password_
         return None
     user.password_hash = password_hash
     await session.commit()
+    get_principal_cache().invalidate_user(user_id)
     await session.refresh(user)
     return user_model_to_out(user)
 
@@ -632,6 +846,8 @@ async def update_asset_fields(session: AsyncSession, asset_id: str, **fields) ->
     for k, v in fields.items():
         setattr(asset, k, v)
     await session.commit()
+    if _ASSET_COUNT_FIELDS.intersection(fields):
+        get_count_cache().invalidate("assets")
     await session.refresh(asset)
     return asset_model_to_out(asset)
 
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.config import get_settings
+from app.schemas import UserOut
+
+
+class PrincipalCache:
+    """Short-lived map of verified access token -> user, so polling skips the user lookup.
+
+    Entries are keyed by the exact token string (whose signature was checked when it was
+    cached) and live for ``ttl`` seconds, never past the token's own ``exp``. Changes to
+    a user made through the admin/auth APIs call ``invalidate_user``, which drops every
+    token of that user at once; changes made by another process are picked up within
+    ``ttl``.
+
+    ``invalidate_user`` also advances the user's generation. Callers read it before
+    loading the user and pass it to ``put``, which refuses a user loaded before an
+    invalidation. Generations are kept in an LRU of the same bound; evicting one raises
+    the floor every unknown user starts from, so an evicted generation never matches
+    again.
+    """
+
+    def __init__(self, ttl: float | None = None, max_entries: int | None = None) -> None:
+        settings = get_settings()
+        self.ttl = float(ttl if ttl is not None else settings.auth_principal_ttl)
+        self.max_entries = max(1, int(max_entries or settings.auth_principal_max_entries))
+        self._entries: "OrderedDict[str, Tuple[UserOut, float]]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._clock = 0
+        self._floor = 0
+        self.hits = 0
+        self.misses = 0
+
+    def generation(self, user_id: str) -> int:
+        return self._generations.get(user_id, self._floor)
+
+    def get(self, token: str) -> Optional[UserOut]:
+        entry = self._entries.get(token)
+        if entry is None or entry[1] <= time.time():
+            if entry is not None:
+                self._drop(token)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return entry[0]
+
+    def put(
+        self, token: str, user: UserOut, token_exp: float | None = None, generation: int | None = None
+    ) -> None:
+        if self.ttl <= 0:
+            return
+        if generation is not None and generation != self.generation(user.id):
+            return  # invalidated while the user was being loaded
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        self._entries[token] = (user, expires_at)
+        self._entries.move_to_end(token)
+        self._by_user.setdefault(user.id, set()).add(token)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._by_user.get(entry[0].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_user[entry[0].id]
+
+    def invalidate_user(self, user_id: str) -> None:
+        self._clock += 1
+        self._generations[user_id] = self._clock
+        self._generations.move_to_end(user_id)
+        while len(self._generations) > self.max_entries:
+            _, evicted = self._generations.popitem(last=False)
+            self._floor = max(self._floor, evicted)
+        for token in self._by_user.pop(user_id, set()):
+            self._entries.pop(token, None)
+
+    def snapshot(self) -> dict:
+        return {"entries": len(self._entries), "users": len(self._by_user), "hits": self.hits, "misses": self.misses}
+
+
+principal_cache = PrincipalCache()
+
+
+def get_principal_cache() -> PrincipalCache:
+    return principal_cache
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, Optional
+
+from app.config import get_settings
+
+
+class ProgressWriter:
+    """Write-behind buffer for job progress.
+
+    Progress ticks only record the latest value per job; a background loop flushes all
+    dirty jobs every ``interval`` seconds in one bulk UPDATE. Status transitions do not
+    go through here: callers ``discard`` a job's pending value and write the terminal
+    state synchronously with ``update_job_fields``.
+    """
+
+    def __init__(self, interval: float | None = None) -> None:
+        if interval is None:
+            interval = get_settings().progress_flush_ms / 1000.0
+        self.interval = max(0.05, float(interval))
+        self.flush_task: Optional[asyncio.Task] = None
+        self._pending: Dict[str, int] = {}
+        self._lock = asyncio.Lock()
+        self.flushes_total = 0
+        self.rows_total = 0
+
+    async def start(self) -> None:
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self.flush_task = None
+        await self.flush()
+
+    def record(self, job_id: str, progress: float) -> None:
+        self._pending[job_id] = int(progress)
+        if self.flush_task is None or self.flush_task.done():
+            # Ensure the flusher runs even if startup event was skipped
+            try:
+                self.flush_task = asyncio.create_task(self._loop())
+            except Exception:
+                pass
+
+    def discard(self, job_id: str) -> None:
+        self._pending.pop(job_id, None)
+
+    async def flush(self) -> int:
+        async with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            try:
+                from app.db import SessionLocal
+                from app.services.persistence import bulk_update_job_progress_db
+                async with SessionLocal() as session:
+                    rows = await bulk_update_job_progress_db(session, batch)
+            except Exception:
+                # keep values for the next flush unless a newer one was recorded meanwhile
+                for job_id, value in batch.items():
+                    self._pending.setdefault(job_id, value)
+                return 0
+            self.flushes_total += 1
+            self.rows_total += rows
+            return rows
+
+    def snapshot(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "flushes_total": self.flushes_total,
+            "rows_total": self.rows_total,
+        }
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+
+progress_writer = ProgressWriter()
+
+
+def get_progress_writer() -> ProgressWriter:
+    return progress_writer
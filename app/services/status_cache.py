@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import get_settings
+from app.services.job_state import JobState
+from app.schemas import JobOut, JobStatus
+
+_TERMINAL = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELED}
+
+
+@dataclass
+class StatusEntry:
+    version: int
+    payload: dict
+    etag: str
+    owner_id: Optional[str]
+    is_public: bool
+    expires_at: Optional[float]
+
+
+class StatusCache:
+    """Read-through cache of rendered ``/api/jobs/{id}/status`` payloads.
+
+    Every job carries a version that ``bump`` increments; the MemoryStore calls it on
+    each create/update, so any transition or progress tick invalidates the cached
+    payload. Entries of non-terminal jobs also expire after ``ttl`` seconds so upstream
+    provider state and changes made by other processes are re-read periodically.
+    Terminal entries live until evicted by the LRU bound.
+
+    Versions are drawn from one process-wide clock and kept in an LRU of the same bound;
+    evicting a job's version drops its entry too. A job whose version was evicted and
+    later bumped again gets a fresh clock value, so a payload rendered against an older
+    version can never be stored as current.
+    """
+
+    def __init__(self, max_entries: int | None = None, ttl: float | None = None) -> None:
+        settings = get_settings()
+        self.max_entries = max(1, int(max_entries or settings.status_cache_max_entries))
+        self.ttl = float(ttl if ttl is not None else settings.status_cache_ttl)
+        self._entries: "OrderedDict[str, StatusEntry]" = OrderedDict()
+        self._versions: "OrderedDict[str, int]" = OrderedDict()
+        self._clock = 0
+        self.hits = 0
+        self.misses = 0
+
+    def bump(self, job: JobState) -> None:
+        self.invalidate(job.id)
+
+    def version(self, job_id: str) -> int:
+        return self._versions.get(job_id, 0)
+
+    def get(self, job_id: str) -> Optional[StatusEntry]:
+        entry = self._entries.get(job_id)
+        if entry is None or entry.version != self.version(job_id) or (
+            entry.expires_at is not None and entry.expires_at < time.monotonic()
+        ):
+            if entry is not None:
+                self._entries.pop(job_id, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(job_id)
+        if job_id in self._versions:
+            self._versions.move_to_end(job_id)
+        self.hits += 1
+        return entry
+
+    def invalidate(self, job_id: str) -> None:
+        """Drop a job's entry after a change that bypassed the MemoryStore (DB-only writes)."""
+
+        self._clock += 1
+        self._versions[job_id] = self._clock
+        self._versions.move_to_end(job_id)
+        self._entries.pop(job_id, None)
+        while len(self._versions) > self.max_entries:
+            evicted, _ = self._versions.popitem(last=False)
+            self._entries.pop(evicted, None)
+
+    def put(self, job: JobOut, payload: dict, *, version: int, terminal: bool | None = None) -> StatusEntry:
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        etag = 'W/"' + hashlib.sha1(body.encode("utf-8")).hexdigest()[:20] + '"'
+        entry = StatusEntry(
+            version=version,
+            payload=payload,
+            etag=etag,
+            owner_id=job.owner_id,
+            is_public=job.is_public,
+            expires_at=None if (terminal if terminal is not None else job.status in _TERMINAL) else time.monotonic() + self.ttl,
+        )
+        if version != self.version(job.id):
+            return entry  # changed while rendering: serve it once, don't cache
+        self._entries[job.id] = entry
+        self._entries.move_to_end(job.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def snapshot(self) -> dict:
+        return {"entries": len(self._entries), "versions": len(self._versions), "hits": self.hits, "misses": self.misses}
+
+
+status_cache = StatusCache()
+
+
+def get_status_cache() -> StatusCache:
+    return status_cache
@@ -1,35 +1,106 @@
 from __future__ import annotations
 
-import os
+import asyncio
 import base64
+import mimetypes
 import re
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 from app.schemas import AssetOut
 
 from fastapi import HTTPException, UploadFile, status
 
 from app.config import get_settings
+from app.services.blobs import get_blob_store
+from app.services.storage_driver import StorageLimitExceeded, get_storage_driver  # noqa: F401
 
 
 def ensure_storage_dir(base: Path) -> None:
     base.mkdir(parents=True, exist_ok=True)
 
 
-_DATA_URL_RE = re.compile(r"^data:image/([a-zA-Z0-9.+-]+);base64,(.+)$", re.DOTALL)
+_DATA_URL_HEAD_RE = re.compile(r"^data:image/([a-zA-Z0-9.+-]+);base64$")
+_MEDIA_PREFIX = "/media/"
 
 
-def save_data_url_image(job_id: str, data_url: str, *, filename: str = "output") -> str:
+def media_url(key: str) -> str:
+    return f"{_MEDIA_PREFIX}{key}"
+
+
+def media_key(url: str | None) -> Optional[str]:
+    """Storage key behind a ``/media/...`` URL; None for anything else (remote URLs)."""
+
+    if not url or not url.startswith(_MEDIA_PREFIX):
+        return None
+    return url[len(_MEDIA_PREFIX):].split("?", 1)[0].split("#", 1)[0] or None
+
+
+async def media_source(url: str) -> str:
+    """A ``/media/...`` URL as something a provider can fetch: a presigned URL on object
+    storage, else a base64 data URI (read and encoded off the event loop). Other URLs
+    are returned unchanged."""
+
+    key = media_key(url)
+    if key is None:
+        return url
+    driver = get_storage_driver()
+    if driver.local_root is None:
+        return driver.presign_get(key)
+    data = await driver.read(key)
+    mime = mimetypes.guess_type(key)[0] or "image/png"
+    encoded = await asyncio.to_thread(lambda: base64.b64encode(data).decode("ascii"))
+    return f"data:{mime};base64,{encoded}"
+
+
+async def _in_thread(iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Drive a CPU-bound sync iterator (e.g. ``iter_base64``) from a worker thread."""
+
+    while True:
+        chunk = await asyncio.to_thread(next, iterator, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+async def iter_upload(upload: UploadFile, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+    chunk_size = chunk_size or get_settings().storage_chunk_bytes
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_base64(text: str, start: int = 0, chunk_chars: int | None = None) -> Iterator[bytes]:
+    """Decode ``text[start:]`` piecewise so only one chunk is held decoded at a time.
+
+    Whitespace is skipped; each piece is cut at a multiple of 4 characters and the rest
+    carried into the next one. Raises ``binascii.Error`` on malformed input.
+    """
+
+    chunk_chars = chunk_chars or get_settings().storage_chunk_bytes
+    chunk_chars = max(4, chunk_chars - chunk_chars % 4)
+    carry = ""
+    for pos in range(start, len(text), chunk_chars):
+        piece = carry + "".join(text[pos:pos + chunk_chars].split())
+        cut = len(piece) - len(piece) % 4
+        carry = piece[cut:]
+        if cut:
+            yield base64.b64decode(piece[:cut], validate=True)
+    if carry:
+        yield base64.b64decode(carry + "=" * (-len(carry) % 4), validate=True)
+
+
+async def save_data_url_image(job_id: str, data_url: str) -> str:
     """Persist a data URL image to storage and return the static media URL."""
 
-    match = _DATA_URL_RE.match((data_url or "").strip())
+    data_url = data_url or ""
+    comma = data_url.find(",")
+    match = _DATA_URL_HEAD_RE.match(data_url[:comma].strip()) if comma > 0 else None
     if not match:
         raise ValueError("invalid data url")
 
     mime = match.group(1).lower()
-    b64_payload = match.group(2).strip()
-    payload = base64.b64decode(b64_payload)
-
     ext = "png"
     if "jpeg" in mime or mime == "jpg":
         ext = "jpg"
@@ -42,86 +113,75 @@ def save_data_url_image(job_id: str, data_url: str, *, filename: str = "output")
     elif "tiff" in mime:
         ext = "tiff"
 
-    settings = get_settings()
-    base = Path(settings.storage_base)
-    ensure_storage_dir(base / job_id)
-    dest = base / job_id / f"{filename}.{ext}"
-    with dest.open("wb") as f:
-        f.write(payload)
+    key, _ = await get_blob_store().put(
+        job_id,
+        _in_thread(iter_base64(data_url, comma + 1)),
+        ext=f".{ext}",
+        content_type=f"image/{mime}",
+        max_bytes=get_settings().max_data_url_bytes,
+    )
+    return media_url(key)
+
 
-    rel_path = f"{job_id}/{filename}.{ext}"
-    return f"/media/{rel_path}"
+async def save_upload(owner: str, upload: UploadFile, *, ext: str = "", max_bytes: int | None = None) -> tuple[str, int]:
+    """Stream an upload into content-addressed storage held by ``owner``; returns (key, size)."""
 
+    return await get_blob_store().put(owner, iter_upload(upload), ext=ext, content_type=upload.content_type, max_bytes=max_bytes)
 
-def _validate_image_upload(upload: UploadFile, max_bytes: int) -> bytes:
+
+def _validate_image_upload(upload: UploadFile) -> None:
     allowed_types = {"image/png", "image/jpeg", "image/webp"}
     if upload.content_type not in allowed_types:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Unsupported image type",
         )
-    data = upload.file.read()
-    if len(data) > max_bytes:
+
+
+async def save_source_image(job_id: str, upload: UploadFile, max_bytes: int | None = None) -> tuple[str, str]:
+    """Persist uploaded source image to storage and return (relative_path, public_url)."""
+
+    _validate_image_upload(upload)
+    ext = Path(upload.filename or "source").suffix or ".png"
+    try:
+        key, _ = await save_upload(job_id, upload, ext=ext, max_bytes=max_bytes or get_settings().max_source_image_bytes)
+    except StorageLimitExceeded:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Image too large",
         )
-    return data
-
+    return key, media_url(key)
 
-def save_source_image(job_id: str, upload: UploadFile, max_bytes: int = 5 * 1024 * 1024) -> tuple[str, str]:
-    """Persist uploaded source image to storage and return (relative_path, public_url)."""
 
-    settings = get_settings()
-    base = Path(settings.storage_base)
-    ensure_storage_dir(base / job_id)
-    ext = Path(upload.filename or "source").suffix or ".png"
-    filename = f"source{ext}"
-    dest = base / job_id / filename
-    data = _validate_image_upload(upload, max_bytes)
-    with dest.open("wb") as f:
-        f.write(data)
-    # public url served via StaticFiles mount
-    rel_path = f"{job_id}/{filename}"
-    url = f"/media/{rel_path}"
-    return rel_path, url
-
-
-def placeholder_output(kind: str, job_id: str) -> tuple[str, str]:
+async def placeholder_output(kind: str, job_id: str) -> tuple[str, str]:
     """Produce placeholder output file path/url for assets."""
 
-    settings = get_settings()
-    base = Path(settings.storage_base)
-    ensure_storage_dir(base / job_id)
     ext = ".png" if kind == "text_to_image" else ".mp4"
-    filename = f"output{ext}"
-    dest = base / job_id / filename
-    if not dest.exists():
-        dest.write_bytes(b"")  # placeholder empty file
-    rel_path = f"{job_id}/{filename}"
-    url = f"/media/{rel_path}"
-    return rel_path, url
+    key, _ = await get_blob_store().put(job_id, _in_thread(iter(())), ext=ext)  # placeholder empty file
+    return key, media_url(key)
+
+
+def media_owner(asset: AssetOut) -> str:
+    """Blob owner for an asset's media: its generating job, else the asset itself."""
+
+    return (asset.meta or {}).get("job_id") or asset.id
+
 
+async def delete_asset_files(asset: AssetOut) -> None:
+    """Release an asset's stored media. Content-addressed blobs (the original and any
+    derived preview) are dropped by their owner and deleted once unreferenced; older
+    layouts lose the whole job prefix, or just the object for ``uploads/``."""
 
-def delete_asset_files(asset: AssetOut) -> None:
     try:
-        url = asset.url
-        if not url.startswith("/media/"):
+        await get_blob_store().release(media_owner(asset))
+        key = media_key(asset.url)
+        if not key or key.startswith("blobs/"):
             return
-        rel = url[len("/media/"):]
-        job_id = rel.split("/", 1)[0]
-        settings = get_settings()
-        base = Path(settings.storage_base)
-        target = base / job_id
-        if target.exists() and target.is_dir():
-            for p in target.glob("**/*"):
-                try:
-                    p.unlink()
-                except Exception:
-                    pass
-            try:
-                target.rmdir()
-            except Exception:
-                pass
+        driver = get_storage_driver()
+        head, _, rest = key.partition("/")
+        if rest and head != "uploads":
+            await driver.delete_prefix(head)
+        else:
+            await driver.delete(key)
     except Exception:
         pass
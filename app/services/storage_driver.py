@@ -0,0 +1,98 @@
+"""Object storage backend behind ``app.services.storage``.
+
+Media is addressed by a storage *key* (``<job_id>/output.png``, ``uploads/<asset>.mp4``)
+and referenced everywhere as ``/media/<key>``, independent of where the bytes live.
+``STORAGE_DRIVER`` picks the backend:
+
+- ``local``: files under ``STORAGE_BASE``, served by the ``/media`` static mount.
+- ``s3``: an S3-compatible bucket (AWS, MinIO, R2, ...); ``/media/<key>`` redirects to
+  a presigned (or public) URL so media bytes never pass through the app.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import AsyncIterable, Optional, Protocol
+
+from app.config import get_settings
+
+
+class StorageLimitExceeded(ValueError):
+    """Raised while streaming a write once it passes its ``max_bytes``; nothing is kept."""
+
+
+class StorageDriver(Protocol):
+    name: str
+
+    @property
+    def local_root(self) -> Optional[Path]:
+        """Directory holding the objects when they are plain local files, else None."""
+        ...
+
+    async def write(
+        self, key: str, chunks: AsyncIterable[bytes], *, max_bytes: int | None = None, content_type: str | None = None
+    ) -> int:
+        """Store ``chunks`` under ``key`` atomically; returns the size written."""
+        ...
+
+    async def read(self, key: str) -> bytes:
+        ...
+
+    async def exists(self, key: str) -> bool:
+        ...
+
+    async def delete(self, key: str) -> None:
+        ...
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Delete every object whose key starts with ``prefix`` (a ``dir/`` style prefix)."""
+        ...
+
+    def presign_get(self, key: str, expires: int | None = None) -> str:
+        """URL a client can fetch ``key`` from directly (computed locally, no I/O)."""
+        ...
+
+    def presign_put(self, key: str, expires: int | None = None, content_type: str | None = None) -> Optional[str]:
+        """URL a client can upload ``key`` to directly, or None when unsupported."""
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+def _normalize_key(key: str) -> str:
+    parts = [p for p in key.replace("\\", "/").split("/") if p not in ("", ".")]
+    if not parts or ".." in parts:
+        raise ValueError(f"invalid storage key: {key!r}")
+    return "/".join(parts)
+
+
+_driver: StorageDriver | None = None
+
+
+def get_storage_driver() -> StorageDriver:
+    global _driver
+    if _driver is None:
+        settings = get_settings()
+        name = (settings.storage_driver or "local").lower()
+        if name == "s3":
+            from app.services.storage_s3 import S3Driver
+
+            _driver = S3Driver.from_settings(settings)
+        elif name == "local":
+            from app.services.storage_local import LocalDriver
+
+            _driver = LocalDriver(Path(settings.storage_base))
+        else:
+            raise ValueError(f"unknown STORAGE_DRIVER: {settings.storage_driver}")
+    return _driver
+
+
+async def close_storage_driver() -> None:
+    global _driver
+    driver, _driver = _driver, None
+    if driver is not None:
+        try:
+            await driver.close()
+        except Exception:
+            pass
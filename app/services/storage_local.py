@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import AsyncIterable, BinaryIO, Optional, Tuple
+
+from app.services.storage_driver import StorageLimitExceeded, _normalize_key
+
+
+def _open_temp(dest: Path) -> Tuple[Path, BinaryIO]:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.part")
+    return tmp, tmp.open("wb")
+
+
+def _finish_temp(tmp: Path, handle: BinaryIO, dest: Path, ok: bool) -> None:
+    handle.close()
+    if ok:
+        os.replace(tmp, dest)
+    else:
+        tmp.unlink(missing_ok=True)
+
+
+class LocalDriver:
+    """Objects are files under ``root``; ``/media`` serves them with ``StaticFiles``.
+
+    Writes go to a temp file next to the destination (file I/O on worker threads) and
+    are renamed into place, so readers see the previous file or the complete new one.
+    """
+
+    name = "local"
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    @property
+    def local_root(self) -> Optional[Path]:
+        return self.root
+
+    def _path(self, key: str) -> Path:
+        return self.root / _normalize_key(key)
+
+    async def write(
+        self, key: str, chunks: AsyncIterable[bytes], *, max_bytes: int | None = None, content_type: str | None = None
+    ) -> int:
+        dest = self._path(key)
+        tmp, handle = await asyncio.to_thread(_open_temp, dest)
+        size = 0
+        ok = False
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise StorageLimitExceeded(f"more than {max_bytes} bytes")
+                await asyncio.to_thread(handle.write, chunk)
+            ok = True
+        finally:
+            await asyncio.to_thread(_finish_temp, tmp, handle, dest, ok)
+        return size
+
+    async def read(self, key: str) -> bytes:
+        return await asyncio.to_thread(self._path(key).read_bytes)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).is_file)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        target = self._path(prefix)
+        await asyncio.to_thread(shutil.rmtree, target, True)
+
+    def presign_get(self, key: str, expires: int | None = None) -> str:
+        return f"/media/{_normalize_key(key)}"
+
+    def presign_put(self, key: str, expires: int | None = None, content_type: str | None = None) -> Optional[str]:
+        return None
+
+    async def close(self) -> None:
+        return None
@@ -0,0 +1,270 @@
+"""S3-compatible storage driver (AWS S3, MinIO, R2, ...) over the shared httpx pool.
+
+Requests are signed with AWS Signature Version 4 directly, so there is no SDK
+dependency. Objects up to ``part_bytes`` are written with a single PUT; larger
+streams use a multipart upload, so at most one part is buffered in memory.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import hmac
+import mimetypes
+from typing import AsyncIterable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+from xml.etree import ElementTree
+
+import httpx
+
+from app.interface.http import get_async_client
+from app.services.storage_driver import StorageLimitExceeded, _normalize_key
+
+_EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+_UNSIGNED = "UNSIGNED-PAYLOAD"
+_MIN_PART_BYTES = 5 * 1024 * 1024
+
+
+class S3Error(RuntimeError):
+    def __init__(self, method: str, key: str, status_code: int, body: str) -> None:
+        super().__init__(f"S3 {method} {key} failed: {status_code} {body[:300]}")
+        self.status_code = status_code
+
+
+def _quote(value: str) -> str:
+    return quote(value, safe="-_.~")
+
+
+def _canonical_query(query: Dict[str, str]) -> str:
+    return "&".join(f"{_quote(k)}={_quote(v)}" for k, v in sorted(query.items()))
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+def _xml_text(body: bytes, tag: str) -> List[str]:
+    root = ElementTree.fromstring(body)
+    return [el.text or "" for el in root.iter() if el.tag == tag or el.tag.endswith("}" + tag)]
+
+
+class S3Driver:
+    name = "s3"
+
+    def __init__(
+        self,
+        *,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str = "us-east-1",
+        endpoint_url: str | None = None,
+        key_prefix: str = "",
+        addressing_style: str = "path",
+        presign_seconds: int = 900,
+        public_base_url: str | None = None,
+        part_bytes: int = 8 * 1024 * 1024,
+    ) -> None:
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        endpoint = urlsplit(endpoint_url or f"https://s3.{region}.amazonaws.com")
+        self.scheme = endpoint.scheme or "https"
+        self.virtual_hosted = addressing_style == "virtual"
+        self.host = f"{bucket}.{endpoint.netloc}" if self.virtual_hosted else endpoint.netloc
+        self.key_prefix = key_prefix.strip("/") + "/" if key_prefix.strip("/") else ""
+        self.presign_seconds = int(presign_seconds)
+        self.public_base_url = public_base_url.rstrip("/") if public_base_url else None
+        self.part_bytes = max(_MIN_PART_BYTES, int(part_bytes))
+        self._signing_keys: Dict[str, bytes] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> "S3Driver":
+        if not (settings.s3_bucket and settings.s3_access_key_id and settings.s3_secret_access_key):
+            raise ValueError("STORAGE_DRIVER=s3 requires S3_BUCKET, S3_ACCESS_KEY_ID and S3_SECRET_ACCESS_KEY")
+        return cls(
+            bucket=settings.s3_bucket,
+            access_key=settings.s3_access_key_id,
+            secret_key=settings.s3_secret_access_key,
+            region=settings.s3_region,
+            endpoint_url=settings.s3_endpoint_url,
+            key_prefix=settings.s3_key_prefix,
+            addressing_style=settings.s3_addressing_style,
+            presign_seconds=settings.s3_presign_seconds,
+            public_base_url=settings.s3_public_base_url,
+            part_bytes=settings.s3_part_bytes,
+        )
+
+    @property
+    def local_root(self):
+        return None
+
+    # Signature V4
+    def _object_path(self, key: str | None) -> str:
+        path = "" if self.virtual_hosted else "/" + self.bucket
+        if key is None:
+            return path + "/" if self.virtual_hosted else path
+        return path + "/" + "/".join(_quote(p) for p in (self.key_prefix + _normalize_key(key)).split("/"))
+
+    def _signing_key(self, date: str) -> bytes:
+        key = self._signing_keys.get(date)
+        if key is None:
+            k = _hmac(("AWS4" + self.secret_key).encode("utf-8"), date)
+            k = _hmac(k, self.region)
+            k = _hmac(k, "s3")
+            key = _hmac(k, "aws4_request")
+            self._signing_keys = {date: key}
+        return key
+
+    def _signature(self, method: str, path: str, query: Dict[str, str], headers: Dict[str, str], payload_hash: str, now: dt.datetime) -> Tuple[str, str, str]:
+        """Return (signature, signed header names, credential scope)."""
+
+        date = now.strftime("%Y%m%d")
+        scope = f"{date}/{self.region}/s3/aws4_request"
+        names = sorted(h.lower() for h in headers)
+        lowered = {k.lower(): " ".join(str(v).split()) for k, v in headers.items()}
+        canonical = "\n".join(
+            [
+                method,
+                path or "/",
+                _canonical_query(query),
+                "".join(f"{n}:{lowered[n]}\n" for n in names),
+                ";".join(names),
+                payload_hash,
+            ]
+        )
+        to_sign = "\n".join(
+            ["AWS4-HMAC-SHA256", now.strftime("%Y%m%dT%H%M%SZ"), scope, hashlib.sha256(canonical.encode("utf-8")).hexdigest()]
+        )
+        signature = hmac.new(self._signing_key(date), to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+        return signature, ";".join(names), scope
+
+    def _presign(self, method: str, key: str, expires: int | None, now: dt.datetime | None = None) -> str:
+        now = now or dt.datetime.now(dt.timezone.utc)
+        path = self._object_path(key)
+        query = {
+            "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+            "X-Amz-Credential": f"{self.access_key}/{now.strftime('%Y%m%d')}/{self.region}/s3/aws4_request",
+            "X-Amz-Date": now.strftime("%Y%m%dT%H%M%SZ"),
+            "X-Amz-Expires": str(int(expires or self.presign_seconds)),
+            "X-Amz-SignedHeaders": "host",
+        }
+        signature, _, _ = self._signature(method, path, query, {"host": self.host}, _UNSIGNED, now)
+        return f"{self.scheme}://{self.host}{path}?{_canonical_query(query)}&X-Amz-Signature={signature}"
+
+    async def _request(
+        self,
+        method: str,
+        key: str | None,
+        *,
+        query: Optional[Dict[str, str]] = None,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+        ok: Tuple[int, ...] = (200,),
+    ) -> httpx.Response:
+        query = query or {}
+        now = dt.datetime.now(dt.timezone.utc)
+        payload_hash = hashlib.sha256(body).hexdigest() if body else _EMPTY_SHA256
+        signed = {"host": self.host, "x-amz-content-sha256": payload_hash, "x-amz-date": now.strftime("%Y%m%dT%H%M%SZ")}
+        path = self._object_path(key)
+        signature, names, scope = self._signature(method, path, query, signed, payload_hash, now)
+        request_headers = {
+            **(headers or {}),
+            "x-amz-content-sha256": payload_hash,
+            "x-amz-date": signed["x-amz-date"],
+            "Authorization": f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, SignedHeaders={names}, Signature={signature}",
+        }
+        url = f"{self.scheme}://{self.host}{path or '/'}"
+        if query:
+            url += "?" + _canonical_query(query)
+        resp = await get_async_client("storage").request(method, url, content=body or None, headers=request_headers)
+        if resp.status_code not in ok:
+            raise S3Error(method, key or "", resp.status_code, resp.text)
+        return resp
+
+    # StorageDriver
+    async def write(
+        self, key: str, chunks: AsyncIterable[bytes], *, max_bytes: int | None = None, content_type: str | None = None
+    ) -> int:
+        headers = {"Content-Type": content_type or mimetypes.guess_type(key)[0] or "application/octet-stream"}
+        buf = bytearray()
+        size = 0
+        upload_id: str | None = None
+        etags: List[str] = []
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise StorageLimitExceeded(f"more than {max_bytes} bytes")
+                buf += chunk
+                while len(buf) >= self.part_bytes:
+                    if upload_id is None:
+                        resp = await self._request("POST", key, query={"uploads": ""}, headers=headers)
+                        upload_id = _xml_text(resp.content, "UploadId")[0]
+                    part, buf = bytes(buf[: self.part_bytes]), buf[self.part_bytes:]
+                    etags.append(await self._upload_part(key, upload_id, len(etags) + 1, part))
+            if upload_id is None:
+                await self._request("PUT", key, body=bytes(buf), headers=headers)
+                return size
+            if buf or not etags:
+                etags.append(await self._upload_part(key, upload_id, len(etags) + 1, bytes(buf)))
+            parts = "".join(f"<Part><PartNumber>{n}</PartNumber><ETag>{etag}</ETag></Part>" for n, etag in enumerate(etags, 1))
+            resp = await self._request(
+                "POST",
+                key,
+                query={"uploadId": upload_id},
+                body=f"<CompleteMultipartUpload>{parts}</CompleteMultipartUpload>".encode("utf-8"),
+                headers={"Content-Type": "application/xml"},
+            )
+            # errors after the upload started are reported in a 200 response body
+            if b"<Error>" in resp.content:
+                raise S3Error("POST", key, resp.status_code, resp.text)
+            upload_id = None
+            return size
+        finally:
+            if upload_id is not None:
+                try:
+                    await self._request("DELETE", key, query={"uploadId": upload_id}, ok=(200, 204, 404))
+                except Exception:
+                    pass
+
+    async def _upload_part(self, key: str, upload_id: str, number: int, data: bytes) -> str:
+        resp = await self._request("PUT", key, query={"partNumber": str(number), "uploadId": upload_id}, body=data)
+        return resp.headers.get("ETag", "")
+
+    async def read(self, key: str) -> bytes:
+        return (await self._request("GET", key)).content
+
+    async def exists(self, key: str) -> bool:
+        resp = await self._request("HEAD", key, ok=(200, 403, 404))
+        return resp.status_code == 200
+
+    async def delete(self, key: str) -> None:
+        await self._request("DELETE", key, ok=(200, 204, 404))
+
+    async def delete_prefix(self, prefix: str) -> None:
+        full_prefix = self.key_prefix + _normalize_key(prefix) + "/"
+        token: str | None = None
+        while True:
+            query = {"list-type": "2", "prefix": full_prefix}
+            if token:
+                query["continuation-token"] = token
+            resp = await self._request("GET", None, query=query)
+            for full_key in _xml_text(resp.content, "Key"):
+                await self.delete(full_key[len(self.key_prefix):])
+            tokens = _xml_text(resp.content, "NextContinuationToken")
+            if not tokens or not tokens[0]:
+                return
+            token = tokens[0]
+
+    def presign_get(self, key: str, expires: int | None = None) -> str:
+        if self.public_base_url:
+            return f"{self.public_base_url}/{quote(self.key_prefix + _normalize_key(key))}"
+        return self._presign("GET", key, expires)
+
+    def presign_put(self, key: str, expires: int | None = None, content_type: str | None = None) -> Optional[str]:
+        return self._presign("PUT", key, expires)
+
+    async def close(self) -> None:
+        return None
@@ -1,39 +1,244 @@
 from __future__ import annotations
 
 import datetime as dt
-from collections import defaultdict
-from typing import Dict, List, Optional, Tuple
-import uuid
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from app.schemas import AssetOut, AssetType, JobCreate, JobKind, JobOut, JobParams, JobStatus
 from app.config import get_settings
+from app.services.ids import new_asset_id, new_job_id
+from app.services.job_state import JobState
+
+_TERMINAL = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELED}
+
+# Secondary index groups: each maps a tuple of attribute values to the ids holding them.
+# Composite groups cover the filter combinations the list endpoints use together.
+_JOB_INDEXED = (("owner_id",), ("provider",), ("is_public",))
+_ASSET_INDEXED = (
+    ("owner_id",),
+    ("provider",),
+    ("type",),
+    ("is_public",),
+    ("type", "is_public"),
+    ("provider", "is_public"),
+)
+
+Index = Dict[Tuple[Tuple[str, ...], Tuple[Any, ...]], Dict[str, None]]
+
+
+def _index_add(index: Index, record: Any, groups: Iterable[Tuple[str, ...]]) -> None:
+    for attrs in groups:
+        index[(attrs, tuple(getattr(record, a) for a in attrs))][record.id] = None
+
+
+def _index_remove(index: Index, record: Any, groups: Iterable[Tuple[str, ...]]) -> None:
+    for attrs in groups:
+        key = (attrs, tuple(getattr(record, a) for a in attrs))
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(record.id, None)
+            if not bucket:
+                del index[key]
+
+
+def _select(
+    rows: Dict[str, Any],
+    index: Index,
+    groups: Iterable[Tuple[str, ...]],
+    filters: Dict[str, Any],
+    offset: int,
+    limit: int | None,
+) -> Tuple[List[Any], int]:
+    """Newest-first page of ``rows`` whose attributes equal every entry of ``filters``.
+
+    ``rows`` and the index buckets are kept in creation order, so the page is read by
+    walking the smallest bucket whose group is covered by ``filters`` backwards; nothing
+    is copied or sorted. When that group covers every filter the walk stops at the end
+    of the page and the total is the bucket size; otherwise the bucket is walked to the
+    end to count the remaining matches.
+    """
+
+    bucket: Dict[str, Any] = rows
+    covered: Tuple[str, ...] = ()
+    for attrs in groups:
+        if all(a in filters for a in attrs):
+            candidate = index.get((attrs, tuple(filters[a] for a in attrs)), {})
+            if len(candidate) < len(bucket) or (len(candidate) == len(bucket) and len(attrs) > len(covered)):
+                bucket, covered = candidate, attrs
+    rest = [(a, v) for a, v in filters.items() if a not in covered]
+    stop = None if limit is None else offset + limit
+    page: List[Any] = []
+    matched = 0
+    for item_id in reversed(bucket):
+        record = rows[item_id]
+        if rest and any(getattr(record, attr) != value for attr, value in rest):
+            continue
+        if matched >= offset and (stop is None or matched < stop):
+            page.append(record)
+        matched += 1
+        if not rest and stop is not None and matched >= stop:
+            break
+    return page, (matched if rest else len(bucket))
 
 
 class MemoryStore:
-    """In-memory store to avoid a database while prototyping."""
-
-    def __init__(self) -> None:
-        self.jobs: Dict[str, JobOut] = {}
-        self.assets: Dict[str, AssetOut] = {}
-        self._job_counter = 230
-        self._asset_counter = 0
-        self._job_id_prefix = "job_"
+    """In-memory hot state of jobs and assets (the database is the system of record).
+
+    Queued/running jobs stay resident until they finish. Finished jobs and assets are a
+    bounded cache: they are evicted least-recently-used first once older than the TTL
+    or beyond the count/byte limits, so memory stays flat in a long-running process.
+    Readers fall back to the database for anything evicted.
+
+    Jobs and assets are kept in creation order, with secondary indexes by owner,
+    provider, public flag (and type for assets), so listings read one page off the end
+    of an index instead of filtering and sorting everything resident.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_finished_jobs: int | None = None,
+        max_finished_bytes: int | None = None,
+        finished_job_ttl: float | None = None,
+        max_assets: int | None = None,
+        asset_ttl: float | None = None,
+    ) -> None:
+        self.jobs: Dict[str, JobState] = {}
+        self.assets: "OrderedDict[str, AssetOut]" = OrderedDict()
         self.job_assets: defaultdict[str, str] = defaultdict(str)
+        self._job_listeners: List[Callable[[JobState], None]] = []
         try:
-            self.debug_enabled: bool = bool(getattr(get_settings(), "debug", False))
+            settings = get_settings()
+            self.debug_enabled: bool = bool(getattr(settings, "debug", False))
         except Exception:
+            settings = None
             self.debug_enabled = False
 
-    def _next_job_id(self) -> str:
-        self._job_counter += 1
-        return f"{self._job_id_prefix}{self._job_counter}"
+        def _setting(value, name: str, default):
+            if value is not None:
+                return value
+            return getattr(settings, name, default) if settings is not None else default
+
+        self.max_finished_jobs = int(_setting(max_finished_jobs, "store_max_finished_jobs", 2000))
+        self.max_finished_bytes = int(_setting(max_finished_bytes, "store_max_finished_bytes", 64 * 1024 * 1024))
+        self.finished_job_ttl = float(_setting(finished_job_ttl, "store_finished_job_ttl", 900.0))
+        self.max_assets = int(_setting(max_assets, "store_max_assets", 2000))
+        self.asset_ttl = float(_setting(asset_ttl, "store_asset_ttl", 900.0))
+        # LRU bookkeeping: finished job id -> (expires_at, approximate size in bytes)
+        self._finished: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._finished_bytes = 0
+        self._asset_expiry: Dict[str, float] = {}
+        self.evicted_jobs = 0
+        self.evicted_assets = 0
+        self._job_index: Index = defaultdict(dict)
+        self._asset_index: Index = defaultdict(dict)
+        # Set when a job older than the newest resident one is inserted (queue recovery);
+        # the next listing restores creation order once.
+        self._jobs_unsorted = False
+
+    def add_job_listener(self, listener: Callable[[JobState], None]) -> None:
+        """Register a callback invoked with the job's live state after every create/update.
+
+        Listeners get the mutable ``JobState`` (same attribute names as ``JobOut``) and
+        must copy what they need to keep; call ``to_out()`` for a ``JobOut`` snapshot.
+        """
+
+        if listener not in self._job_listeners:
+            self._job_listeners.append(listener)
+
+    def _notify_job(self, job: JobState) -> None:
+        for listener in self._job_listeners:
+            try:
+                listener(job)
+            except Exception:
+                pass
+
+    # Eviction
+    def _track(self, job: JobState) -> None:
+        """Update LRU bookkeeping after ``job`` was stored or changed status."""
 
-    def _next_asset_id(self) -> str:
-        return f"asset_{uuid.uuid4().hex[:8]}"
+        prev = self._finished.pop(job.id, None)
+        if prev is not None:
+            self._finished_bytes -= prev[1]
+        if job.status in _TERMINAL:
+            # Sized once per write of a finished job; provider debug payloads dominate.
+            size = len(job.to_out().json())
+            self._finished[job.id] = (time.monotonic() + self.finished_job_ttl, size)
+            self._finished_bytes += size
+        self._evict()
+
+    def _touch_job(self, job_id: str) -> None:
+        entry = self._finished.get(job_id)
+        if entry is not None:
+            self._finished[job_id] = (time.monotonic() + self.finished_job_ttl, entry[1])
+            self._finished.move_to_end(job_id)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while self._finished:
+            job_id, (expires_at, size) = next(iter(self._finished.items()))
+            if (
+                expires_at > now
+                and len(self._finished) <= self.max_finished_jobs
+                and self._finished_bytes <= self.max_finished_bytes
+            ):
+                break
+            self._finished.popitem(last=False)
+            self._finished_bytes -= size
+            state = self.jobs.pop(job_id, None)
+            if state is not None:
+                _index_remove(self._job_index, state, _JOB_INDEXED)
+            self.job_assets.pop(job_id, None)
+            self.evicted_jobs += 1
+        while self.assets:
+            asset_id = next(iter(self.assets))
+            if self._asset_expiry.get(asset_id, 0.0) > now and len(self.assets) <= self.max_assets:
+                break
+            _, asset = self.assets.popitem(last=False)
+            _index_remove(self._asset_index, asset, _ASSET_INDEXED)
+            self._asset_expiry.pop(asset_id, None)
+            self.evicted_assets += 1
+
+    def _insert_job(self, state: JobState) -> None:
+        prev = self.jobs.get(state.id)
+        if prev is not None:
+            _index_remove(self._job_index, prev, _JOB_INDEXED)
+        elif self.jobs and state.created_at < self.jobs[next(reversed(self.jobs))].created_at:
+            self._jobs_unsorted = True
+        self.jobs[state.id] = state
+        _index_add(self._job_index, state, _JOB_INDEXED)
+
+    def _sort_jobs(self) -> None:
+        ordered = sorted(self.jobs.values(), key=lambda j: (j.created_at, j.id))
+        self.jobs = {j.id: j for j in ordered}
+        self._job_index = defaultdict(dict)
+        for state in ordered:
+            _index_add(self._job_index, state, _JOB_INDEXED)
+        self._jobs_unsorted = False
+
+    def put_job(self, job: JobOut) -> JobOut:
+        """Make a job (e.g. one loaded from the database) resident without notifying listeners."""
+
+        state = JobState.from_out(job)
+        self._insert_job(state)
+        self._track(state)
+        return job
+
+    def snapshot(self) -> dict:
+        return {
+            "jobs": len(self.jobs),
+            "active_jobs": len(self.jobs) - len(self._finished),
+            "finished_jobs": len(self._finished),
+            "finished_bytes": self._finished_bytes,
+            "assets": len(self.assets),
+            "evicted_jobs": self.evicted_jobs,
+            "evicted_assets": self.evicted_assets,
+        }
 
     def create_job(self, data: JobCreate, job_id: str | None = None) -> JobOut:
         now = dt.datetime.utcnow()
-        job_id = job_id or self._next_job_id()
+        job_id = job_id or new_job_id()
         job = JobOut(
             id=job_id,
             prompt=data.prompt,
@@ -50,22 +255,69 @@ class MemoryStore:
             updated_at=now,
             owner_id=data.owner_id,
         )
-        self.jobs[job_id] = job
+        state = JobState.from_out(job)
+        self._insert_job(state)
+        self._track(state)
+        self._notify_job(state)
         return job
 
     def update_job(self, job_id: str, **fields) -> JobOut:
-        job = self.jobs[job_id]
-        updated = job.copy(update={**fields, "updated_at": dt.datetime.utcnow()})
-        self.jobs[job_id] = updated
-        return updated
+        state = self.jobs[job_id]
+        status_before = state.status
+        reindex = any(attr in fields for attrs in _JOB_INDEXED for attr in attrs)
+        if reindex:
+            _index_remove(self._job_index, state, _JOB_INDEXED)
+        state.apply(fields, dt.datetime.utcnow())
+        if reindex:
+            _index_add(self._job_index, state, _JOB_INDEXED)
+        if state.status != status_before or state.status in _TERMINAL:
+            self._track(state)
+        self._notify_job(state)
+        return state.to_out()
 
-    def list_jobs(self) -> Tuple[List[JobOut], int]:
-        items = sorted(self.jobs.values(), key=lambda j: j.created_at, reverse=True)
-        return items, len(items)
+    def set_progress(self, job_id: str, progress: float) -> Optional[JobState]:
+        """Progress tick: update the job in place without materializing a ``JobOut``."""
+
+        state = self.jobs.get(job_id)
+        if state is None:
+            return None
+        state.set_progress(progress, dt.datetime.utcnow())
+        self._notify_job(state)
+        return state
+
+    def get_state(self, job_id: str) -> Optional[JobState]:
+        """The live runtime record of a resident job (no copy)."""
 
-    def get_job(self, job_id: str) -> Optional[JobOut]:
         return self.jobs.get(job_id)
 
+    def list_jobs(
+        self,
+        *,
+        owner_id: Optional[str] = None,
+        provider: Optional[str] = None,
+        public_only: bool | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> Tuple[List[JobOut], int]:
+        if self._jobs_unsorted:
+            self._sort_jobs()
+        filters: Dict[str, Any] = {}
+        if owner_id:
+            filters["owner_id"] = owner_id
+        if provider:
+            filters["provider"] = provider
+        if public_only is not None:
+            filters["is_public"] = public_only
+        page, total = _select(self.jobs, self._job_index, _JOB_INDEXED, filters, offset, limit)
+        return [j.to_out() for j in page], total
+
+    def get_job(self, job_id: str) -> Optional[JobOut]:
+        state = self.jobs.get(job_id)
+        if state is None:
+            return None
+        self._touch_job(job_id)
+        return state.to_out()
+
     def create_asset(
         self,
         *,
@@ -81,11 +333,11 @@ class MemoryStore:
         asset_type = AssetType.IMAGE if kind == JobKind.TEXT_TO_IMAGE else AssetType.VIDEO
         if url is None:
             ext = "png" if asset_type == AssetType.IMAGE else "mp4"
-            asset_id = self._next_asset_id()
+            asset_id = new_asset_id()
             url = f"https://cdn.lightsource.local/{asset_id}.{ext}"
             preview_url = url if asset_type == AssetType.IMAGE else f"{url}#preview"
         else:
-            asset_id = self._next_asset_id()
+            asset_id = new_asset_id()
             preview_url = preview_url or url
         asset = AssetOut(
             id=asset_id,
@@ -99,23 +351,52 @@ class MemoryStore:
             owner_id=owner_id,
         )
         self.assets[asset_id] = asset
+        _index_add(self._asset_index, asset, _ASSET_INDEXED)
+        self._asset_expiry[asset_id] = time.monotonic() + self.asset_ttl
+        self._evict()
         return asset
 
     def list_assets(
-        self, *, asset_type: Optional[AssetType] = None, provider: Optional[str] = None, public_only: bool | None = None
+        self,
+        *,
+        asset_type: Optional[AssetType] = None,
+        provider: Optional[str] = None,
+        public_only: bool | None = None,
+        owner_id: Optional[str] = None,
+        offset: int = 0,
+        limit: int | None = None,
     ) -> Tuple[List[AssetOut], int]:
-        items = list(self.assets.values())
+        filters: Dict[str, Any] = {}
         if asset_type:
-            items = [a for a in items if a.type == asset_type]
+            filters["type"] = asset_type
         if provider:
-            items = [a for a in items if a.provider == provider]
+            filters["provider"] = provider
         if public_only is not None:
-            items = [a for a in items if a.is_public == public_only]
-        items = sorted(items, key=lambda a: a.created_at, reverse=True)
-        return items, len(items)
+            filters["is_public"] = public_only
+        if owner_id:
+            filters["owner_id"] = owner_id
+        return _select(self.assets, self._asset_index, _ASSET_INDEXED, filters, offset, limit)
+
+    def update_asset(self, asset_id: str, **fields) -> Optional[AssetOut]:
+        asset = self.assets.get(asset_id)
+        if asset is None:
+            return None
+        reindex = any(attr in fields for attrs in _ASSET_INDEXED for attr in attrs)
+        if reindex:
+            _index_remove(self._asset_index, asset, _ASSET_INDEXED)
+        for key, value in fields.items():
+            setattr(asset, key, value)
+        if reindex:
+            _index_add(self._asset_index, asset, _ASSET_INDEXED)
+        return asset
 
     def delete_asset(self, asset_id: str) -> bool:
-        return self.assets.pop(asset_id, None) is not None
+        self._asset_expiry.pop(asset_id, None)
+        asset = self.assets.pop(asset_id, None)
+        if asset is None:
+            return False
+        _index_remove(self._asset_index, asset, _ASSET_INDEXED)
+        return True
 
     # Runtime flags
     def set_debug(self, enabled: bool) -> None:
@@ -1,18 +1,52 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Optional
+import logging
+import os
+import socket
+import uuid
+from contextlib import AsyncExitStack
+from typing import Dict, Optional
 
-from app.schemas import JobOut
+from app.config import get_settings
+from app.schemas import JobOut, JobStatus
 from app.services.store import MemoryStore
-from app.services.generation import simulate_generation
+from app.services.generation import request_cancel, simulate_generation
+
+_ACTIVE = {JobStatus.QUEUED, JobStatus.RUNNING}
 
 
 class TaskQueue:
-    def __init__(self) -> None:
+    """In-process job queue with a bounded pool of concurrent generation runs.
+
+    A single dispatcher drains ``queue`` and starts one task per job, holding at most
+    ``max_inflight`` of them; the rest stay queued. Each run must acquire its provider
+    slot, then its kind slot (when limits are configured), before taking a global slot,
+    so jobs waiting on a saturated provider never hold capacity that other kinds or
+    providers could use.
+    """
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        kind_limits: Dict[str, int] | None = None,
+        provider_limits: Dict[str, int] | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.concurrency = max(1, int(concurrency or settings.task_concurrency or 1))
+        self.kind_limits = dict(kind_limits if kind_limits is not None else settings.task_kind_limits or {})
+        self.provider_limits = dict(provider_limits if provider_limits is not None else settings.task_provider_limits or {})
+        self.max_inflight = max(self.concurrency, int(settings.task_max_inflight or 4 * self.concurrency))
         self.queue: asyncio.Queue[str] = asyncio.Queue()
         self.worker_task: Optional[asyncio.Task] = None
         self._store_ref: Optional[MemoryStore] = None
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._kind_slots: Dict[str, asyncio.Semaphore] = {}
+        self._provider_slots: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._room = asyncio.Semaphore(self.max_inflight)
 
     async def start(self, store: MemoryStore) -> None:
         self._store_ref = store
@@ -20,6 +54,31 @@ class TaskQueue:
             self.worker_task = asyncio.create_task(self._worker(store))
 
     async def enqueue(self, job_id: str) -> None:
+        self._ensure_started()
+        await self.queue.put(job_id)
+
+    async def recover(self, store: MemoryStore) -> None:
+        """Re-enqueue jobs left queued/running by a previous run of this process."""
+
+        from app.db import SessionLocal
+        from app.services.persistence import list_jobs_filtered, update_job_fields
+
+        async with SessionLocal() as session:
+            for status in (JobStatus.RUNNING, JobStatus.QUEUED):
+                for j in await list_jobs_filtered(session, status=status):
+                    await update_job_fields(session, j.id, status=JobStatus.QUEUED)
+                    await self.enqueue(j.id)
+
+    def snapshot(self) -> dict:
+        return {
+            "backend": self.backend,
+            "concurrency": self.concurrency,
+            "queued": self.queue.qsize(),
+            "inflight": len(self._inflight),
+            "max_inflight": self.max_inflight,
+        }
+
+    def _ensure_started(self) -> None:
         # Ensure worker started even if startup event was skipped
         if self.worker_task is None or self.worker_task.done():
             try:
@@ -29,30 +88,222 @@ class TaskQueue:
                 self.worker_task = asyncio.create_task(self._worker(self._store_ref))
             except Exception:
                 pass
-        await self.queue.put(job_id)
 
     async def _worker(self, store: MemoryStore) -> None:
         while True:
+            # leave jobs in the queue rather than parking an unbounded number of runs
+            await self._room.acquire()
             job_id = await self.queue.get()
-            job = store.get_job(job_id)
+            if not self._spawn(store, job_id):
+                # already scheduled (e.g. re-enqueued at startup); never run a job twice
+                self._room.release()
+                self.queue.task_done()
+                continue
+            self._inflight[job_id].add_done_callback(lambda _t: self._room.release())
+
+    def _spawn(self, store: MemoryStore, job_id: str) -> bool:
+        if job_id in self._inflight:
+            return False
+        task = asyncio.create_task(self._run(store, job_id))
+        self._inflight[job_id] = task
+        task.add_done_callback(lambda _t, jid=job_id: self._inflight.pop(jid, None))
+        return True
+
+    async def _run(self, store: MemoryStore, job_id: str) -> None:
+        try:
+            job = await self._load_job(store, job_id)
             if job is None:
+                return
+            async with AsyncExitStack() as stack:
+                provider_slot = self._limiter(self._provider_slots, self.provider_limits, job.provider)
+                kind_slot = self._limiter(self._kind_slots, self.kind_limits, job.kind.value)
+                # provider first: a job stuck behind a saturated provider holds no kind slot
+                for slot in (provider_slot, kind_slot, self._slots):
+                    if slot is not None:
+                        await stack.enter_async_context(slot)
+                # the job may have been canceled while it waited for a slot
+                current = store.get_job(job_id) or job
+                if current.status not in _ACTIVE:
+                    return
+                await simulate_generation(job=current, store=store, source_image_name=None)
+        except Exception as exc:
+            logging.getLogger("app.services.taskqueue").exception("job %s: run failed", job_id)
+            await self._fail(store, job_id, exc)
+        finally:
+            await self._finished(job_id)
+
+    async def _fail(self, store: MemoryStore, job_id: str, exc: Exception) -> None:
+        """Mark a job FAILED after an error outside its generation run, unless it already ended."""
+
+        current = store.get_job(job_id)
+        if current is None or current.status not in _ACTIVE:
+            return
+        store.update_job(job_id, status=JobStatus.FAILED, error=str(exc))
+        try:
+            from app.db import SessionLocal
+            from app.services.persistence import update_job_fields
+            async with SessionLocal() as session:
+                await update_job_fields(session, job_id, status=JobStatus.FAILED, error=str(exc))
+        except Exception:
+            logging.getLogger("app.services.taskqueue").exception("job %s: could not record failure", job_id)
+
+    async def _finished(self, job_id: str) -> None:
+        self.queue.task_done()
+
+    async def _load_job(self, store: MemoryStore, job_id: str) -> Optional[JobOut]:
+        job = store.get_job(job_id)
+        if job is None:
+            try:
+                from app.db import SessionLocal
+                from app.services.persistence import get_job_db
+                async with SessionLocal() as session:
+                    db_job = await get_job_db(session, job_id)
+                if db_job:
+                    job = store.put_job(db_job)
+            except Exception:
+                job = None
+        return job
+
+    @staticmethod
+    def _limiter(
+        slots: Dict[str, asyncio.Semaphore], limits: Dict[str, int], key: str | None
+    ) -> Optional[asyncio.Semaphore]:
+        if not key:
+            return None
+        limit = limits.get(key)
+        if not limit or limit <= 0:
+            return None
+        slot = slots.get(key)
+        if slot is None:
+            slot = slots[key] = asyncio.Semaphore(int(limit))
+        return slot
+
+
+class DatabaseTaskQueue(TaskQueue):
+    """Task queue that claims work from the ``jobs`` table so several processes can share it.
+
+    Runnable rows are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` and stamped with
+    a lease owned by this process. A heartbeat keeps leases of in-flight jobs alive; if a
+    process dies its leases expire and another process reclaims the jobs. ``enqueue`` only
+    wakes the local claim loop, since the job row itself is the queue entry.
+    """
+
+    backend = "database"
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        kind_limits: Dict[str, int] | None = None,
+        provider_limits: Dict[str, int] | None = None,
+        *,
+        lease_seconds: int | None = None,
+        poll_interval: float | None = None,
+    ) -> None:
+        super().__init__(concurrency, kind_limits, provider_limits)
+        settings = get_settings()
+        self.lease_seconds = max(5, int(lease_seconds or settings.task_lease_seconds))
+        self.poll_interval = max(0.1, float(poll_interval or settings.task_poll_interval))
+        self.retry_seconds = max(0.0, float(settings.task_retry_seconds))
+        self.owner = f"{socket.gethostname()[:32]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.heartbeat_task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    async def start(self, store: MemoryStore) -> None:
+        await super().start(store)
+        if self.heartbeat_task is None or self.heartbeat_task.done():
+            self.heartbeat_task = asyncio.create_task(self._heartbeat(store))
+
+    async def enqueue(self, job_id: str) -> None:
+        self._ensure_started()
+        self._wakeup.set()
+
+    async def recover(self, store: MemoryStore) -> None:
+        # Orphaned jobs are reclaimed by the claim loop once their lease expires.
+        self._wakeup.set()
+
+    def snapshot(self) -> dict:
+        return {**super().snapshot(), "queued": None, "owner": self.owner}
+
+    def _ensure_started(self) -> None:
+        super()._ensure_started()
+        if (self.heartbeat_task is None or self.heartbeat_task.done()) and self._store_ref is not None:
+            try:
+                self.heartbeat_task = asyncio.create_task(self._heartbeat(self._store_ref))
+            except Exception:
+                pass
+
+    async def _worker(self, store: MemoryStore) -> None:
+        from app.db import SessionLocal
+        from app.services.persistence import claim_jobs_db
+
+        while True:
+            self._wakeup.clear()
+            free = self.concurrency - len(self._inflight)
+            claimed: list[str] = []
+            if free > 0:
                 try:
-                    from app.db import SessionLocal
-                    from app.services.persistence import get_job_db
                     async with SessionLocal() as session:
-                        db_job = await get_job_db(session, job_id)
-                    if db_job:
-                        store.jobs[job_id] = db_job
-                        job = db_job
+                        claimed = await claim_jobs_db(session, owner=self.owner, limit=free, lease_seconds=self.lease_seconds)
                 except Exception:
-                    job = None
-            if job:
-                await simulate_generation(job=job, store=store, source_image_name=None)
-            self.queue.task_done()
+                    claimed = []
+                for job_id in claimed:
+                    self._spawn(store, job_id)
+            # sleep until a job is enqueued or finishes, polling for other processes' work
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _finished(self, job_id: str) -> None:
+        store = self._store_ref
+        current = store.get_job(job_id) if store is not None else None
+        terminal = current.status if current and current.status not in _ACTIVE else None
+        try:
+            from app.db import SessionLocal
+            from app.services.persistence import release_job_lease_db
+            async with SessionLocal() as session:
+                await release_job_lease_db(
+                    session, job_id, owner=self.owner, retry_after=self.retry_seconds, status=terminal
+                )
+        except Exception:
+            pass
+        self._wakeup.set()
+
+    async def _heartbeat(self, store: MemoryStore) -> None:
+        from app.db import SessionLocal
+        from app.services.persistence import renew_job_leases_db
+
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            held = list(self._inflight)
+            if not held:
+                continue
+            try:
+                async with SessionLocal() as session:
+                    statuses = await renew_job_leases_db(session, owner=self.owner, job_ids=held, lease_seconds=self.lease_seconds)
+            except Exception:
+                continue
+            for job_id, status in statuses.items():
+                # propagate cancels issued by other processes to the local run
+                if status == JobStatus.CANCELED:
+                    current = store.get_job(job_id)
+                    if current and current.status != JobStatus.CANCELED:
+                        store.update_job(job_id, status=JobStatus.CANCELED)
+                    request_cancel(job_id)
+
+
+def _create_task_queue() -> TaskQueue:
+    settings = get_settings()
+    backend = (settings.task_queue_backend or "auto").lower()
+    if backend == "auto":
+        backend = "database" if settings.db_dsn.startswith("postgresql") else "memory"
+    if backend == "database":
+        return DatabaseTaskQueue()
+    return TaskQueue()
 
 
-task_queue = TaskQueue()
+task_queue = _create_task_queue()
 
 
 def get_task_queue() -> TaskQueue:
-    return task_queue
\ No newline at end of file
+    return task_queue
@@ -0,0 +1,223 @@
+"""Background derivation of library previews.
+
+Completed generations and uploads are submitted here; a few workers derive a small
+WebP thumbnail (images, via Pillow) or a poster frame (videos, grabbed with ffmpeg and
+scaled the same way) off the request path and point the asset's ``preview_url`` at
+it. Previews are blobs held by the asset's media owner, so deleting the asset
+releases them together with the original. Without Pillow or ffmpeg the matching
+assets keep their full-size preview.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import shutil
+from typing import IO, AsyncIterator, List, Optional, Tuple, Union
+
+from app.config import get_settings
+from app.schemas import AssetOut, AssetType
+from app.services.storage import media_key, media_owner, media_url
+from app.services.storage_driver import _normalize_key, get_storage_driver
+
+_FFMPEG_TIMEOUT = 30.0
+
+
+def _pillow_available() -> bool:
+    try:
+        import PIL  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def _thumbnail_webp(source: Union[str, IO[bytes]], max_px: int, quality: int) -> bytes:
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as img:
+        # JPEG decodes straight to a reduced scale; a no-op for other formats
+        img.draft("RGB", (max_px, max_px))
+        thumb = ImageOps.exif_transpose(img)
+        thumb.thumbnail((max_px, max_px))
+        if thumb.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in thumb.getbands() or "transparency" in thumb.info
+            thumb = thumb.convert("RGBA" if has_alpha else "RGB")
+        out = io.BytesIO()
+        thumb.save(out, "WEBP", quality=quality, method=4)
+        return out.getvalue()
+
+
+async def _once(data: bytes) -> AsyncIterator[bytes]:
+    yield data
+
+
+class Thumbnailer:
+    def __init__(self, workers: int | None = None, queue_size: int | None = None) -> None:
+        settings = get_settings()
+        self.enabled = bool(settings.thumbnail_enabled)
+        self.max_px = max(16, int(settings.thumbnail_max_px))
+        self.quality = int(settings.thumbnail_quality)
+        self.poster_seconds = max(0.0, float(settings.video_poster_seconds))
+        self.ffmpeg = shutil.which(settings.ffmpeg_path)
+        self.pillow = _pillow_available()
+        self.workers = max(1, int(workers or settings.thumbnail_workers or 1))
+        self.queue: asyncio.Queue[Tuple[str, AssetType, str, str]] = asyncio.Queue(
+            maxsize=max(1, int(queue_size or settings.thumbnail_queue_size))
+        )
+        self._tasks: List[asyncio.Task] = []
+        self.derived = 0
+        self.skipped = 0
+        self.failed = 0
+        self.dropped = 0
+
+    async def start(self) -> None:
+        self._tasks = [t for t in self._tasks if not t.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._tasks = []
+
+    def submit(self, asset: AssetOut) -> bool:
+        """Queue a preview for ``asset``. Never blocks: when the queue is full the asset
+        keeps its full-size preview. Only media in our storage is handled."""
+
+        if not self.enabled or not self.pillow:
+            return False
+        if asset.type == AssetType.VIDEO and not self.ffmpeg:
+            return False
+        if asset.type not in (AssetType.IMAGE, AssetType.VIDEO):
+            return False
+        key = media_key(asset.url)
+        if key is None:
+            return False
+        try:
+            self.queue.put_nowait((asset.id, asset.type, key, media_owner(asset)))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        if not any(not t.done() for t in self._tasks):
+            # Ensure workers run even if startup event was skipped
+            try:
+                asyncio.get_running_loop().create_task(self.start())
+            except Exception:
+                pass
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled and self.pillow,
+            "video_posters": bool(self.ffmpeg),
+            "queued": self.queue.qsize(),
+            "derived": self.derived,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            asset_id, asset_type, key, owner = await self.queue.get()
+            try:
+                await self.derive(asset_id, asset_type, key, owner)
+            except Exception:
+                self.failed += 1
+            finally:
+                self.queue.task_done()
+
+    async def derive(self, asset_id: str, asset_type: AssetType, key: str, owner: str) -> Optional[str]:
+        """Build and store the preview for one asset; returns its URL (None when skipped)."""
+
+        if asset_type == AssetType.VIDEO:
+            data = await self._video_poster(key)
+        else:
+            data = await self._image_thumbnail(key)
+        if not data:
+            self.skipped += 1
+            return None
+
+        from app.db import SessionLocal
+        from app.services.blobs import get_blob_store
+        from app.services.persistence import update_asset_fields
+        from app.services.store import get_store
+
+        blobs = get_blob_store()
+        preview_key, _ = await blobs.put(owner, _once(data), ext=".webp", content_type="image/webp")
+        preview_url = media_url(preview_key)
+        async with SessionLocal() as session:
+            updated = await update_asset_fields(session, asset_id, preview_url=preview_url)
+        if updated is None:
+            # deleted meanwhile: its owner's media was already released, drop the preview too
+            await blobs.release(owner)
+            self.skipped += 1
+            return None
+        get_store().update_asset(asset_id, preview_url=preview_url)
+        self.derived += 1
+        return preview_url
+
+    async def _image_thumbnail(self, key: str) -> Optional[bytes]:
+        driver = get_storage_driver()
+        root = driver.local_root
+        if root is not None:
+            path = root / _normalize_key(key)
+            if not await asyncio.to_thread(lambda: path.is_file() and path.stat().st_size > 0):
+                return None
+            source: Union[str, IO[bytes]] = str(path)
+        else:
+            data = await driver.read(key)
+            if not data:
+                return None
+            source = io.BytesIO(data)
+        return await asyncio.to_thread(_thumbnail_webp, source, self.max_px, self.quality)
+
+    async def _video_poster(self, key: str) -> Optional[bytes]:
+        driver = get_storage_driver()
+        root = driver.local_root
+        if root is not None:
+            path = root / _normalize_key(key)
+            if not await asyncio.to_thread(lambda: path.is_file() and path.stat().st_size > 0):
+                return None
+            source = str(path)
+        else:
+            # ffmpeg range-reads just what it needs from the presigned URL
+            source = driver.presign_get(key)
+        frame = await self._grab_frame(source, self.poster_seconds)
+        if not frame and self.poster_seconds > 0:
+            frame = await self._grab_frame(source, 0.0)  # shorter than the poster offset
+        if not frame:
+            return None
+        return await asyncio.to_thread(_thumbnail_webp, io.BytesIO(frame), self.max_px, self.quality)
+
+    async def _grab_frame(self, source: str, seconds: float) -> bytes:
+        proc = await asyncio.create_subprocess_exec(
+            self.ffmpeg,
+            "-nostdin", "-v", "error",
+            "-ss", f"{seconds:.3f}",
+            "-i", source,
+            "-frames:v", "1",
+            "-f", "image2pipe", "-c:v", "png",
+            "pipe:1",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            out, _ = await asyncio.wait_for(proc.communicate(), _FFMPEG_TIMEOUT)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return b""
+        return out if proc.returncode == 0 else b""
+
+
+thumbnailer = Thumbnailer()
+
+
+def get_thumbnailer() -> Thumbnailer:
+    return thumbnailer
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import or_
+
+from app.schemas import UserOut
+
+
+@dataclass(frozen=True)
+class Visibility:
+    """Which rows of an ``is_public``/``owner_id`` table a caller may list.
+
+    Anonymous callers see public rows, signed-in users also see their own rows and
+    admins see everything. ``clause`` renders the rule as a SQL ``WHERE`` condition so
+    pages come back full instead of being thinned out after the query.
+    """
+
+    user_id: Optional[str] = None
+    admin: bool = False
+
+    @classmethod
+    def for_user(cls, user: UserOut | None) -> "Visibility":
+        if user is None:
+            return cls()
+        return cls(user_id=user.id, admin=user.role == "admin")
+
+    @property
+    def key(self) -> str:
+        if self.admin:
+            return "all"
+        return f"user:{self.user_id}" if self.user_id else "public"
+
+    def clause(self, model: Any) -> Any:
+        if self.admin:
+            return None
+        if self.user_id is None:
+            return model.is_public.is_(True)
+        return or_(model.is_public.is_(True), model.owner_id == self.user_id)
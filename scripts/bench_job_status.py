@@ -0,0 +1,115 @@
+"""Measure the job status read path against a large asset table.
+
+Seeds ``--assets`` rows (tagged with the ``bench_`` id prefix) plus one completed job,
+then times the old full-scan lookup against the joined primary-key lookup used by
+``/api/jobs/{id}/status``. Exits non-zero when the p95 of the join lookup is above
+``--target-ms``. By default it uses a throwaway SQLite file; with ``--dsn`` the seeded
+``bench_`` rows are deleted again when the run ends.
+
+    python scripts/bench_job_status.py --assets 50000 --iterations 200 --target-ms 5
+    python scripts/bench_job_status.py --dsn postgresql+asyncpg://u:p@localhost/bench
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+ap = argparse.ArgumentParser()
+ap.add_argument("--dsn", default=None, help="database to seed (default: temporary SQLite file)")
+ap.add_argument("--assets", type=int, default=20000)
+ap.add_argument("--iterations", type=int, default=200)
+ap.add_argument("--scan-iterations", type=int, default=10)
+ap.add_argument("--target-ms", type=float, default=5.0)
+args = ap.parse_args()
+
+os.environ["DATABASE_URL"] = args.dsn or "sqlite+aiosqlite:///" + os.path.join(tempfile.mkdtemp(), "job_status.db")
+os.environ.setdefault("STORAGE_BASE", tempfile.gettempdir())
+os.environ.setdefault("CORS_ORIGINS", '["*"]')
+
+from sqlalchemy import delete, func, select  # noqa: E402
+
+from app.db import SessionLocal, ensure_database_and_schema  # noqa: E402
+from app.models import user  # noqa: E402,F401
+from app.models.asset import Asset, AssetTypeDB  # noqa: E402
+from app.models.job import Job, JobKindDB, JobStatusDB  # noqa: E402
+from app.services.persistence import get_job_with_asset_url_db, list_assets_db  # noqa: E402
+
+JOB_ID = "bench_job_status"
+
+
+async def seed(n_assets: int) -> None:
+    async with SessionLocal() as s:
+        have = await s.scalar(select(func.count()).select_from(Asset).where(Asset.id.like("bench_%")))
+        batch = []
+        for i in range(have or 0, n_assets):
+            batch.append(Asset(id=f"bench_{i:08d}", type=AssetTypeDB.IMAGE, url=f"/media/bench/{i}.png", meta={}, is_public=True))
+            if len(batch) >= 5000:
+                s.add_all(batch)
+                await s.commit()
+                batch = []
+        if batch:
+            s.add_all(batch)
+            await s.commit()
+        if not await s.get(Job, JOB_ID):
+            s.add(Job(id=JOB_ID, prompt="bench", kind=JobKindDB.TEXT_TO_IMAGE, params={}, status=JobStatusDB.COMPLETED, progress=100, asset_id=f"bench_{n_assets // 2:08d}"))
+            await s.commit()
+
+
+async def cleanup() -> None:
+    async with SessionLocal() as s:
+        await s.execute(delete(Job).where(Job.id == JOB_ID))
+        await s.execute(delete(Asset).where(Asset.id.like("bench_%")))
+        await s.commit()
+
+
+async def timed(fn, iterations: int) -> list[float]:
+    out = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        await fn()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def summary(label: str, samples: list[float]) -> float:
+    samples = sorted(samples)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    print(f"{label:<12} p50={statistics.median(samples):8.2f}ms  p95={p95:8.2f}ms  n={len(samples)}")
+    return p95
+
+
+async def measure() -> int:
+    async def join_lookup():
+        async with SessionLocal() as s:
+            job, url = await get_job_with_asset_url_db(s, JOB_ID)
+            assert job and url
+
+    async def scan_lookup():
+        async with SessionLocal() as s:
+            job = await s.get(Job, JOB_ID)
+            assets = await list_assets_db(s)
+            assert next(a.url for a in assets if a.id == job.asset_id)
+
+    summary("full scan", await timed(scan_lookup, args.scan_iterations))
+    p95 = summary("join lookup", await timed(join_lookup, args.iterations))
+    ok = p95 <= args.target_ms
+    print(f"target p95 <= {args.target_ms}ms: {'ok' if ok else 'MISSED'}")
+    return 0 if ok else 1
+
+
+async def main() -> int:
+    await ensure_database_and_schema()
+    try:
+        await seed(args.assets)
+        return await measure()
+    finally:
+        await cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
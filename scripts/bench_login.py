@@ -0,0 +1,107 @@
+"""Login throughput and event-loop stall, with PBKDF2 inline vs. on the password pool.
+
+Runs the app in-process (httpx ASGI transport, throwaway SQLite database), registers a
+user, then fires ``--logins`` logins ``--concurrency`` at a time while a probe hits
+``/api/health`` every few milliseconds. "inline" reproduces the old behaviour (hashing
+on the event loop); "pool" is the current one. A blocked loop shows up as probe latency.
+
+    python scripts/bench_login.py --logins 200 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+ap = argparse.ArgumentParser()
+ap.add_argument("--logins", type=int, default=200)
+ap.add_argument("--concurrency", type=int, default=16)
+ap.add_argument("--probe-interval", type=float, default=0.005, help="seconds between /api/health probes")
+args = ap.parse_args()
+
+scratch = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + os.path.join(scratch, "login.db")
+os.environ.setdefault("STORAGE_BASE", scratch)
+os.environ.setdefault("CORS_ORIGINS", '["*"]')
+# the pool must admit the whole burst for a like-for-like comparison
+os.environ.setdefault("PASSWORD_HASH_MAX_PENDING", str(args.concurrency))
+
+import httpx  # noqa: E402
+
+import app.api.auth as auth_api  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.auth import verify_password  # noqa: E402
+from app.services.password_pool import get_password_pool  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "bench-password"
+
+
+async def verify_inline(password: str, hashed: str) -> bool:
+    return verify_password(password, hashed)
+
+
+def pct(samples: list, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(client: httpx.AsyncClient, label: str) -> None:
+    done = asyncio.Event()
+    probes: list = []
+
+    async def probe() -> None:
+        while not done.is_set():
+            t0 = time.perf_counter()
+            await client.get("/api/health")
+            probes.append((time.perf_counter() - t0) * 1000)
+            await asyncio.sleep(args.probe_interval)
+
+    sem = asyncio.Semaphore(args.concurrency)
+    latencies: list = []
+    statuses: dict = {}
+
+    async def login() -> None:
+        async with sem:
+            t0 = time.perf_counter()
+            r = await client.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            latencies.append((time.perf_counter() - t0) * 1000)
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    prober = asyncio.create_task(probe())
+    t0 = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(args.logins)))
+    elapsed = time.perf_counter() - t0
+    done.set()
+    await prober
+    print(
+        f"{label:<7} {args.logins / elapsed:8.1f} logins/s  login p50 {statistics.median(latencies):7.1f}ms"
+        f"  p99 {pct(latencies, 0.99):7.1f}ms  | health probe p50 {statistics.median(probes):6.1f}ms"
+        f"  p99 {pct(probes, 0.99):6.1f}ms  max {max(probes):6.1f}ms  statuses {statuses}"
+    )
+
+
+async def main() -> int:
+    for handler in app.router.on_startup:
+        await handler()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        r = await client.post("/api/auth/register", json={"email": EMAIL, "username": "bench", "password": PASSWORD})
+        assert r.status_code == 201, r.text
+        print(f"{args.logins} logins, concurrency {args.concurrency}, password pool {get_password_pool().snapshot()}")
+        pooled = auth_api.verify_password_async
+        auth_api.verify_password_async = verify_inline
+        await run(client, "inline")
+        auth_api.verify_password_async = pooled
+        await run(client, "pool")
+    for handler in app.router.on_shutdown:
+        await handler()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,134 @@
+"""Compare query plans and latency of the hot list queries before/after migration 0003.
+
+Builds a scratch schema at revision 0002 (no composite/partial indexes), seeds it, then
+prints the plan and median latency of each query shape; upgrades to head and repeats.
+By default it uses a throwaway SQLite file; point ``--dsn`` at an EMPTY scratch
+Postgres database to see Postgres plans (the script creates and seeds tables there).
+
+    python scripts/bench_query_plans.py --jobs 200000 --assets 200000
+    python scripts/bench_query_plans.py --dsn postgresql+asyncpg://u:p@localhost/bench_plans
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+ap = argparse.ArgumentParser()
+ap.add_argument("--dsn", default=None, help="scratch database (default: temporary SQLite file)")
+ap.add_argument("--jobs", type=int, default=100000)
+ap.add_argument("--assets", type=int, default=100000)
+ap.add_argument("--users", type=int, default=200)
+ap.add_argument("--iterations", type=int, default=20)
+args = ap.parse_args()
+
+os.environ["DATABASE_URL"] = args.dsn or "sqlite+aiosqlite:///" + os.path.join(tempfile.mkdtemp(), "plans.db")
+os.environ.setdefault("STORAGE_BASE", tempfile.gettempdir())
+os.environ.setdefault("CORS_ORIGINS", '["*"]')
+
+from sqlalchemy import func, insert, select, text  # noqa: E402
+
+from app.db import SessionLocal, engine, upgrade_schema  # noqa: E402
+from app.models.asset import Asset, AssetTypeDB  # noqa: E402
+from app.models.job import ACTIVE_JOBS_WHERE, Job, JobKindDB, JobStatusDB  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.wallet import WalletTransaction, WalletTxStatusDB, WalletTxTypeDB  # noqa: E402
+from app.models import preferences, provider  # noqa: E402,F401
+from app.services.pagination import paginate  # noqa: E402
+from app.services.visibility import Visibility  # noqa: E402
+
+BATCH = 5000
+OWNER = "user_00000007"
+
+
+async def seed() -> None:
+    rnd = random.Random(7)
+    start = dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
+    users = [f"user_{i:08d}" for i in range(args.users)]
+    statuses = [JobStatusDB.COMPLETED] * 90 + [JobStatusDB.FAILED] * 6 + [JobStatusDB.CANCELED] * 2 + [JobStatusDB.QUEUED, JobStatusDB.RUNNING]
+
+    async def insert_rows(model, n, make):
+        async with SessionLocal() as s:
+            for lo in range(0, n, BATCH):
+                await s.execute(insert(model), [make(i) for i in range(lo, min(n, lo + BATCH))])
+            await s.commit()
+
+    await insert_rows(User, len(users), lambda i: dict(id=users[i], username=users[i], email=f"{users[i]}@bench.local", password_hash="x", role="user", created_at=start))
+    await insert_rows(Job, args.jobs, lambda i: dict(
+        id=f"job_{i:010d}", owner_id=rnd.choice(users), prompt="bench", kind=JobKindDB.TEXT_TO_IMAGE, is_public=rnd.random() < 0.5,
+        params={}, status=rnd.choice(statuses), progress=100, created_at=start + dt.timedelta(seconds=i),
+    ))
+    await insert_rows(Asset, args.assets, lambda i: dict(
+        id=f"asset_{i:010d}", owner_id=rnd.choice(users), type=AssetTypeDB.IMAGE if rnd.random() < 0.8 else AssetTypeDB.VIDEO,
+        provider=rnd.choice(["openai", "sora2", "majicflus", "flux"]) if rnd.random() < 0.9 else "rare", url=f"/media/{i}.png", meta={},
+        is_public=rnd.random() < 0.5, created_at=start + dt.timedelta(seconds=i),
+    ))
+    await insert_rows(WalletTransaction, args.jobs, lambda i: dict(
+        id=f"tx_{i:010d}", user_id=rnd.choice(users), amount=1, type=WalletTxTypeDB.DEDUCT, status=WalletTxStatusDB.COMPLETED,
+        meta={}, created_at=start + dt.timedelta(seconds=i),
+    ))
+
+
+def queries() -> dict:
+    return {
+        "jobs: public page": paginate(select(Job).where(Visibility().clause(Job)), Job, limit=20),
+        "jobs: owner page": paginate(select(Job).where(Job.owner_id == OWNER), Job, limit=20),
+        "jobs: status filter": paginate(select(Job).where(Job.status == JobStatusDB.FAILED), Job, limit=20),
+        "jobs: queue claim": select(Job.id)
+        .where(ACTIVE_JOBS_WHERE)
+        .where(Job.lease_expires_at.is_(None))
+        .order_by(Job.created_at)
+        .limit(32),
+        "assets: public images": paginate(
+            select(Asset).where(Asset.is_public.is_(True), Asset.type == AssetTypeDB.IMAGE), Asset, limit=20
+        ),
+        "assets: provider": paginate(select(Asset).where(Asset.provider == "rare"), Asset, limit=20),
+        "assets: owner count": select(func.count()).select_from(Asset).where(Asset.owner_id == OWNER),
+        "wallet: user history": paginate(select(WalletTransaction).where(WalletTransaction.user_id == OWNER), WalletTransaction, limit=20),
+    }
+
+
+async def measure(label: str) -> dict:
+    out = {}
+    async with engine.connect() as conn:
+        dialect = conn.dialect
+        prefix = "EXPLAIN QUERY PLAN " if dialect.name == "sqlite" else "EXPLAIN "
+        await conn.execute(text("ANALYZE"))
+        await conn.commit()
+        print(f"\n=== {label} ===")
+        for name, stmt in queries().items():
+            sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+            plan = [" ".join(str(c) for c in row[-1:]) for row in await conn.execute(text(prefix + sql))]
+            samples = []
+            for _ in range(args.iterations):
+                t0 = time.perf_counter()
+                (await conn.execute(stmt)).all()
+                samples.append((time.perf_counter() - t0) * 1000)
+            out[name] = statistics.median(samples)
+            print(f"{name:<24} {out[name]:9.2f}ms  " + " | ".join(plan))
+    return out
+
+
+async def main() -> int:
+    async with engine.begin() as conn:
+        await conn.run_sync(upgrade_schema, "0002")
+    await seed()
+    before = await measure("revision 0002 (no list indexes)")
+    async with engine.begin() as conn:
+        await conn.run_sync(upgrade_schema)
+    after = await measure("head")
+    print(f"\n{'query':<24} {'before':>10} {'after':>10} {'speedup':>8}")
+    for name in before:
+        print(f"{name:<24} {before[name]:9.2f}ms {after[name]:9.2f}ms {before[name] / max(after[name], 1e-6):7.1f}x")
+    await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,110 @@
+"""Microbenchmark MemoryStore listings: indexed page reads vs. the old filter-and-sort scan.
+
+Fills a store (with eviction limits lifted) with ``--items`` jobs and assets, then times
+one page of each listing shape through ``list_jobs``/``list_assets`` and through the
+previous implementation (copy, filter per attribute, sort by ``created_at``).
+
+    python scripts/bench_store_listings.py --items 100000 --limit 20
+"""
+
+import argparse
+import datetime as dt
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+ap = argparse.ArgumentParser()
+ap.add_argument("--items", type=int, default=100000)
+ap.add_argument("--limit", type=int, default=20)
+ap.add_argument("--iterations", type=int, default=20)
+args = ap.parse_args()
+
+os.environ.setdefault("STORAGE_BASE", tempfile.gettempdir())
+os.environ.setdefault("CORS_ORIGINS", '["*"]')
+
+from app.schemas import AssetType, JobKind, JobOut, JobParams, JobStatus  # noqa: E402
+from app.services.store import MemoryStore  # noqa: E402
+
+OWNER = "user_00000007"
+PROVIDERS = ["openai", "sora2", "majicflus", "flux"]
+
+
+def fill(store: MemoryStore) -> None:
+    rnd = random.Random(7)
+    start = dt.datetime(2025, 1, 1)
+    users = [f"user_{i:08d}" for i in range(200)]
+    for i in range(args.items):
+        ts = start + dt.timedelta(seconds=i)
+        store.put_job(
+            JobOut(
+                id=f"job_{i:010d}", prompt="bench", kind=JobKind.TEXT_TO_IMAGE, model=None,
+                provider=rnd.choice(PROVIDERS), is_public=rnd.random() < 0.5, params=JobParams(),
+                status=JobStatus.COMPLETED, progress=100, asset_id=None, error=None,
+                created_at=ts, updated_at=ts, owner_id=rnd.choice(users),
+            )
+        )
+        store.create_asset(
+            kind=JobKind.TEXT_TO_IMAGE if rnd.random() < 0.8 else JobKind.TEXT_TO_VIDEO,
+            provider=rnd.choice(PROVIDERS) if rnd.random() < 0.9 else "rare",
+            is_public=rnd.random() < 0.5, meta={}, url=f"/media/{i}.png", owner_id=rnd.choice(users),
+        )
+
+
+def scan_jobs(store: MemoryStore, **_):
+    items = [j.to_out() for j in sorted(store.jobs.values(), key=lambda j: j.created_at, reverse=True)]
+    return items[: args.limit], len(items)
+
+
+def scan_assets(store: MemoryStore, asset_type=None, provider=None, public_only=None, **_):
+    items = list(store.assets.values())
+    if asset_type:
+        items = [a for a in items if a.type == asset_type]
+    if provider:
+        items = [a for a in items if a.provider == provider]
+    if public_only is not None:
+        items = [a for a in items if a.is_public == public_only]
+    items = sorted(items, key=lambda a: a.created_at, reverse=True)
+    return items[: args.limit], len(items)
+
+
+def timed(fn) -> float:
+    samples = []
+    for _ in range(args.iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    store = MemoryStore(max_finished_jobs=10**9, max_finished_bytes=10**12, finished_job_ttl=10**9, max_assets=10**9, asset_ttl=10**9)
+    t0 = time.perf_counter()
+    fill(store)
+    print(f"filled {args.items} jobs + {args.items} assets in {time.perf_counter() - t0:.1f}s")
+    shapes = {
+        "jobs: newest": (scan_jobs, store.list_jobs, {}),
+        "assets: newest": (scan_assets, store.list_assets, {}),
+        "assets: public images": (scan_assets, store.list_assets, {"asset_type": AssetType.IMAGE, "public_only": True}),
+        "assets: provider (rare)": (scan_assets, store.list_assets, {"provider": "rare"}),
+        "assets: provider, private": (scan_assets, store.list_assets, {"provider": "rare", "public_only": False}),
+        "assets: video, rare, public": (scan_assets, store.list_assets, {"asset_type": AssetType.VIDEO, "provider": "rare", "public_only": True}),
+    }
+    print(f"\n{'listing':<28} {'scan':>10} {'indexed':>10} {'speedup':>8}")
+    for name, (old, new, kwargs) in shapes.items():
+        old_page, old_total = old(store, **kwargs)
+        new_page, new_total = new(limit=args.limit, **kwargs)
+        assert [x.created_at for x in old_page] == [x.created_at for x in new_page] and old_total == new_total, name
+        before = timed(lambda: old(store, **kwargs))
+        after = timed(lambda: new(limit=args.limit, **kwargs))
+        print(f"{name:<28} {before:9.2f}ms {after:9.3f}ms {before / max(after, 1e-6):7.0f}x")
+    owner_page, owner_total = store.list_assets(owner_id=OWNER, limit=args.limit)
+    print(f"\nassets owned by {OWNER}: {owner_total} (page of {len(owner_page)}) in {timed(lambda: store.list_assets(owner_id=OWNER, limit=args.limit)):.3f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
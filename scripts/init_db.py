@@ -2,14 +2,13 @@ import asyncio
 import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from app.db import SessionLocal, engine
-from app.models.base import Base
+from app.db import SessionLocal, engine, upgrade_schema
 from app.services.persistence import ensure_default_providers, count_users, create_user_db
 from app.services.auth import hash_password
 
 async def main():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
     async with SessionLocal() as s:
         await ensure_default_providers(s)
         n = await count_users(s)